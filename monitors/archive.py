@@ -0,0 +1,556 @@
+"""Append-only, memory-mapped on-disk archive of monitor snapshots.
+
+Snapshots are appended to numbered segment files (``00000001.log``, ...); a segment is
+sealed and a new one started once it would exceed ``segment_max_bytes``. Every record
+carries a CRC and a pointer to the same monitor's previous record, so each monitor's
+history is a backward chain through the segments. Reads go through read-only ``mmap``s
+of the segments and hand out content as ``memoryview`` slices, without copying.
+
+Each segment has an ``.idx`` file holding a sparse, per-monitor time index: an entry
+for a monitor's first record in the segment and for every ``index_interval``-th record
+after it. "Snapshot as of T" bisects a monitor's index for the first entry newer than T
+and walks back along the chain from there, so it reads at most ``index_interval``
+record headers. Checkpoints add the monitor's latest records to the index and note how
+much of the log the index covers. A checkpoint is written when a segment is sealed,
+after every ``checkpoint_interval_bytes`` appended, and on :meth:`SnapshotArchive.flush`.
+
+Opening an archive rebuilds its state from the index files alone. Only the records the
+active segment gained after its last checkpoint (none after a clean close) are scanned
+and re-indexed, and a torn record at its end is truncated away. Index entries written
+after that checkpoint are dropped rather than trusted, since they may describe the torn
+record.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import mmap
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Set
+
+from analysis.llm import AnalysisOutput
+from monitors.monitor import MonitorSnapshot
+
+# Record prefix: body length and CRC-32 of the body.
+_PREFIX = struct.Struct("<II")
+# Body header: fetched_at (µs), previous record (segment, offset; segment 0 = none),
+# status code, has_changed, then the lengths of monitor id, url, content hash, content.
+_HEADER = struct.Struct("<qIQHBHHBI")
+# Index entry: kind, fetched_at (µs), record offset, monitor id length; the id follows.
+_ENTRY = struct.Struct("<BqQH")
+
+_SPARSE = 0
+_LATEST = 1
+_CHECKPOINT = 2
+
+
+class ArchiveCorruptError(ValueError):
+    """A sealed segment or index does not match what the archive wrote."""
+
+
+class Position(NamedTuple):
+    segment: int
+    offset: int
+
+
+@dataclass(slots=True)
+class ArchivedSnapshot:
+    """A snapshot read from the archive; ``content`` is a view into the mapped segment."""
+
+    monitor_id: str
+    url: str
+    fetched_at: datetime
+    status_code: int
+    content_hash: str
+    has_changed: bool
+    content: memoryview
+    position: Position
+
+    def to_snapshot(self) -> MonitorSnapshot:
+        return MonitorSnapshot(
+            monitor_id=self.monitor_id,
+            url=self.url,
+            fetched_at=self.fetched_at,
+            status_code=self.status_code,
+            content=str(self.content, "utf-8"),
+            content_hash=self.content_hash,
+            has_changed=self.has_changed,
+        )
+
+
+@dataclass(slots=True)
+class _MonitorIndex:
+    times: List[int] = field(default_factory=list)
+    positions: List[Position] = field(default_factory=list)
+    latest: Optional[Position] = None
+    latest_time: int = 0
+    since_indexed: int = 0
+
+    def add(self, fetched_at_us: int, position: Position) -> None:
+        if not self.positions or position > self.positions[-1]:
+            self.times.append(fetched_at_us)
+            self.positions.append(position)
+
+    def advance(self, fetched_at_us: int, position: Position) -> None:
+        if self.latest is None or position > self.latest:
+            self.latest = position
+            self.latest_time = fetched_at_us
+
+
+def _to_us(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_us(value: int) -> datetime:
+    return datetime.fromtimestamp(value // 1_000_000, timezone.utc).replace(
+        microsecond=value % 1_000_000
+    )
+
+
+class _Segment:
+    """One ``.log``/``.idx`` pair; the log is mapped read-only and remapped as it grows."""
+
+    def __init__(self, directory: Path, number: int) -> None:
+        self.number = number
+        self.log_path = directory / f"{number:08d}.log"
+        self.index_path = directory / f"{number:08d}.idx"
+        self.size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        self._map: Optional[mmap.mmap] = None
+
+    def view(self, offset: int, length: int) -> memoryview:
+        if self._map is None or offset + length > len(self._map):
+            if offset + length > self.size:
+                raise ArchiveCorruptError(
+                    f"{self.log_path.name}: read past end at {offset}"
+                )
+            # Views handed out earlier keep the previous mapping alive until released.
+            with open(self.log_path, "rb") as handle:
+                self._map = mmap.mmap(
+                    handle.fileno(), self.size, access=mmap.ACCESS_READ
+                )
+        return memoryview(self._map)[offset : offset + length]
+
+    def release(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Snapshots still reference it; it closes once they are released.
+            self._map = None
+
+
+class SnapshotArchive:
+    """Segment log of snapshots under ``directory`` with a sparse per-monitor time index.
+
+    Snapshots of one monitor must be appended in ``fetched_at`` order. The archive is not
+    thread-safe; call it from one thread (the event loop) at a time. Content views
+    returned by reads stay valid while the snapshot object is referenced.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        index_interval: int = 32,
+        checkpoint_interval_bytes: int = 1024 * 1024,
+        fsync: bool = False,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.index_interval = index_interval
+        self.checkpoint_interval_bytes = checkpoint_interval_bytes
+        self.fsync = fsync
+        self._segments: Dict[int, _Segment] = {}
+        self._monitors: Dict[str, _MonitorIndex] = {}
+        self._unindexed: Set[str] = set()
+        self._checkpointed = 0
+        self._recover()
+
+    # -- writes -----------------------------------------------------------------------
+
+    def append(self, snapshot: MonitorSnapshot) -> Position:
+        """Append ``snapshot`` and return where it was written."""
+
+        fetched_at_us = _to_us(snapshot.fetched_at)
+        monitor = self._monitors.get(snapshot.monitor_id)
+        if (
+            monitor is not None
+            and monitor.latest is not None
+            and fetched_at_us < monitor.latest_time
+        ):
+            raise ValueError(
+                f"snapshot of {snapshot.monitor_id!r} at {snapshot.fetched_at} is older "
+                "than the latest archived one"
+            )
+        monitor_id = snapshot.monitor_id.encode("utf-8")
+        url = snapshot.url.encode("utf-8")
+        content_hash = snapshot.content_hash.encode("ascii")
+        content = snapshot.content.encode("utf-8")
+        previous = monitor.latest if monitor is not None else None
+        body = b"".join(
+            (
+                _HEADER.pack(
+                    fetched_at_us,
+                    previous.segment if previous is not None else 0,
+                    previous.offset if previous is not None else 0,
+                    snapshot.status_code,
+                    snapshot.has_changed,
+                    len(monitor_id),
+                    len(url),
+                    len(content_hash),
+                    len(content),
+                ),
+                monitor_id,
+                url,
+                content_hash,
+                content,
+            )
+        )
+        record = _PREFIX.pack(len(body), zlib.crc32(body)) + body
+
+        active = self._active
+        if active.size and active.size + len(record) > self.segment_max_bytes:
+            self._checkpoint()
+            self._sync_files()
+            active = self._open_segment(active.number + 1)
+        position = Position(active.number, active.size)
+        with open(active.log_path, "ab", buffering=0) as log:
+            log.write(record)
+        active.size += len(record)
+        if monitor is None:
+            monitor = self._monitors[snapshot.monitor_id] = _MonitorIndex()
+        self._index(snapshot.monitor_id, monitor, fetched_at_us, position)
+        if active.size - self._checkpointed >= self.checkpoint_interval_bytes:
+            self._checkpoint()
+        return position
+
+    def flush(self) -> None:
+        """Checkpoint the index and, with ``fsync``, force the active segment to disk."""
+
+        self._checkpoint()
+        self._sync_files()
+
+    def close(self) -> None:
+        self.flush()
+        for segment in self._segments.values():
+            segment.release()
+
+    def __enter__(self) -> SnapshotArchive:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # -- reads ------------------------------------------------------------------------
+
+    def latest(self, monitor_id: str) -> Optional[ArchivedSnapshot]:
+        monitor = self._monitors.get(monitor_id)
+        if monitor is None or monitor.latest is None:
+            return None
+        return self.read(monitor.latest)
+
+    def as_of(self, monitor_id: str, at: datetime) -> Optional[ArchivedSnapshot]:
+        """The latest snapshot of ``monitor_id`` fetched at or before ``at``."""
+
+        monitor = self._monitors.get(monitor_id)
+        if monitor is None or monitor.latest is None:
+            return None
+        at_us = _to_us(at)
+        if monitor.latest_time <= at_us:
+            return self.read(monitor.latest)
+        # Start at the first indexed record newer than ``at`` (or the latest one) and
+        # follow the chain back; index entries are at most ``index_interval`` apart.
+        following = bisect_right(monitor.times, at_us)
+        position: Optional[Position] = (
+            monitor.positions[following]
+            if following < len(monitor.positions)
+            else monitor.latest
+        )
+        while position is not None:
+            fetched_at_us, previous = self._header(position)
+            if fetched_at_us <= at_us:
+                return self.read(position)
+            position = previous
+        return None
+
+    def read(self, position: Position) -> ArchivedSnapshot:
+        segment = self._segments[position.segment]
+        body_offset = position.offset + _PREFIX.size
+        (
+            fetched_at_us,
+            _,
+            _,
+            status_code,
+            has_changed,
+            id_length,
+            url_length,
+            hash_length,
+            content_length,
+        ) = _HEADER.unpack(segment.view(body_offset, _HEADER.size))
+        start = body_offset + _HEADER.size
+        strings = segment.view(start, id_length + url_length + hash_length)
+        url_end = id_length + url_length
+        return ArchivedSnapshot(
+            monitor_id=str(strings[:id_length], "utf-8"),
+            url=str(strings[id_length:url_end], "utf-8"),
+            fetched_at=_from_us(fetched_at_us),
+            status_code=status_code,
+            content_hash=str(strings[url_end:], "ascii"),
+            has_changed=bool(has_changed),
+            content=segment.view(start + url_end + hash_length, content_length),
+            position=position,
+        )
+
+    # -- internals --------------------------------------------------------------------
+
+    @property
+    def _active(self) -> _Segment:
+        return self._segments[max(self._segments)]
+
+    def _open_segment(self, number: int) -> _Segment:
+        segment = self._segments[number] = _Segment(self.directory, number)
+        segment.log_path.touch()
+        segment.index_path.touch()
+        self._checkpointed = 0
+        return segment
+
+    def _header(self, position: Position) -> tuple[int, Optional[Position]]:
+        view = self._segments[position.segment].view(
+            position.offset + _PREFIX.size, _HEADER.size
+        )
+        fetched_at_us, previous_segment, previous_offset = _HEADER.unpack(view)[:3]
+        previous = (
+            Position(previous_segment, previous_offset) if previous_segment else None
+        )
+        return fetched_at_us, previous
+
+    def _index(
+        self,
+        monitor_id: str,
+        monitor: _MonitorIndex,
+        fetched_at_us: int,
+        position: Position,
+    ) -> None:
+        first_in_segment = (
+            monitor.latest is None or monitor.latest.segment != position.segment
+        )
+        monitor.advance(fetched_at_us, position)
+        monitor.since_indexed += 1
+        if first_in_segment or monitor.since_indexed >= self.index_interval:
+            self._write_entries([(_SPARSE, fetched_at_us, position.offset, monitor_id)])
+            monitor.add(fetched_at_us, position)
+            monitor.since_indexed = 0
+            self._unindexed.discard(monitor_id)
+        else:
+            self._unindexed.add(monitor_id)
+
+    def _checkpoint(self) -> None:
+        active = self._active
+        entries = []
+        for monitor_id in sorted(self._unindexed):
+            monitor = self._monitors[monitor_id]
+            if monitor.latest is not None:
+                entries.append(
+                    (_LATEST, monitor.latest_time, monitor.latest.offset, monitor_id)
+                )
+                monitor.add(monitor.latest_time, monitor.latest)
+                monitor.since_indexed = 0
+        entries.append((_CHECKPOINT, 0, active.size, ""))
+        self._write_entries(entries)
+        self._unindexed.clear()
+        self._checkpointed = active.size
+
+    def _write_entries(self, entries: List[tuple[int, int, int, str]]) -> None:
+        data = bytearray()
+        for kind, fetched_at_us, offset, monitor_id in entries:
+            encoded = monitor_id.encode("utf-8")
+            data += _ENTRY.pack(kind, fetched_at_us, offset, len(encoded)) + encoded
+        with open(self._active.index_path, "ab", buffering=0) as index:
+            index.write(data)
+
+    def _sync_files(self) -> None:
+        if not self.fsync:
+            return
+        active = self._active
+        for path in (active.log_path, active.index_path):
+            with open(path, "rb") as handle:
+                os.fsync(handle.fileno())
+
+    def _recover(self) -> None:
+        numbers = sorted(int(path.stem) for path in self.directory.glob("*.log"))
+        if not numbers:
+            self._open_segment(1)
+            return
+        for number in numbers:
+            self._segments[number] = _Segment(self.directory, number)
+        for number in numbers:
+            segment = self._segments[number]
+            covered, index_end = self._load_index(segment)
+            if number != numbers[-1]:
+                if covered != segment.size:
+                    raise ArchiveCorruptError(
+                        f"segment {number} was not sealed by a checkpoint"
+                    )
+                continue
+            # The tail scan rewrites the entries of every record after the checkpoint.
+            segment.index_path.touch()
+            os.truncate(segment.index_path, index_end)
+            self._checkpointed = covered
+            self._scan_tail(segment, covered)
+
+    def _load_index(self, segment: _Segment) -> tuple[int, int]:
+        """Apply ``segment``'s index entries up to its last checkpoint inside the log.
+
+        Returns the log size that checkpoint covers and where its entry ends in the
+        index. Entries after it may point at records that were torn or never written,
+        and a checkpoint past the end of the log means the log lost records it covered,
+        so both are left to the tail scan.
+        """
+
+        data = segment.index_path.read_bytes() if segment.index_path.exists() else b""
+        pending: List[tuple[int, int, str]] = []
+        covered = 0
+        index_end = 0
+        offset = 0
+        while offset + _ENTRY.size <= len(data):
+            kind, fetched_at_us, record_offset, id_length = _ENTRY.unpack_from(
+                data, offset
+            )
+            end = offset + _ENTRY.size + id_length
+            if end > len(data) or kind not in (_SPARSE, _LATEST, _CHECKPOINT):
+                break  # A torn trailing entry from a crash mid-write.
+            if kind != _CHECKPOINT:
+                monitor_id = data[offset + _ENTRY.size : end].decode("utf-8")
+                pending.append((fetched_at_us, record_offset, monitor_id))
+            elif record_offset > segment.size:
+                break
+            else:
+                for entry_time, entry_offset, monitor_id in pending:
+                    monitor = self._monitors.setdefault(monitor_id, _MonitorIndex())
+                    position = Position(segment.number, entry_offset)
+                    monitor.add(entry_time, position)
+                    monitor.advance(entry_time, position)
+                    monitor.since_indexed = 0
+                pending.clear()
+                covered = record_offset
+                index_end = end
+            offset = end
+        return covered, index_end
+
+    def _scan_tail(self, segment: _Segment, offset: int) -> None:
+        """Index the records written after the last checkpoint, truncating a torn one."""
+
+        with open(segment.log_path, "rb") as log:
+            log.seek(offset)
+            data = log.read()
+        end = 0
+        while end + _PREFIX.size <= len(data):
+            length, crc = _PREFIX.unpack_from(data, end)
+            body = data[end + _PREFIX.size : end + _PREFIX.size + length]
+            if (
+                len(body) < _HEADER.size
+                or len(body) != length
+                or zlib.crc32(body) != crc
+            ):
+                break
+            fetched_at_us = _HEADER.unpack_from(body)[0]
+            id_length = _HEADER.unpack_from(body)[5]
+            monitor_id = body[_HEADER.size : _HEADER.size + id_length].decode("utf-8")
+            monitor = self._monitors.setdefault(monitor_id, _MonitorIndex())
+            self._index(
+                monitor_id,
+                monitor,
+                fetched_at_us,
+                Position(segment.number, offset + end),
+            )
+            end += _PREFIX.size + length
+        if offset + end != segment.size:
+            os.truncate(segment.log_path, offset + end)
+            segment.size = offset + end
+
+
+class ArchiveMonitorRepository:
+    """``MonitorRepository`` whose snapshot history lives in a :class:`SnapshotArchive`.
+
+    Snapshots survive restarts and can be looked up by time; analyses stay in memory.
+    The archive cannot take an append back, so writes made through a transaction are
+    buffered and applied only once its block exits without an exception.
+    """
+
+    def __init__(self, archive: SnapshotArchive) -> None:
+        self.archive = archive
+        self._analyses: Dict[tuple[str, str], dict[str, Any]] = {}
+        self._tx_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["_ArchiveTransaction"]:
+        async with self._tx_lock:
+            tx = _ArchiveTransaction(self)
+            yield tx
+            for snapshot in tx.snapshots:
+                self.archive.append(snapshot)
+            self._analyses.update(tx.analyses)
+
+    async def get_latest_snapshot(self, monitor_id: str) -> Optional[MonitorSnapshot]:
+        archived = self.archive.latest(monitor_id)
+        return archived.to_snapshot() if archived is not None else None
+
+    async def get_snapshot_as_of(
+        self, monitor_id: str, at: datetime
+    ) -> Optional[MonitorSnapshot]:
+        archived = self.archive.as_of(monitor_id, at)
+        return archived.to_snapshot() if archived is not None else None
+
+    async def save_snapshot(self, snapshot: MonitorSnapshot) -> None:
+        self.archive.append(snapshot)
+
+    async def save_analysis(
+        self, monitor_id: str, content_hash: str, analysis: AnalysisOutput
+    ) -> None:
+        self._analyses[(monitor_id, content_hash)] = analysis.to_dict()
+
+
+class _ArchiveTransaction:
+    """Writes of one :meth:`ArchiveMonitorRepository.transaction`, held until it commits.
+
+    Reads see the buffered snapshots on top of the archive.
+    """
+
+    def __init__(self, repository: ArchiveMonitorRepository) -> None:
+        self._repository = repository
+        self.snapshots: List[MonitorSnapshot] = []
+        self.analyses: Dict[tuple[str, str], dict[str, Any]] = {}
+
+    async def get_latest_snapshot(self, monitor_id: str) -> Optional[MonitorSnapshot]:
+        for snapshot in reversed(self.snapshots):
+            if snapshot.monitor_id == monitor_id:
+                return snapshot
+        return await self._repository.get_latest_snapshot(monitor_id)
+
+    async def get_snapshot_as_of(
+        self, monitor_id: str, at: datetime
+    ) -> Optional[MonitorSnapshot]:
+        for snapshot in reversed(self.snapshots):
+            if snapshot.monitor_id == monitor_id and snapshot.fetched_at <= at:
+                return snapshot
+        return await self._repository.get_snapshot_as_of(monitor_id, at)
+
+    async def save_snapshot(self, snapshot: MonitorSnapshot) -> None:
+        self.snapshots.append(snapshot)
+
+    async def save_analysis(
+        self, monitor_id: str, content_hash: str, analysis: AnalysisOutput
+    ) -> None:
+        self.analyses[(monitor_id, content_hash)] = analysis.to_dict()
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import asyncio
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, AsyncIterator, Dict, List, Optional, Protocol
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Sequence
 
 from analysis.llm import AnalysisOutput, analyze_monitor_change
 from monitors.tasks import diff_hashes, fetch_monitor_target
@@ -24,6 +24,9 @@ class MonitorSnapshot:
 
 
 class MonitorRepository(Protocol):
+    """Snapshot and analysis store; writes made inside :meth:`transaction` must not
+    take effect if its block raises."""
+
     @asynccontextmanager
     async def transaction(self) -> AsyncIterator["MonitorRepository"]: ...
 
@@ -34,6 +37,29 @@ class MonitorRepository(Protocol):
     async def save_analysis(self, monitor_id: str, content_hash: str, analysis: AnalysisOutput) -> None: ...
 
 
+class ClaimedWork(Protocol):
+    payload: Dict[str, Any]
+
+
+class AnalysisQueue(Protocol):
+    """Durable queue for analysis work, e.g. ``app.db.work_queue.WorkQueue``."""
+
+    async def enqueue(self, payload: Dict[str, Any], *, key: Optional[str] = None) -> Any:
+        """Queue ``payload``; a second item with a still-queued ``key`` is dropped."""
+
+    async def claim(self, limit: int) -> Sequence[ClaimedWork]: ...
+
+    async def ack(self, items: Sequence[ClaimedWork]) -> int: ...
+
+    async def release(self, items: Sequence[ClaimedWork], *, delay_seconds: float = 0.0) -> int: ...
+
+
+class EventPublisher(Protocol):
+    """Live change feed, e.g. ``app.services.events.EventHub``."""
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> Any: ...
+
+
 class InMemoryMonitorRepository:
     """In-memory transactional store suitable for dev/testing."""
 
@@ -59,9 +85,26 @@ class InMemoryMonitorRepository:
 
 
 class MonitorPipeline:
-    def __init__(self, *, scheduler: SchedulerEngine, repository: MonitorRepository) -> None:
+    """Fetch monitors, store snapshots and analyse changes.
+
+    Without an ``analysis_queue`` analysis runs as an in-process scheduler job. With
+    one, fetchers only enqueue durable work and any number of separate processes
+    drain it through :meth:`run_analysis_worker`. With ``events`` every stored
+    analysis is also published as ``analysis.completed``.
+    """
+
+    def __init__(
+        self,
+        *,
+        scheduler: SchedulerEngine,
+        repository: MonitorRepository,
+        analysis_queue: Optional[AnalysisQueue] = None,
+        events: Optional[EventPublisher] = None,
+    ) -> None:
         self.scheduler = scheduler
         self.repository = repository
+        self.analysis_queue = analysis_queue
+        self.events = events
 
     def build_monitor_job(self, *, monitor_id: str, url: str) -> Job:
         async def handler() -> None:
@@ -84,17 +127,20 @@ class MonitorPipeline:
 
             async with self.repository.transaction() as tx:
                 await tx.save_snapshot(snapshot)
-                self._enqueue_analysis_job(
-                    monitor_id=monitor_id,
-                    url=url,
-                    previous_content=(latest.content if latest else None),
-                    current_content=fetch_result.content,
-                    content_hash=fetch_result.content_hash,
-                )
+            # The queue is a different store, so analysis is only enqueued once the
+            # snapshot has committed; its idempotency key keeps a retried run from
+            # queueing the same change twice.
+            await self._enqueue_analysis_job(
+                monitor_id=monitor_id,
+                url=url,
+                previous_content=(latest.content if latest else None),
+                current_content=fetch_result.content,
+                content_hash=fetch_result.content_hash,
+            )
 
         return Job(id=f"monitor:{monitor_id}", handler=handler)
 
-    def _enqueue_analysis_job(
+    async def _enqueue_analysis_job(
         self,
         *,
         monitor_id: str,
@@ -103,18 +149,73 @@ class MonitorPipeline:
         current_content: str,
         content_hash: str,
     ) -> None:
+        payload = {
+            "monitor_id": monitor_id,
+            "url": url,
+            "previous_content": previous_content,
+            "current_content": current_content,
+            "content_hash": content_hash,
+        }
+        if self.analysis_queue is not None:
+            await self.analysis_queue.enqueue(payload, key=f"analysis:{monitor_id}:{content_hash}")
+            return
+
         async def analysis_handler() -> None:
-            analysis = analyze_monitor_change(
-                url=url,
-                previous_content=previous_content,
-                current_content=current_content,
-            )
-            async with self.repository.transaction() as tx:
-                await tx.save_analysis(monitor_id, content_hash, analysis)
+            await self.run_analysis(payload)
 
         analysis_job = Job(id=f"analysis:{monitor_id}:{content_hash[:12]}", handler=analysis_handler)
         self.scheduler.schedule(analysis_job)
 
+    async def run_analysis(self, payload: Dict[str, Any]) -> None:
+        analysis = analyze_monitor_change(
+            url=payload["url"],
+            previous_content=payload["previous_content"],
+            current_content=payload["current_content"],
+        )
+        async with self.repository.transaction() as tx:
+            await tx.save_analysis(payload["monitor_id"], payload["content_hash"], analysis)
+        if self.events is not None:
+            self.events.publish(
+                "analysis.completed",
+                {"monitor_id": payload["monitor_id"], "content_hash": payload["content_hash"]},
+            )
+
+    async def process_analysis_batch(self, *, limit: int = 32, retry_delay_s: float = 5.0) -> int:
+        """Claim up to ``limit`` queued analyses, run them, then ack or release in bulk."""
+
+        if self.analysis_queue is None:
+            raise RuntimeError("process_analysis_batch requires an analysis_queue")
+        items = await self.analysis_queue.claim(limit)
+        succeeded: List[ClaimedWork] = []
+        failed: List[ClaimedWork] = []
+        for item in items:
+            try:
+                await self.run_analysis(item.payload)
+            except Exception:
+                failed.append(item)
+            else:
+                succeeded.append(item)
+        if succeeded:
+            await self.analysis_queue.ack(succeeded)
+        if failed:
+            await self.analysis_queue.release(failed, delay_seconds=retry_delay_s)
+        return len(items)
+
+    async def run_analysis_worker(
+        self,
+        *,
+        batch_size: int = 32,
+        idle_sleep_s: float = 1.0,
+        stop_event: Optional[asyncio.Event] = None,
+    ) -> None:
+        """Drain the analysis queue until ``stop_event`` is set, sleeping while it is empty."""
+
+        stop = stop_event or asyncio.Event()
+        while not stop.is_set():
+            if await self.process_analysis_batch(limit=batch_size) == 0:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), timeout=idle_sleep_s)
+
     async def run_once(self, *, monitor_id: str, url: str) -> None:
         job = self.build_monitor_job(monitor_id=monitor_id, url=url)
         await job.execute()
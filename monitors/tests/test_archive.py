@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from monitors.archive import ArchiveMonitorRepository, SnapshotArchive
+from monitors.monitor import MonitorSnapshot
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _snapshot(monitor_id: str, minute: int) -> MonitorSnapshot:
+    content = f"{monitor_id} at {minute}"
+    return MonitorSnapshot(
+        monitor_id=monitor_id,
+        url=f"https://example.com/{monitor_id}",
+        fetched_at=START + timedelta(minutes=minute),
+        status_code=200,
+        content=content,
+        content_hash=hashlib.sha256(content.encode()).hexdigest(),
+        has_changed=True,
+    )
+
+
+def _content(archived) -> str | None:
+    return str(archived.content, "utf-8") if archived is not None else None
+
+
+def test_appends_rotate_segments_and_chain_across_them(tmp_path: Path) -> None:
+    with SnapshotArchive(tmp_path, segment_max_bytes=512, index_interval=4) as archive:
+        positions = [archive.append(_snapshot(m, minute)) for minute in range(20) for m in "ab"]
+
+        assert len(list(tmp_path.glob("*.log"))) > 3
+        assert positions[-1].segment > positions[0].segment
+        assert _content(archive.latest("a")) == "a at 19"
+        for minute in range(20):
+            at = START + timedelta(minutes=minute)
+            assert _content(archive.as_of("b", at)) == f"b at {minute}"
+
+
+def test_as_of_before_between_and_after_records(tmp_path: Path) -> None:
+    with SnapshotArchive(tmp_path, index_interval=2) as archive:
+        for minute in (10, 20, 30, 40, 50):
+            archive.append(_snapshot("a", minute))
+
+        assert archive.as_of("a", START) is None
+        assert _content(archive.as_of("a", START + timedelta(minutes=25))) == "a at 20"
+        assert _content(archive.as_of("a", START + timedelta(minutes=30))) == "a at 30"
+        assert _content(archive.as_of("a", START + timedelta(days=1))) == "a at 50"
+        assert archive.as_of("missing", START) is None
+
+
+def test_reopen_after_a_clean_close(tmp_path: Path) -> None:
+    with SnapshotArchive(tmp_path, segment_max_bytes=512, index_interval=3) as archive:
+        for minute in range(15):
+            archive.append(_snapshot("a", minute))
+    sizes = {path.name: path.stat().st_size for path in tmp_path.iterdir()}
+
+    with SnapshotArchive(tmp_path, segment_max_bytes=512, index_interval=3) as reopened:
+        assert _content(reopened.latest("a")) == "a at 14"
+        assert _content(reopened.as_of("a", START + timedelta(minutes=7))) == "a at 7"
+        reopened.append(_snapshot("a", 15))
+        assert _content(reopened.as_of("a", START + timedelta(minutes=14))) == "a at 14"
+    # Nothing was rewritten on open; only the new record and its entries were added.
+    for name, size in sizes.items():
+        assert (tmp_path / name).stat().st_size >= size
+
+
+@pytest.mark.parametrize("closed", [False, True])
+def test_torn_record_is_truncated_along_with_its_index_entry(tmp_path: Path, closed: bool) -> None:
+    archive = SnapshotArchive(tmp_path, index_interval=1)
+    for minute in range(30):
+        archive.append(_snapshot("a", minute))
+    if closed:
+        archive.close()
+    log = tmp_path / "00000001.log"
+    os.truncate(log, log.stat().st_size - 10)
+
+    with SnapshotArchive(tmp_path, index_interval=1) as reopened:
+        assert _content(reopened.latest("a")) == "a at 28"
+        assert _content(reopened.as_of("a", START + timedelta(hours=1))) == "a at 28"
+        reopened.append(_snapshot("a", 30))
+        assert _content(reopened.as_of("a", START + timedelta(minutes=29))) == "a at 28"
+        assert _content(reopened.as_of("a", START)) == "a at 0"
+
+    with SnapshotArchive(tmp_path, index_interval=1) as again:
+        assert _content(again.latest("a")) == "a at 30"
+
+
+def test_torn_index_entry_is_dropped_and_rebuilt_from_the_log(tmp_path: Path) -> None:
+    archive = SnapshotArchive(tmp_path, index_interval=2)
+    for minute in range(5):
+        archive.append(_snapshot("a", minute))
+    archive.flush()
+    for minute in range(5, 10):
+        archive.append(_snapshot("a", minute))
+    index = tmp_path / "00000001.idx"
+    os.truncate(index, index.stat().st_size - 3)
+
+    with SnapshotArchive(tmp_path, index_interval=2) as reopened:
+        assert _content(reopened.latest("a")) == "a at 9"
+        for minute in range(10):
+            at = START + timedelta(minutes=minute)
+            assert _content(reopened.as_of("a", at)) == f"a at {minute}"
+
+
+def test_transaction_applies_snapshots_only_when_it_commits(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        repository = ArchiveMonitorRepository(SnapshotArchive(tmp_path))
+        with pytest.raises(RuntimeError):
+            async with repository.transaction() as tx:
+                await tx.save_snapshot(_snapshot("a", 1))
+                assert (await tx.get_latest_snapshot("a")).content == "a at 1"
+                raise RuntimeError("enqueue failed")
+        assert await repository.get_latest_snapshot("a") is None
+
+        async with repository.transaction() as tx:
+            await tx.save_snapshot(_snapshot("a", 2))
+        assert (await repository.get_latest_snapshot("a")).content == "a at 2"
+        repository.archive.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,166 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+
+from monitors import monitor as monitor_module
+from monitors.monitor import InMemoryMonitorRepository, MonitorPipeline
+from monitors.tasks import MonitorFetchResult, compute_content_hash
+from scheduler.engine import SchedulerEngine
+
+
+@dataclass
+class _Item:
+    payload: Dict[str, Any]
+    attempts: int = 0
+
+
+@dataclass
+class _Queue:
+    """In-memory stand-in for ``WorkQueue`` with the same claim/ack/release contract."""
+
+    visible: List[_Item] = field(default_factory=list)
+    leased: List[_Item] = field(default_factory=list)
+    keys: Dict[str, _Item] = field(default_factory=dict)
+    acked: List[_Item] = field(default_factory=list)
+    released_with: List[float] = field(default_factory=list)
+
+    async def enqueue(self, payload: Dict[str, Any], *, key: Optional[str] = None) -> bool:
+        if key is not None and key in self.keys:
+            return False
+        item = _Item(payload)
+        if key is not None:
+            self.keys[key] = item
+        self.visible.append(item)
+        return True
+
+    async def claim(self, limit: int) -> List[_Item]:
+        claimed, self.visible = self.visible[:limit], self.visible[limit:]
+        for item in claimed:
+            item.attempts += 1
+        self.leased.extend(claimed)
+        return claimed
+
+    async def ack(self, items: Sequence[_Item]) -> int:
+        for item in items:
+            self.leased.remove(item)
+            self.acked.append(item)
+            self.keys = {key: held for key, held in self.keys.items() if held is not item}
+        return len(items)
+
+    async def release(self, items: Sequence[_Item], *, delay_seconds: float = 0.0) -> int:
+        for item in items:
+            self.leased.remove(item)
+            self.visible.append(item)
+        self.released_with.append(delay_seconds)
+        return len(items)
+
+
+class _FlakyRepository(InMemoryMonitorRepository):
+    """Fails the first ``failures`` analysis writes."""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+
+    async def save_analysis(self, monitor_id, content_hash, analysis) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("analysis store unavailable")
+        await super().save_analysis(monitor_id, content_hash, analysis)
+
+
+def _payload(n: int) -> Dict[str, Any]:
+    return {
+        "monitor_id": f"m{n}",
+        "url": f"https://example.com/{n}",
+        "previous_content": "old",
+        "current_content": f"new {n}",
+        "content_hash": f"hash-{n}",
+    }
+
+
+def _pipeline(repository: InMemoryMonitorRepository, queue: _Queue) -> MonitorPipeline:
+    return MonitorPipeline(scheduler=SchedulerEngine(), repository=repository, analysis_queue=queue)
+
+
+def test_batch_acks_processed_items_and_releases_failed_ones_for_retry() -> None:
+    async def scenario() -> None:
+        queue = _Queue()
+        repository = _FlakyRepository(failures=1)
+        pipeline = _pipeline(repository, queue)
+        for n in range(3):
+            await queue.enqueue(_payload(n))
+
+        assert await pipeline.process_analysis_batch(limit=2, retry_delay_s=7.0) == 2
+        assert [item.payload["monitor_id"] for item in queue.visible] == ["m2", "m0"]
+        assert queue.released_with == [7.0]
+        assert set(repository._analyses) == {("m1", "hash-1")}
+
+        assert await pipeline.process_analysis_batch(limit=10) == 2
+        assert await pipeline.process_analysis_batch(limit=10) == 0
+        assert queue.visible == [] and queue.leased == []
+        assert set(repository._analyses) == {(f"m{n}", f"hash-{n}") for n in range(3)}
+
+    asyncio.run(scenario())
+
+
+def test_worker_drains_the_queue_until_stopped() -> None:
+    async def scenario() -> None:
+        queue = _Queue()
+        repository = _FlakyRepository(failures=2)
+        pipeline = _pipeline(repository, queue)
+        for n in range(5):
+            await queue.enqueue(_payload(n))
+        stop = asyncio.Event()
+
+        worker = asyncio.create_task(
+            pipeline.run_analysis_worker(batch_size=2, idle_sleep_s=0.01, stop_event=stop)
+        )
+        while len(repository._analyses) < 5:
+            await asyncio.sleep(0.01)
+        stop.set()
+        await asyncio.wait_for(worker, timeout=1)
+
+        assert queue.visible == [] and queue.leased == []
+        # The two failed analyses were retried once each before being acked.
+        assert sorted(item.attempts for item in queue.acked) == [1, 1, 1, 2, 2]
+
+    asyncio.run(scenario())
+
+
+def test_process_analysis_batch_requires_a_queue() -> None:
+    pipeline = MonitorPipeline(scheduler=SchedulerEngine(), repository=InMemoryMonitorRepository())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(pipeline.process_analysis_batch())
+
+
+def test_analysis_is_enqueued_once_per_change_after_the_snapshot_commits(monkeypatch) -> None:
+    async def fetch(url: str) -> MonitorFetchResult:
+        return MonitorFetchResult(
+            url=url,
+            fetched_at=datetime.now(timezone.utc),
+            status_code=200,
+            content="body",
+            content_hash=compute_content_hash("body"),
+        )
+
+    monkeypatch.setattr(monitor_module, "fetch_monitor_target", fetch)
+
+    async def scenario() -> None:
+        queue = _Queue()
+        repository = InMemoryMonitorRepository()
+        pipeline = _pipeline(repository, queue)
+
+        await pipeline.run_once(monitor_id="m", url="https://example.com/")
+        await pipeline.run_once(monitor_id="m", url="https://example.com/")
+
+        assert len(repository._snapshots["m"]) == 2
+        assert [item.payload["content_hash"] for item in queue.visible] == [
+            compute_content_hash("body")
+        ]
+
+    asyncio.run(scenario())
@@ -0,0 +1,155 @@
+"""api record columns for the database repository
+
+Revision ID: 0002_api_columns
+Revises: 0001_initial
+Create Date: 2026-10-19 00:00:00.000000
+
+Existing monitors get ``normalized_endpoint`` computed with the application's
+``normalize_source_url``, in batches. Monitors whose URLs normalize to the same
+value as an older monitor's are suffixed with ``#duplicate-<id>`` as in 0007.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.services.repositories import normalize_source_url
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_api_columns"
+down_revision: str | None = "0001_initial"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_BACKFILL_BATCH = 1_000
+
+_monitors = sa.table(
+    "monitors",
+    sa.column("id", sa.Integer()),
+    sa.column("endpoint", sa.String()),
+    sa.column("normalized_endpoint", sa.String()),
+)
+
+
+def _backfill_normalized_endpoints() -> None:
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(_monitors.c.id, _monitors.c.endpoint)
+            .where(_monitors.c.id > last_id, _monitors.c.normalized_endpoint == "")
+            .order_by(_monitors.c.id)
+            .limit(_BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            _monitors.update()
+            .where(_monitors.c.id == sa.bindparam("monitor_id"))
+            .values(normalized_endpoint=sa.bindparam("normalized")),
+            [
+                {"monitor_id": row.id, "normalized": normalize_source_url(row.endpoint)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+    op.execute(
+        "UPDATE monitors "
+        "SET normalized_endpoint = normalized_endpoint || '#duplicate-' || CAST(id AS VARCHAR) "
+        "WHERE EXISTS ("
+        "SELECT 1 FROM monitors AS kept "
+        "WHERE kept.normalized_endpoint = monitors.normalized_endpoint AND kept.id < monitors.id"
+        ")"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    with op.batch_alter_table("tasks") as batch:
+        batch.alter_column("user_id", existing_type=sa.Integer(), nullable=True)
+        batch.add_column(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            )
+        )
+
+    with op.batch_alter_table("jobs") as batch:
+        batch.add_column(
+            sa.Column("schedule_every_seconds", sa.Integer(), server_default="60", nullable=False)
+        )
+        batch.add_column(
+            sa.Column("enabled", sa.Boolean(), server_default=sa.true(), nullable=False)
+        )
+        batch.add_column(sa.Column("last_run_at", sa.DateTime(timezone=True), nullable=True))
+        batch.add_column(
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            )
+        )
+        batch.add_column(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            )
+        )
+
+    with op.batch_alter_table("monitors") as batch:
+        batch.alter_column("user_id", existing_type=sa.Integer(), nullable=True)
+        batch.alter_column("job_id", existing_type=sa.Integer(), nullable=True)
+        batch.add_column(
+            sa.Column("name", sa.String(length=255), server_default="", nullable=False)
+        )
+        batch.add_column(
+            sa.Column(
+                "normalized_endpoint", sa.String(length=2048), server_default="", nullable=False
+            )
+        )
+        batch.add_column(sa.Column("last_snapshot_hash", sa.LargeBinary(length=32), nullable=True))
+        batch.add_column(
+            sa.Column("changed", sa.Boolean(), server_default=sa.false(), nullable=False)
+        )
+        batch.add_column(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            )
+        )
+    _backfill_normalized_endpoints()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    with op.batch_alter_table("monitors") as batch:
+        batch.drop_column("updated_at")
+        batch.drop_column("changed")
+        batch.drop_column("last_snapshot_hash")
+        batch.drop_column("normalized_endpoint")
+        batch.drop_column("name")
+        batch.alter_column("job_id", existing_type=sa.Integer(), nullable=False)
+        batch.alter_column("user_id", existing_type=sa.Integer(), nullable=False)
+
+    with op.batch_alter_table("jobs") as batch:
+        batch.drop_column("updated_at")
+        batch.drop_column("created_at")
+        batch.drop_column("last_run_at")
+        batch.drop_column("enabled")
+        batch.drop_column("schedule_every_seconds")
+
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_column("updated_at")
+        batch.alter_column("user_id", existing_type=sa.Integer(), nullable=False)
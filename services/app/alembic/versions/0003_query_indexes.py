@@ -0,0 +1,108 @@
+"""query-driven composite and partial indexes
+
+Revision ID: 0003_query_indexes
+Revises: 0002_api_columns
+Create Date: 2026-10-19 00:00:00.000000
+
+Each index backs a query the application actually issues:
+
+* ``(created_at, id)`` / ``(updated_at, id)`` drive keyset pagination and the
+  ``updated_since`` filter on every list endpoint.
+* ``jobs(task_id, id)`` serves ``GET /tasks/{id}/jobs`` and the task delete
+  cascade; ``jobs(enabled, created_at, id)`` serves ``?enabled=``.
+* ``monitors(normalized_endpoint)`` serves the duplicate-URL lookup;
+  the partial ``monitors(created_at, id) WHERE changed`` serves ``?changed=true``.
+* ``results(job_id, created_at)`` and the partial ``jobs(id) WHERE status =
+  'QUEUED'`` cover latest results per job and the queued-job scan; the remaining
+  foreign keys (``tasks.user_id``, ``monitors.user_id``, ``monitors.job_id``) get
+  plain indexes so parent deletes and the per-user ``selectinload`` do not scan
+  child tables.
+
+The single-column ``ix_*_id`` indexes from 0001 duplicate the primary keys and
+are dropped.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_query_indexes"
+down_revision: str | None = "0002_api_columns"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_PRIMARY_KEY_INDEXES = ("users", "tasks", "jobs", "monitors", "results")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    for table in _PRIMARY_KEY_INDEXES:
+        op.drop_index(f"ix_{table}_id", table_name=table)
+
+    op.create_index("ix_tasks_user_id", "tasks", ["user_id"])
+    op.create_index("ix_tasks_created_at_id", "tasks", ["created_at", "id"])
+    op.create_index("ix_tasks_updated_at_id", "tasks", ["updated_at", "id"])
+
+    op.create_index("ix_jobs_task_id_id", "jobs", ["task_id", "id"])
+    op.create_index("ix_jobs_created_at_id", "jobs", ["created_at", "id"])
+    op.create_index("ix_jobs_updated_at_id", "jobs", ["updated_at", "id"])
+    op.create_index("ix_jobs_enabled_created_at_id", "jobs", ["enabled", "created_at", "id"])
+    op.create_index(
+        "ix_jobs_queued",
+        "jobs",
+        ["id"],
+        postgresql_where=sa.text("status = 'QUEUED'"),
+        sqlite_where=sa.text("status = 'QUEUED'"),
+    )
+
+    op.create_index("ix_monitors_user_id", "monitors", ["user_id"])
+    op.create_index("ix_monitors_job_id", "monitors", ["job_id"])
+    op.create_index("ix_monitors_normalized_endpoint", "monitors", ["normalized_endpoint"])
+    op.create_index("ix_monitors_created_at_id", "monitors", ["created_at", "id"])
+    op.create_index("ix_monitors_updated_at_id", "monitors", ["updated_at", "id"])
+    op.create_index(
+        "ix_monitors_changed_created_at_id",
+        "monitors",
+        ["created_at", "id"],
+        postgresql_where=sa.text("changed"),
+        sqlite_where=sa.text("changed = 1"),
+    )
+
+    op.create_index("ix_results_job_id_created_at", "results", ["job_id", "created_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_index("ix_results_job_id_created_at", table_name="results")
+
+    for name in (
+        "ix_monitors_changed_created_at_id",
+        "ix_monitors_updated_at_id",
+        "ix_monitors_created_at_id",
+        "ix_monitors_normalized_endpoint",
+        "ix_monitors_job_id",
+        "ix_monitors_user_id",
+    ):
+        op.drop_index(name, table_name="monitors")
+
+    for name in (
+        "ix_jobs_queued",
+        "ix_jobs_enabled_created_at_id",
+        "ix_jobs_updated_at_id",
+        "ix_jobs_created_at_id",
+        "ix_jobs_task_id_id",
+    ):
+        op.drop_index(name, table_name="jobs")
+
+    for name in ("ix_tasks_updated_at_id", "ix_tasks_created_at_id", "ix_tasks_user_id"):
+        op.drop_index(name, table_name="tasks")
+
+    for table in _PRIMARY_KEY_INDEXES:
+        op.create_index(f"ix_{table}_id", table, ["id"], unique=False)
@@ -0,0 +1,107 @@
+"""range-partition results by created_at and add result summaries
+
+Revision ID: 0004_result_partitions
+Revises: 0003_query_indexes
+Create Date: 2026-10-19 00:00:00.000000
+
+On PostgreSQL ``results`` becomes a declaratively range-partitioned table; the
+existing rows move into ``results_default`` and per-period partitions are
+created at runtime by :class:`app.db.partitions.ResultPartitions`, which first
+moves a period's rows out of the default partition (PostgreSQL rejects a range
+the default still holds rows for). Retention rolls up and deletes the default
+partition's expired rows. Other dialects keep ``results`` as is, write to
+standalone per-period tables and compact expired ``results`` rows the same way.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_result_partitions"
+down_revision: str | None = "0003_query_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.create_table(
+        "result_summaries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("period_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("result_count", sa.Integer(), nullable=False),
+        sa.Column("error_count", sa.Integer(), nullable=False),
+        sa.Column("first_result_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_result_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["job_id"], ["jobs.id"], name=op.f("fk_result_summaries_job_id_jobs"), ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_result_summaries")),
+        sa.UniqueConstraint("job_id", "period_start", name=op.f("uq_result_summaries_job_id")),
+    )
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE results RENAME TO results_unpartitioned")
+    op.execute("ALTER TABLE results_unpartitioned RENAME CONSTRAINT pk_results TO pk_results_unpartitioned")
+    op.execute("ALTER SEQUENCE results_id_seq OWNED BY NONE")
+    op.drop_index("ix_results_job_id_created_at", table_name="results_unpartitioned")
+    op.execute(
+        """
+        CREATE TABLE results (
+            id integer NOT NULL DEFAULT nextval('results_id_seq'),
+            job_id integer NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+            status result_status NOT NULL,
+            content text,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT pk_results PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE results_default PARTITION OF results DEFAULT")
+    op.create_index("ix_results_job_id_created_at", "results", ["job_id", "created_at"])
+    op.execute(
+        "INSERT INTO results (id, job_id, status, content, created_at) "
+        "SELECT id, job_id, status, content, created_at FROM results_unpartitioned"
+    )
+    op.execute("DROP TABLE results_unpartitioned")
+    op.execute("ALTER SEQUENCE results_id_seq OWNED BY results.id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER SEQUENCE results_id_seq OWNED BY NONE")
+        op.execute("ALTER TABLE results RENAME TO results_partitioned")
+        op.execute("ALTER TABLE results_partitioned RENAME CONSTRAINT pk_results TO pk_results_partitioned")
+        op.execute("ALTER INDEX ix_results_job_id_created_at RENAME TO ix_results_partitioned_job_id")
+        op.execute(
+            """
+            CREATE TABLE results (
+                id integer NOT NULL DEFAULT nextval('results_id_seq'),
+                job_id integer NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+                status result_status NOT NULL,
+                content text,
+                created_at timestamptz NOT NULL DEFAULT now(),
+                CONSTRAINT pk_results PRIMARY KEY (id)
+            )
+            """
+        )
+        op.execute(
+            "INSERT INTO results (id, job_id, status, content, created_at) "
+            "SELECT id, job_id, status, content, created_at FROM results_partitioned"
+        )
+        op.execute("DROP TABLE results_partitioned")
+        op.execute("ALTER SEQUENCE results_id_seq OWNED BY results.id")
+        op.create_index("ix_results_job_id_created_at", "results", ["job_id", "created_at"])
+
+    op.drop_table("result_summaries")
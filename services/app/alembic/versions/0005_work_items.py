@@ -0,0 +1,49 @@
+"""durable work queue table
+
+Revision ID: 0005_work_items
+Revises: 0004_result_partitions
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_work_items"
+down_revision: str | None = "0004_result_partitions"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.create_table(
+        "work_items",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("queue", sa.String(length=64), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("claim_token", sa.String(length=32), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_work_items")),
+    )
+    op.create_index(
+        "ix_work_items_queue_available_at_id", "work_items", ["queue", "available_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_index("ix_work_items_queue_available_at_id", table_name="work_items")
+    op.drop_table("work_items")
@@ -0,0 +1,48 @@
+"""record and collection version counters
+
+Revision ID: 0006_versions
+Revises: 0005_work_items
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_versions"
+down_revision: str | None = "0005_work_items"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+VERSIONED_TABLES = ("tasks", "jobs", "monitors")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+    collection_versions = op.create_table(
+        "collection_versions",
+        sa.Column("name", sa.String(length=32), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("name", name=op.f("pk_collection_versions")),
+    )
+    op.bulk_insert(
+        collection_versions, [{"name": table, "version": 0} for table in VERSIONED_TABLES]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_table("collection_versions")
+    for table in reversed(VERSIONED_TABLES):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("version")
@@ -0,0 +1,46 @@
+"""make the normalized monitor URL unique
+
+Revision ID: 0007_unique_monitor_urls
+Revises: 0006_versions
+Create Date: 2026-10-19 00:00:00.000000
+
+Monitors that duplicate an older monitor's normalized URL (possible while the dedup
+check ran outside the write) keep their rows; their key gets a ``#duplicate-<id>``
+suffix, which no normalized URL can carry since normalization drops fragments.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_unique_monitor_urls"
+down_revision: str | None = "0006_versions"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.execute(
+        "UPDATE monitors "
+        "SET normalized_endpoint = normalized_endpoint || '#duplicate-' || CAST(id AS VARCHAR) "
+        "WHERE EXISTS ("
+        "SELECT 1 FROM monitors AS kept "
+        "WHERE kept.normalized_endpoint = monitors.normalized_endpoint AND kept.id < monitors.id"
+        ")"
+    )
+    op.drop_index("ix_monitors_normalized_endpoint", table_name="monitors")
+    op.create_index(
+        "ix_monitors_normalized_endpoint", "monitors", ["normalized_endpoint"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_index("ix_monitors_normalized_endpoint", table_name="monitors")
+    op.create_index("ix_monitors_normalized_endpoint", "monitors", ["normalized_endpoint"])
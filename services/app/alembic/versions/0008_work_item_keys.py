@@ -0,0 +1,38 @@
+"""idempotency keys for work items
+
+Revision ID: 0008_work_item_keys
+Revises: 0007_unique_monitor_urls
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_work_item_keys"
+down_revision: str | None = "0007_unique_monitor_urls"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.add_column("work_items", sa.Column("dedup_key", sa.String(length=255), nullable=True))
+    op.create_index(
+        "ix_work_items_queue_dedup_key", "work_items", ["queue", "dedup_key"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_index("ix_work_items_queue_dedup_key", table_name="work_items")
+    with op.batch_alter_table("work_items") as batch:
+        batch.drop_column("dedup_key")
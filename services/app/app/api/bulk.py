@@ -0,0 +1,185 @@
+"""Shared request parsing and response streaming for the bulk endpoints.
+
+A bulk body is either a JSON array or NDJSON (``Content-Type: application/x-ndjson``) of
+:class:`~app.api.schemas.BulkItem` objects. Items are validated up front, outside the
+repository lock; the valid ones are then applied by a single repository batch call.
+Results keep the request order and format: JSON arrays get a JSON array back, NDJSON
+requests get a streamed NDJSON response so very large batches are never encoded at once.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Any
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+
+from app.api.schemas import BulkItem, BulkItemResult
+from app.api.serialization import JSONBytesResponse, Row, encode_json
+from app.services.repositories import BatchOperation, BatchResult
+
+MAX_BULK_ITEMS = 50_000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_CHUNK_LINES = 500
+
+_STATUS_BY_OUTCOME = {
+    "created": 201,
+    "updated": 200,
+    "deleted": 204,
+    "not_found": 404,
+    "conflict": 409,
+}
+_ERROR_BY_OUTCOME = {"not_found": "not found", "conflict": "conflict"}
+
+BULK_OPENAPI_EXTRA: dict[str, Any] = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": BulkItem.model_json_schema()},
+            },
+            NDJSON_MEDIA_TYPE: {"schema": BulkItem.model_json_schema()},
+        },
+    }
+}
+
+
+def is_ndjson(request: Request) -> bool:
+    return request.headers.get("content-type", "").split(";")[0].strip() == NDJSON_MEDIA_TYPE
+
+
+def _decode_line(line: bytes, line_number: int) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"invalid JSON on line {line_number}") from exc
+
+
+async def read_bulk_items(request: Request) -> list[Any]:
+    """Read raw bulk items, decoding NDJSON incrementally as the body streams in."""
+
+    items: list[Any] = []
+    if is_ndjson(request):
+        buffer = b""
+        line_number = 0
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_number += 1
+                if line.strip():
+                    items.append(_decode_line(line, line_number))
+            if len(items) > MAX_BULK_ITEMS:
+                break
+        if buffer.strip():
+            items.append(_decode_line(buffer, line_number + 1))
+    else:
+        try:
+            items = json.loads(await request.body())
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="invalid JSON body") from exc
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="bulk body must be a JSON array")
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"bulk requests are limited to {MAX_BULK_ITEMS} items"
+        )
+    return items
+
+
+def format_errors(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def parse_operations(
+    items: list[Any],
+    create_model: type[BaseModel],
+    update_model: type[BaseModel],
+) -> tuple[list[tuple[int, BulkItem, BatchOperation]], dict[int, BulkItemResult]]:
+    """Validate raw items into batch operations, collecting per-item validation errors."""
+
+    operations: list[tuple[int, BulkItem, BatchOperation]] = []
+    errors: dict[int, BulkItemResult] = {}
+    for index, raw in enumerate(items):
+        op = raw.get("op", "create") if isinstance(raw, dict) else "create"
+        try:
+            item = BulkItem.model_validate(raw)
+            if item.op != "create" and not item.id:
+                errors[index] = BulkItemResult(
+                    index=index, op=item.op, status=422, error="id is required"
+                )
+                continue
+            model = {"create": create_model, "update": update_model}.get(item.op)
+            fields = model.model_validate(item.data).model_dump() if model else {}
+        except ValidationError as exc:
+            errors[index] = BulkItemResult(
+                index=index,
+                op=str(op),
+                status=422,
+                error=format_errors(exc),
+            )
+            continue
+        operations.append((index, item, BatchOperation(op=item.op, id=item.id, fields=fields)))
+    return operations, errors
+
+
+def _result_rows(
+    total: int,
+    operations: list[tuple[int, BulkItem, BatchOperation]],
+    results: list[BatchResult[Any]],
+    errors: dict[int, BulkItemResult],
+    row: Callable[[Any], Row],
+) -> Iterator[Row]:
+    applied = iter(zip(operations, results))
+    for index in range(total):
+        if index in errors:
+            yield errors[index].model_dump()
+            continue
+        (_, item, _), result = next(applied)
+        record = result.record
+        yield {
+            "index": index,
+            "op": item.op,
+            "status": _STATUS_BY_OUTCOME[result.outcome],
+            "id": record.id if record is not None else item.id,
+            "item": row(record)
+            if record is not None and result.outcome in ("created", "updated")
+            else None,
+            "error": _ERROR_BY_OUTCOME.get(result.outcome),
+        }
+
+
+async def _stream_ndjson(rows: Iterator[Row]) -> AsyncIterator[bytes]:
+    chunk: list[bytes] = []
+    for result_row in rows:
+        chunk.append(encode_json(result_row))
+        if len(chunk) >= STREAM_CHUNK_LINES:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+async def run_bulk(
+    request: Request,
+    *,
+    create_model: type[BaseModel],
+    update_model: type[BaseModel],
+    apply: Callable[[list[BatchOperation]], Awaitable[list[BatchResult[Any]]]],
+    row: Callable[[Any], Row],
+) -> Response:
+    """Parse, apply and render one bulk request."""
+
+    items = await read_bulk_items(request)
+    operations, errors = parse_operations(items, create_model, update_model)
+    results = await apply([operation for _, _, operation in operations]) if operations else []
+    rows = _result_rows(len(items), operations, results, errors, row)
+    if is_ndjson(request):
+        return StreamingResponse(_stream_ndjson(rows), media_type=NDJSON_MEDIA_TYPE)
+    return JSONBytesResponse(encode_json(list(rows)))
@@ -0,0 +1,47 @@
+"""Weak ETags and ``If-None-Match`` handling for the read endpoints.
+
+Validators come from repository version counters rather than from hashing the body, so
+a matching request is answered with ``304 Not Modified`` before anything is serialized
+(for lists, before the page is even queried). A record's tag changes with its
+``version``; a list's tag changes with the version of its collection, which every
+create, update and delete in it bumps. Tags are weak: they promise an equivalent
+representation, not identical bytes.
+"""
+
+from __future__ import annotations
+
+from fastapi import Request, Response, status
+
+from app.services.repositories import CollectionName, JobRecord, MonitorRecord, TaskRecord
+
+
+def record_etag(record: TaskRecord | JobRecord | MonitorRecord) -> str:
+    # The creation time tells a recreated record (SQLite may reuse a freed id) from the old one.
+    return f'W/"{record.version}-{round(record.created_at * 1_000_000):x}"'
+
+
+def collection_etag(collection: CollectionName, version: int) -> str:
+    return f'W/"{collection}-{version}"'
+
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header value."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque(etag)
+    return any(_opaque(candidate) == current for candidate in if_none_match.split(","))
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """Return a bodiless ``304`` when the client already holds ``etag``, else ``None``."""
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
@@ -0,0 +1,142 @@
+"""ASGI middleware for per-route request metrics and on-demand request profiling.
+
+Both are plain ASGI callables rather than ``BaseHTTPMiddleware`` subclasses, so
+streamed responses (NDJSON, server-sent events) pass through unbuffered. Requests are
+labelled by the template of the route they match (``/api/tasks/{task_id}``), never by
+the raw path, to keep label cardinality bounded; unknown paths share ``unmatched``.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from starlette.routing import compile_path, get_route_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import HTTP_REQUEST_DURATION_SECONDS, HTTP_REQUESTS_IN_FLIGHT
+from app.core.profiling import FOLDED_MEDIA_TYPE, StackSampler
+
+PROFILE_HEADER = b"x-profile"
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RouteTemplates:
+    """Resolve request paths to the path templates of the application's OpenAPI schema.
+
+    The schema lists every documented route with its full prefix, however routers were
+    included. It is read by :meth:`load`, once all routers have been registered.
+    Literal templates win over parameterized ones (``/api/monitors/snapshots`` over
+    ``/api/monitors/{monitor_id}``), and templates serving the request method over
+    those that would answer 405.
+    """
+
+    def __init__(self, schema: Callable[[], dict[str, Any]]) -> None:
+        self._schema = schema
+        self._patterns: list[tuple[re.Pattern[str], str, frozenset[str]]] | None = None
+
+    def load(self) -> list[tuple[re.Pattern[str], str, frozenset[str]]]:
+        paths: dict[str, dict[str, Any]] = self._schema().get("paths", {})
+        self._patterns = [
+            (compile_path(template)[0], template, frozenset(operations))
+            for template, operations in sorted(paths.items(), key=lambda item: item[0].count("{"))
+        ]
+        return self._patterns
+
+    def resolve(self, method: str, path: str) -> str:
+        patterns = self._patterns if self._patterns is not None else self.load()
+        method = "get" if method == "HEAD" else method.lower()
+        fallback: str | None = None
+        for pattern, template, methods in patterns:
+            if pattern.match(path):
+                if method in methods:
+                    return template
+                fallback = fallback or template
+        return fallback or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """Record latency and in-flight counts of HTTP requests per method and route.
+
+    ``schema`` returns the application's OpenAPI schema (``app.openapi``), from which
+    :class:`RouteTemplates` takes the route labels; they are loaded at lifespan startup
+    so generating the schema does not delay the first request. Latency runs until the
+    response body has been sent; a request that fails before responding counts as a 500.
+    """
+
+    def __init__(self, app: ASGIApp, *, schema: Callable[[], dict[str, Any]]) -> None:
+        self.app = app
+        self.routes = RouteTemplates(schema)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            self.routes.load()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = self.routes.resolve(method, get_route_path(scope))
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method=method, route=route)
+        in_flight.inc()
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_DURATION_SECONDS.labels(
+                method=method, route=route, status=str(status)
+            ).observe(perf_counter() - start)
+
+
+class ProfileMiddleware:
+    """Answer requests sent with ``X-Profile: 1`` with a sampling profile of serving them.
+
+    The request is handled as usual, but its response is discarded and replaced by the
+    collapsed stacks sampled meanwhile, as a ``.folded`` attachment; the original status
+    is reported in ``X-Profile-Status``. Samples cover every thread of the process, so
+    requests served concurrently show up in the profile too.
+    """
+
+    def __init__(self, app: ASGIApp, *, interval: float) -> None:
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or dict(scope["headers"]).get(PROFILE_HEADER) != b"1":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        sampler = StackSampler(interval=self.interval)
+        with sampler:
+            await self.app(scope, receive, discard)
+        body = sampler.folded()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", FOLDED_MEDIA_TYPE.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"content-disposition", b'attachment; filename="request.folded"'),
+                    (b"x-profile-status", str(status).encode()),
+                    (b"x-profile-samples", str(sampler.samples).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,77 @@
+"""Keyset (cursor) pagination helpers shared by the list endpoints."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, Query, Request, Response
+
+from app.services.repositories import PageKey
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+@dataclass(slots=True)
+class PageParams:
+    """Decoded pagination query parameters."""
+
+    limit: int
+    after: PageKey | None
+    updated_since: float | None
+
+
+def encode_cursor(key: PageKey) -> str:
+    """Encode a repository page key as an opaque URL-safe cursor."""
+
+    raw = json.dumps([key[0], key[1]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    """Decode a cursor produced by :func:`encode_cursor`, rejecting malformed input."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, record_id = json.loads(raw)
+        return (float(timestamp), str(record_id))
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="invalid cursor") from exc
+
+
+def page_params(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None, description="Opaque cursor from `X-Next-Cursor`."),
+    updated_since: datetime | None = Query(
+        default=None,
+        description="Only return records updated at or after this time, ordered by update time.",
+    ),
+) -> PageParams:
+    """FastAPI dependency parsing the shared pagination query parameters."""
+
+    since = None
+    if updated_since is not None:
+        if updated_since.tzinfo is None:
+            updated_since = updated_since.replace(tzinfo=timezone.utc)
+        # Responses round epoch timestamps to whole microseconds; widen by half a microsecond
+        # so a record's own ``updated_at`` always matches it.
+        since = updated_since.timestamp() - 5e-7
+    return PageParams(
+        limit=limit,
+        after=decode_cursor(cursor) if cursor is not None else None,
+        updated_since=since,
+    )
+
+
+def set_page_headers(request: Request, response: Response, next_key: PageKey | None) -> None:
+    """Advertise the next page through ``X-Next-Cursor`` and an RFC 8288 ``Link`` header."""
+
+    if next_key is None:
+        return
+    cursor = encode_cursor(next_key)
+    response.headers["X-Next-Cursor"] = cursor
+    response.headers["Link"] = f'<{request.url.include_query_params(cursor=cursor)}>; rel="next"'
@@ -0,0 +1,139 @@
+"""In-process cache of encoded GET responses, bounded by bytes and invalidated by writes.
+
+An entry holds the encoded body and headers of one response, keyed by path and query
+string, together with the ETag it was rendered for (see :mod:`app.api.conditional`).
+It is only served while that ETag is still current, so a write made by another
+process (which cannot reach this cache) still turns the next read into a miss. Writes
+made through the repository in this process drop the entries they affect right away:
+:meth:`ResponseCache.invalidate` is registered as the repository's change listener.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Request, Response
+
+from app.api.conditional import not_modified
+from app.api.serialization import JSONBytesResponse
+from app.core.metrics import RESPONSE_CACHE_BYTES, RESPONSE_CACHE_EVICTIONS, RESPONSE_CACHE_REQUESTS
+from app.services.repositories import CollectionName
+
+# Headers replayed from a cached entry; content-length is recomputed from the body.
+_CACHED_HEADERS = ("etag", "link", "x-next-cursor")
+
+Tag = tuple[CollectionName, str | None]
+
+
+@dataclass(slots=True)
+class _Entry:
+    etag: str
+    body: bytes
+    headers: dict[str, str]
+    tag: Tag
+    size: int
+
+
+class ResponseCache:
+    """LRU of encoded responses holding at most ``max_bytes`` of bodies and headers.
+
+    Entries are tagged with the collection they render and, for single-record reads,
+    the record id: a change to a record drops its own entries and the collection's list
+    entries, leaving other records' entries in place. ``max_bytes=0`` disables caching.
+    """
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._tags: dict[Tag, set[str]] = {}
+        self._bytes = 0
+
+    @property
+    def bytes_held(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def serve(self, request: Request, etag: str) -> Response | None:
+        """Answer from the client's or this cache's copy of ``etag``; ``None`` on a miss."""
+
+        if (cached := not_modified(request, etag)) is not None:
+            return cached
+        if not self.max_bytes:
+            return None
+        key = _key(request)
+        entry = self._entries.get(key)
+        if entry is None or entry.etag != etag:
+            RESPONSE_CACHE_REQUESTS.labels(result="miss").inc()
+            return None
+        self._entries.move_to_end(key)
+        RESPONSE_CACHE_REQUESTS.labels(result="hit").inc()
+        return JSONBytesResponse(entry.body, headers=entry.headers)
+
+    def store(
+        self,
+        request: Request,
+        etag: str,
+        response: Response,
+        *,
+        collection: CollectionName,
+        record_id: str | None = None,
+    ) -> Response:
+        """Tag ``response`` with ``etag``, cache its body and return it."""
+
+        response.headers["ETag"] = etag
+        if not self.max_bytes:
+            return response
+        key = _key(request)
+        headers = {
+            name: response.headers[name] for name in _CACHED_HEADERS if name in response.headers
+        }
+        size = len(key) + len(response.body) + sum(len(k) + len(v) for k, v in headers.items())
+        if size > self.max_bytes:
+            return response
+        self._remove(key)
+        tag: Tag = (collection, record_id)
+        self._entries[key] = _Entry(etag, bytes(response.body), headers, tag, size)
+        self._tags.setdefault(tag, set()).add(key)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)), reason="lru")
+        RESPONSE_CACHE_BYTES.set(self._bytes)
+        return response
+
+    def invalidate(self, collection: CollectionName, ids: tuple[str, ...] = ()) -> None:
+        """Drop ``collection``'s list entries and the entries of records ``ids`` (all if empty)."""
+
+        if ids:
+            tags = [(collection, None), *((collection, record_id) for record_id in ids)]
+        else:
+            tags = [tag for tag in self._tags if tag[0] == collection]
+        for tag in tags:
+            for key in self._tags.get(tag, set()).copy():
+                self._remove(key, reason="invalidation")
+        RESPONSE_CACHE_BYTES.set(self._bytes)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self._bytes = 0
+        RESPONSE_CACHE_BYTES.set(0)
+
+    def _remove(self, key: str, *, reason: str | None = None) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        keys = self._tags[entry.tag]
+        keys.discard(key)
+        if not keys:
+            del self._tags[entry.tag]
+        if reason is not None:
+            RESPONSE_CACHE_EVICTIONS.labels(reason=reason).inc()
+
+
+def _key(request: Request) -> str:
+    query = request.url.query
+    return f"{request.url.path}?{query}" if query else request.url.path
@@ -2,10 +2,13 @@
 
 from fastapi import APIRouter
 
+from .dashboard import summary_router as dashboard_summary_router
+from .events import router as events_router
 from .health import router as health_router
 from .jobs import router as jobs_router
 from .metrics import router as metrics_router
 from .monitors import router as monitors_router
+from .profiling import router as profiling_router
 from .tasks import router as tasks_router
 
 api_router = APIRouter()
@@ -13,5 +16,8 @@ api_router.include_router(health_router, tags=["health"])
 api_router.include_router(tasks_router)
 api_router.include_router(jobs_router)
 api_router.include_router(monitors_router)
+api_router.include_router(dashboard_summary_router)
+api_router.include_router(events_router)
+api_router.include_router(profiling_router)
 
 __all__ = ["api_router", "metrics_router"]
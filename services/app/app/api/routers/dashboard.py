@@ -1,9 +1,24 @@
 """Simple frontend dashboard for inspecting WebIntel sample state."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import HTMLResponse
 
+from app.api.schemas import DashboardSummaryResponse
+from app.dependencies import get_repository
+from app.services.interfaces import Repository
+
 router = APIRouter(tags=["dashboard"])
+summary_router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@summary_router.get("/summary", response_model=DashboardSummaryResponse)
+async def dashboard_summary(
+    recent: int = Query(default=6, ge=0, le=50),
+    repository: Repository = Depends(get_repository),
+) -> DashboardSummaryResponse:
+    """Return the dashboard counters and the ``recent`` newest jobs without listing entities."""
+
+    return DashboardSummaryResponse.from_summary(await repository.summary(recent))
 
 
 @router.get("/", response_class=HTMLResponse, summary="WebIntel dashboard")
@@ -80,6 +95,8 @@ async def dashboard() -> HTMLResponse:
         <div class="card"><div class="label">Tasks</div><div class="value" id="task-count">-</div></div>
         <div class="card"><div class="label">Jobs</div><div class="value" id="job-count">-</div></div>
         <div class="card"><div class="label">Monitors</div><div class="value" id="monitor-count">-</div></div>
+        <div class="card"><div class="label">Changed Monitors</div><div class="value" id="changed-count">-</div></div>
+        <div class="card"><div class="label">Failing Jobs</div><div class="value" id="failing-count">-</div></div>
       </section>
 
       <h2>Recent Jobs</h2>
@@ -87,41 +104,77 @@ async def dashboard() -> HTMLResponse:
         <thead><tr><th>Job ID</th><th>Task ID</th><th>Interval (s)</th><th>Enabled</th></tr></thead>
         <tbody id="job-rows"><tr><td colspan="4" class="muted">Loading...</td></tr></tbody>
       </table>
+
+      <h2>Live Events <span class="muted" id="stream-state">connecting...</span></h2>
+      <table>
+        <thead><tr><th>Time</th><th>Event</th><th>Details</th></tr></thead>
+        <tbody id="event-rows"><tr><td colspan="3" class="muted">Waiting for changes...</td></tr></tbody>
+      </table>
     </main>
     <script>
+      // Rows are built node by node: job ids, monitor URLs and error messages are user data.
+      const makeRow = (cells, { colspan = null, muted = false } = {}) => {
+        const row = document.createElement('tr');
+        cells.forEach((value) => {
+          const cell = document.createElement('td');
+          cell.textContent = String(value);
+          if (colspan) cell.colSpan = colspan;
+          if (muted) cell.className = 'muted';
+          row.appendChild(cell);
+        });
+        return row;
+      };
       const toRows = (jobs) => {
         if (!jobs.length) {
-          return '<tr><td colspan="4" class="muted">No jobs created yet.</td></tr>';
+          return [makeRow(['No jobs created yet.'], { colspan: 4, muted: true })];
         }
-        return jobs
-          .slice(0, 6)
-          .map((job) =>
-            `<tr><td>${job.id}</td><td>${job.task_id}</td><td>${job.schedule_every_seconds}</td><td>${job.enabled}</td></tr>`
-          )
-          .join('');
+        return jobs.map((job) =>
+          makeRow([job.id, job.task_id, job.schedule_every_seconds, job.enabled])
+        );
       };
 
       const loadDashboard = async () => {
-        const [tasks, jobs, monitors] = await Promise.all([
-          fetch('/api/tasks').then((res) => res.json()),
-          fetch('/api/jobs').then((res) => res.json()),
-          fetch('/api/monitors').then((res) => res.json()),
-        ]);
-
-        document.getElementById('task-count').textContent = tasks.length;
-        document.getElementById('job-count').textContent = jobs.length;
-        document.getElementById('monitor-count').textContent = monitors.length;
-        document.getElementById('job-rows').innerHTML = toRows(jobs);
+        const summary = await fetch('/api/dashboard/summary?recent=6').then((res) => res.json());
+
+        document.getElementById('task-count').textContent = summary.tasks;
+        document.getElementById('job-count').textContent = summary.jobs;
+        document.getElementById('monitor-count').textContent = summary.monitors;
+        document.getElementById('changed-count').textContent = summary.changed_monitors;
+        document.getElementById('failing-count').textContent = summary.failing_jobs;
+        document.getElementById('job-rows').replaceChildren(...toRows(summary.recent_jobs));
       };
 
       document.getElementById('refresh').addEventListener('click', loadDashboard);
+
+      // Counters change with every event; coalesce bursts into one summary request.
+      let reloadTimer = null;
+      const scheduleReload = () => {
+        clearTimeout(reloadTimer);
+        reloadTimer = setTimeout(() => loadDashboard().catch(() => {}), 500);
+      };
+      const eventRows = [];
+      const showEvent = (type, payload) => {
+        const at = payload.at ? new Date(payload.at).toLocaleTimeString() : '';
+        eventRows.unshift(makeRow([at, type, JSON.stringify(payload.data)]));
+        eventRows.length = Math.min(eventRows.length, 20);
+        document.getElementById('event-rows').replaceChildren(...eventRows);
+      };
+      const stream = new EventSource('/api/events');
+      stream.onopen = () => { document.getElementById('stream-state').textContent = 'live'; };
+      stream.onerror = () => { document.getElementById('stream-state').textContent = 'reconnecting...'; };
+      ['monitor.changed', 'job.succeeded', 'job.failed', 'analysis.completed', 'stream.dropped'].forEach(
+        (type) => stream.addEventListener(type, (message) => {
+          showEvent(type, JSON.parse(message.data));
+          scheduleReload();
+        })
+      );
       loadDashboard().catch((error) => {
-        document.getElementById('job-rows').innerHTML =
-          `<tr><td colspan="4" class="muted">Failed to load dashboard data: ${error}</td></tr>`;
+        document.getElementById('job-rows').replaceChildren(
+          makeRow([`Failed to load dashboard data: ${error}`], { colspan: 4, muted: true })
+        );
       });
     </script>
   </body>
 </html>
 """
     return HTMLResponse(content=html)
-
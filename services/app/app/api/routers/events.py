@@ -0,0 +1,112 @@
+"""Live change stream over Server-Sent Events and WebSocket."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.api.serialization import encode_json
+from app.core.config import get_settings
+from app.dependencies import get_events
+from app.services.events import ChangeEvent, EventHub, Subscription
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Tells EventSource clients how long to wait before reconnecting, in milliseconds.
+_RETRY_MS = 3000
+
+
+def event_row(event: ChangeEvent) -> dict[str, Any]:
+    return {
+        "id": event.id,
+        "type": event.type,
+        "at": datetime.fromtimestamp(event.at, timezone.utc),
+        "data": event.data,
+    }
+
+
+def format_sse(event: ChangeEvent) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (
+        event.id,
+        event.type.encode(),
+        encode_json(event_row(event)),
+    )
+
+
+def _dropped_notice(count: int) -> dict[str, Any]:
+    return {"type": "stream.dropped", "data": {"count": count}}
+
+
+async def sse_stream(subscription: Subscription, heartbeat_seconds: float) -> AsyncIterator[bytes]:
+    """Encode ``subscription`` as an SSE body; closes the subscription when it ends.
+
+    A ``stream.dropped`` event reports events this slow client lost, so it can refetch
+    state instead of trusting the stream; idle periods send a keep-alive comment.
+    """
+
+    with subscription:
+        yield b"retry: %d\n\n" % _RETRY_MS
+        while True:
+            event = await subscription.get(timeout=heartbeat_seconds)
+            if dropped := subscription.take_dropped():
+                yield b"event: stream.dropped\ndata: %s\n\n" % encode_json(_dropped_notice(dropped))
+            if event is not None:
+                yield format_sse(event)
+            elif subscription.closed:
+                return
+            else:
+                yield b": keep-alive\n\n"
+
+
+def _parse_types(types: str | None) -> list[str] | None:
+    return [item.strip() for item in types.split(",") if item.strip()] if types else None
+
+
+@router.get("", response_class=StreamingResponse)
+async def stream_events(
+    types: str | None = Query(
+        default=None, description="Comma-separated event types; all types when omitted."
+    ),
+    last_event_id: int | None = Header(default=None),
+    events: EventHub = Depends(get_events),
+) -> StreamingResponse:
+    """Stream change events as ``text/event-stream``, resuming after ``Last-Event-ID``."""
+
+    subscription = events.subscribe(_parse_types(types), after_id=last_event_id)
+    return StreamingResponse(
+        sse_stream(subscription, get_settings().event_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    types: str | None = None,
+    after: int | None = None,
+    events: EventHub = Depends(get_events),
+) -> None:
+    """Send change events as JSON text frames; ``after`` resumes from an event id."""
+
+    await websocket.accept()
+    heartbeat_seconds = get_settings().event_heartbeat_seconds
+    with events.subscribe(_parse_types(types), after_id=after) as subscription:
+        try:
+            while True:
+                event = await subscription.get(timeout=heartbeat_seconds)
+                if dropped := subscription.take_dropped():
+                    await websocket.send_text(encode_json(_dropped_notice(dropped)).decode())
+                if event is not None:
+                    await websocket.send_text(encode_json(event_row(event)).decode())
+                elif subscription.closed:
+                    await websocket.close(code=1013, reason="slow consumer")
+                    return
+                else:
+                    await websocket.send_text('{"type":"keep-alive"}')
+        except WebSocketDisconnect:
+            return
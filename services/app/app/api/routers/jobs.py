@@ -1,8 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
-from app.api.schemas import JobCreate, JobResponse, JobUpdate, RunResponse
-from app.dependencies import get_repository, get_scheduler
-from app.services.repositories import InMemoryRepository
+from app.api.bulk import BULK_OPENAPI_EXTRA, run_bulk
+from app.api.conditional import collection_etag, record_etag
+from app.api.pagination import PageParams, page_params, set_page_headers
+from app.api.response_cache import ResponseCache
+from app.api.schemas import (
+    BulkItemResult,
+    JobCreate,
+    JobResponse,
+    JobResultsResponse,
+    JobUpdate,
+    ResultResponse,
+    RunResponse,
+)
+from app.api.serialization import job_row, render_row, render_rows
+from app.dependencies import get_repository, get_response_cache, get_scheduler
+from app.services.interfaces import Repository
 from app.services.scheduler import Scheduler
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
@@ -11,43 +24,100 @@ router = APIRouter(prefix="/jobs", tags=["jobs"])
 @router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(
     payload: JobCreate,
-    repository: InMemoryRepository = Depends(get_repository),
+    repository: Repository = Depends(get_repository),
 ) -> JobResponse:
     if not await repository.get_task(payload.task_id):
         raise HTTPException(status_code=404, detail="task not found")
     job = await repository.create_job(payload.task_id, payload.schedule_every_seconds, payload.enabled)
-    return JobResponse.model_validate(job.__dict__)
+    return JobResponse.from_record(job)
+
+
+@router.post("/bulk", response_model=list[BulkItemResult], openapi_extra=BULK_OPENAPI_EXTRA)
+async def bulk_jobs(
+    request: Request,
+    repository: Repository = Depends(get_repository),
+) -> Response:
+    """Create, update or delete jobs from a JSON array or NDJSON body in one batch."""
+
+    return await run_bulk(
+        request,
+        create_model=JobCreate,
+        update_model=JobUpdate,
+        apply=repository.apply_job_batch,
+        row=job_row,
+    )
 
 
 @router.get("", response_model=list[JobResponse])
 async def list_jobs(
-    repository: InMemoryRepository = Depends(get_repository),
-) -> list[JobResponse]:
-    return [JobResponse.model_validate(job.__dict__) for job in await repository.list_jobs()]
+    request: Request,
+    enabled: bool | None = None,
+    params: PageParams = Depends(page_params),
+    repository: Repository = Depends(get_repository),
+    cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
+    etag = collection_etag("jobs", await repository.collection_version("jobs"))
+    if (cached := cache.serve(request, etag)) is not None:
+        return cached
+    page = await repository.page_jobs(
+        after=params.after,
+        limit=params.limit,
+        enabled=enabled,
+        updated_since=params.updated_since,
+    )
+    response = render_rows(job_row, page.items)
+    set_page_headers(request, response, page.next_key)
+    return cache.store(request, etag, response, collection="jobs")
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-async def get_job(job_id: str, repository: InMemoryRepository = Depends(get_repository)) -> JobResponse:
+async def get_job(
+    job_id: str,
+    request: Request,
+    repository: Repository = Depends(get_repository),
+    cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     job = await repository.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="job not found")
-    return JobResponse.model_validate(job.__dict__)
+    etag = record_etag(job)
+    if (cached := cache.serve(request, etag)) is not None:
+        return cached
+    return cache.store(request, etag, render_row(job_row, job), collection="jobs", record_id=job.id)
+
+
+@router.get("/{job_id}/results", response_model=JobResultsResponse)
+async def get_job_results(
+    job_id: str,
+    limit: int = Query(default=20, ge=1, le=100),
+    repository: Repository = Depends(get_repository),
+) -> JobResultsResponse:
+    """Return the job with its ``limit`` most recent execution results, newest first."""
+
+    found = await repository.get_job_with_results(job_id, limit)
+    if found is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    job, results = found
+    return JobResultsResponse(
+        job=JobResponse.from_record(job),
+        results=[ResultResponse.from_record(result) for result in results],
+    )
 
 
 @router.put("/{job_id}", response_model=JobResponse)
 async def update_job(
     job_id: str,
     payload: JobUpdate,
-    repository: InMemoryRepository = Depends(get_repository),
+    repository: Repository = Depends(get_repository),
 ) -> JobResponse:
     job = await repository.update_job(job_id, **payload.model_dump())
     if not job:
         raise HTTPException(status_code=404, detail="job not found")
-    return JobResponse.model_validate(job.__dict__)
+    return JobResponse.from_record(job)
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_job(job_id: str, repository: InMemoryRepository = Depends(get_repository)) -> None:
+async def delete_job(job_id: str, repository: Repository = Depends(get_repository)) -> None:
     deleted = await repository.delete_job(job_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="job not found")
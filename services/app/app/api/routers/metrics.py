@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Response
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from fastapi import APIRouter, Depends, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.core.prometheus import MetricsExporter
+from app.dependencies import get_metrics_exporter
 
 router = APIRouter(tags=["metrics"])
 
 
 @router.get("/metrics")
-async def metrics() -> Response:
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+async def metrics(exporter: MetricsExporter = Depends(get_metrics_exporter)) -> Response:
+    return Response(content=await exporter.render(), media_type=CONTENT_TYPE_LATEST)
@@ -1,55 +1,150 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel
 
-from app.api.schemas import MonitorCreate, MonitorResponse, MonitorUpdate
-from app.dependencies import get_monitor_service, get_repository
+from app.api.bulk import BULK_OPENAPI_EXTRA, run_bulk
+from app.api.conditional import collection_etag, record_etag
+from app.api.pagination import PageParams, page_params, set_page_headers
+from app.api.response_cache import ResponseCache
+from app.api.schemas import BulkItemResult, MonitorCreate, MonitorResponse, MonitorUpdate
+from app.api.serialization import monitor_row, render_row, render_rows
+from app.api.snapshot_batch import SNAPSHOT_BATCH_OPENAPI_EXTRA, ingest_snapshot_lines
+from app.core.config import get_settings
+from app.dependencies import get_monitor_service, get_repository, get_response_cache
+from app.services.interfaces import Repository
 from app.services.monitoring import MonitorService
-from app.services.repositories import InMemoryRepository
+from app.services.repositories import MonitorUrlConflict
+from app.services.snapshots import (
+    SUPPORTED_ENCODINGS,
+    SnapshotDecodeError,
+    SnapshotHasher,
+    SnapshotTooLarge,
+    snapshot_digest,
+)
 
 router = APIRouter(prefix="/monitors", tags=["monitors"])
 
+_URL_CONFLICT = "monitor already exists for source_url"
+
 
 class SnapshotRequest(BaseModel):
     snapshot: str
 
 
+RAW_SNAPSHOT_OPENAPI_EXTRA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+            "text/plain": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
 @router.post("", response_model=MonitorResponse, status_code=status.HTTP_201_CREATED)
 async def create_monitor(
     payload: MonitorCreate,
-    repository: InMemoryRepository = Depends(get_repository),
+    repository: Repository = Depends(get_repository),
 ) -> MonitorResponse:
-    monitor = await repository.create_monitor(payload.name, payload.source_url)
-    return MonitorResponse.model_validate(monitor.__dict__)
+    try:
+        monitor = await repository.create_monitor(payload.name, payload.source_url)
+    except MonitorUrlConflict as exc:
+        raise HTTPException(status_code=409, detail=_URL_CONFLICT) from exc
+    return MonitorResponse.from_record(monitor)
+
+
+@router.post("/bulk", response_model=list[BulkItemResult], openapi_extra=BULK_OPENAPI_EXTRA)
+async def bulk_monitors(
+    request: Request,
+    repository: Repository = Depends(get_repository),
+) -> Response:
+    """Create, update or delete monitors from a JSON array or NDJSON body in one batch.
+
+    A URL taken by a concurrent request between the batch's conflict check and its
+    commit fails the whole batch with 409; nothing of it is applied.
+    """
+
+    try:
+        return await run_bulk(
+            request,
+            create_model=MonitorCreate,
+            update_model=MonitorUpdate,
+            apply=repository.apply_monitor_batch,
+            row=monitor_row,
+        )
+    except MonitorUrlConflict as exc:
+        raise HTTPException(status_code=409, detail=_URL_CONFLICT) from exc
+
+
+@router.post("/snapshots", openapi_extra=SNAPSHOT_BATCH_OPENAPI_EXTRA)
+async def ingest_snapshots(
+    request: Request,
+    monitor_service: MonitorService = Depends(get_monitor_service),
+) -> Response:
+    """Ingest NDJSON ``{"monitor_id", "snapshot"}`` lines, one result line back per line.
+
+    Each result carries the line number, a per-line ``status`` (200, 404 for an unknown
+    monitor, 413 for an oversized line, 422 for an invalid one) and, when applied,
+    ``changed`` and ``snapshot_hash``.
+    """
+
+    return await ingest_snapshot_lines(
+        request, monitor_service, max_line_bytes=get_settings().snapshot_max_bytes
+    )
 
 
 @router.get("", response_model=list[MonitorResponse])
 async def list_monitors(
-    repository: InMemoryRepository = Depends(get_repository),
-) -> list[MonitorResponse]:
-    return [MonitorResponse.model_validate(monitor.__dict__) for monitor in await repository.list_monitors()]
+    request: Request,
+    changed: bool | None = None,
+    params: PageParams = Depends(page_params),
+    repository: Repository = Depends(get_repository),
+    cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
+    etag = collection_etag("monitors", await repository.collection_version("monitors"))
+    if (cached := cache.serve(request, etag)) is not None:
+        return cached
+    page = await repository.page_monitors(
+        after=params.after,
+        limit=params.limit,
+        changed=changed,
+        updated_since=params.updated_since,
+    )
+    response = render_rows(monitor_row, page.items)
+    set_page_headers(request, response, page.next_key)
+    return cache.store(request, etag, response, collection="monitors")
 
 
 @router.get("/{monitor_id}", response_model=MonitorResponse)
 async def get_monitor(
     monitor_id: str,
-    repository: InMemoryRepository = Depends(get_repository),
-) -> MonitorResponse:
+    request: Request,
+    repository: Repository = Depends(get_repository),
+    cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     monitor = await repository.get_monitor(monitor_id)
     if not monitor:
         raise HTTPException(status_code=404, detail="monitor not found")
-    return MonitorResponse.model_validate(monitor.__dict__)
+    etag = record_etag(monitor)
+    if (cached := cache.serve(request, etag)) is not None:
+        return cached
+    response = render_row(monitor_row, monitor)
+    return cache.store(request, etag, response, collection="monitors", record_id=monitor.id)
 
 
 @router.put("/{monitor_id}", response_model=MonitorResponse)
 async def update_monitor(
     monitor_id: str,
     payload: MonitorUpdate,
-    repository: InMemoryRepository = Depends(get_repository),
+    repository: Repository = Depends(get_repository),
 ) -> MonitorResponse:
-    monitor = await repository.update_monitor(monitor_id, **payload.model_dump())
+    try:
+        monitor = await repository.update_monitor(monitor_id, **payload.model_dump())
+    except MonitorUrlConflict as exc:
+        raise HTTPException(status_code=409, detail=_URL_CONFLICT) from exc
     if not monitor:
         raise HTTPException(status_code=404, detail="monitor not found")
-    return MonitorResponse.model_validate(monitor.__dict__)
+    return MonitorResponse.from_record(monitor)
 
 
 @router.post("/{monitor_id}/snapshot", response_model=MonitorResponse)
@@ -57,20 +152,56 @@ async def ingest_snapshot(
     monitor_id: str,
     payload: SnapshotRequest,
     monitor_service: MonitorService = Depends(get_monitor_service),
-    repository: InMemoryRepository = Depends(get_repository),
 ) -> MonitorResponse:
-    changed = await monitor_service.ingest_snapshot(monitor_id, payload.snapshot)
-    monitor = await repository.get_monitor(monitor_id)
+    monitor = await monitor_service.ingest_digest(monitor_id, snapshot_digest(payload.snapshot))
+    if not monitor:
+        raise HTTPException(status_code=404, detail="monitor not found")
+    return MonitorResponse.from_record(monitor)
+
+
+@router.post(
+    "/{monitor_id}/snapshot/raw",
+    response_model=MonitorResponse,
+    openapi_extra=RAW_SNAPSHOT_OPENAPI_EXTRA,
+)
+async def ingest_raw_snapshot(
+    monitor_id: str,
+    request: Request,
+    monitor_service: MonitorService = Depends(get_monitor_service),
+    repository: Repository = Depends(get_repository),
+) -> MonitorResponse:
+    """Ingest the request body itself as the snapshot, optionally ``Content-Encoding: gzip``.
+
+    The body is hashed chunk by chunk as it streams in and never held in memory; only
+    the digest comparison runs under the repository's write lock.
+    """
+
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    if encoding not in SUPPORTED_ENCODINGS:
+        raise HTTPException(status_code=415, detail=f"unsupported content encoding {encoding!r}")
+    if not await repository.get_monitor(monitor_id):
+        raise HTTPException(status_code=404, detail="monitor not found")
+    hasher = SnapshotHasher(
+        content_encoding=encoding, max_bytes=get_settings().snapshot_max_bytes
+    )
+    try:
+        async for chunk in request.stream():
+            hasher.update(chunk)
+        digest = hasher.digest()
+    except SnapshotTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except SnapshotDecodeError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    monitor = await monitor_service.ingest_digest(monitor_id, digest)
     if not monitor:
         raise HTTPException(status_code=404, detail="monitor not found")
-    monitor.changed = changed
-    return MonitorResponse.model_validate(monitor.__dict__)
+    return MonitorResponse.from_record(monitor)
 
 
 @router.delete("/{monitor_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_monitor(
     monitor_id: str,
-    repository: InMemoryRepository = Depends(get_repository),
+    repository: Repository = Depends(get_repository),
 ) -> None:
     deleted = await repository.delete_monitor(monitor_id)
     if not deleted:
@@ -0,0 +1,43 @@
+"""On-demand sampling profile of the whole process over a time window."""
+
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Response
+
+from app.core.config import get_settings
+from app.core.profiling import FOLDED_MEDIA_TYPE, StackSampler
+
+router = APIRouter(prefix="/profile", tags=["profiling"])
+
+
+@router.post("", response_class=Response)
+async def profile_window(
+    seconds: float = Query(default=10.0, gt=0, description="How long to sample for."),
+) -> Response:
+    """Sample every thread for ``seconds`` and download the collapsed stacks.
+
+    The ``.folded`` file feeds ``flamegraph.pl``, speedscope or inferno directly. Only
+    available when ``PROFILING_ENABLED`` is set.
+    """
+
+    settings = get_settings()
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=404, detail="profiling is disabled")
+    if seconds > settings.profiling_max_seconds:
+        raise HTTPException(
+            status_code=422,
+            detail=f"profiles are limited to {settings.profiling_max_seconds} seconds",
+        )
+    sampler = StackSampler(interval=settings.profiling_interval_seconds)
+    with sampler:
+        await asyncio.sleep(seconds)
+    return Response(
+        sampler.folded(),
+        media_type=FOLDED_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": 'attachment; filename="profile.folded"',
+            "X-Profile-Samples": str(sampler.samples),
+        },
+    )
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
-from app.api.schemas import TaskCreate, TaskResponse, TaskUpdate
-from app.dependencies import get_repository
-from app.services.repositories import InMemoryRepository
+from app.api.bulk import BULK_OPENAPI_EXTRA, run_bulk
+from app.api.conditional import collection_etag, record_etag
+from app.api.pagination import PageParams, page_params, set_page_headers
+from app.api.response_cache import ResponseCache
+from app.api.schemas import BulkItemResult, JobResponse, TaskCreate, TaskResponse, TaskUpdate
+from app.api.serialization import job_row, render_row, render_rows, task_row
+from app.dependencies import get_repository, get_response_cache
+from app.services.interfaces import Repository
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -10,41 +15,97 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     payload: TaskCreate,
-    repository: InMemoryRepository = Depends(get_repository),
+    repository: Repository = Depends(get_repository),
 ) -> TaskResponse:
     task = await repository.create_task(payload.name, payload.payload)
-    return TaskResponse.model_validate(task.__dict__)
+    return TaskResponse.from_record(task)
+
+
+@router.post("/bulk", response_model=list[BulkItemResult], openapi_extra=BULK_OPENAPI_EXTRA)
+async def bulk_tasks(
+    request: Request,
+    repository: Repository = Depends(get_repository),
+) -> Response:
+    """Create, update or delete tasks from a JSON array or NDJSON body in one batch."""
+
+    return await run_bulk(
+        request,
+        create_model=TaskCreate,
+        update_model=TaskUpdate,
+        apply=repository.apply_task_batch,
+        row=task_row,
+    )
 
 
 @router.get("", response_model=list[TaskResponse])
 async def list_tasks(
-    repository: InMemoryRepository = Depends(get_repository),
-) -> list[TaskResponse]:
-    return [TaskResponse.model_validate(task.__dict__) for task in await repository.list_tasks()]
+    request: Request,
+    params: PageParams = Depends(page_params),
+    repository: Repository = Depends(get_repository),
+    cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
+    etag = collection_etag("tasks", await repository.collection_version("tasks"))
+    if (cached := cache.serve(request, etag)) is not None:
+        return cached
+    page = await repository.page_tasks(
+        after=params.after,
+        limit=params.limit,
+        updated_since=params.updated_since,
+    )
+    response = render_rows(task_row, page.items)
+    set_page_headers(request, response, page.next_key)
+    return cache.store(request, etag, response, collection="tasks")
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: str, repository: InMemoryRepository = Depends(get_repository)) -> TaskResponse:
+async def get_task(
+    task_id: str,
+    request: Request,
+    repository: Repository = Depends(get_repository),
+    cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     task = await repository.get_task(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="task not found")
-    return TaskResponse.model_validate(task.__dict__)
+    etag = record_etag(task)
+    if (cached := cache.serve(request, etag)) is not None:
+        return cached
+    return cache.store(
+        request, etag, render_row(task_row, task), collection="tasks", record_id=task.id
+    )
+
+
+@router.get("/{task_id}/jobs", response_model=list[JobResponse])
+async def list_task_jobs(
+    task_id: str,
+    request: Request,
+    repository: Repository = Depends(get_repository),
+    cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
+    # Deleting the task bumps the jobs collection too, so a stale tag cannot hide a 404.
+    etag = collection_etag("jobs", await repository.collection_version("jobs"))
+    if (cached := cache.serve(request, etag)) is not None:
+        return cached
+    if not await repository.get_task(task_id):
+        raise HTTPException(status_code=404, detail="task not found")
+    response = render_rows(job_row, await repository.list_jobs_for_task(task_id))
+    return cache.store(request, etag, response, collection="jobs")
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: str,
     payload: TaskUpdate,
-    repository: InMemoryRepository = Depends(get_repository),
+    repository: Repository = Depends(get_repository),
 ) -> TaskResponse:
     task = await repository.update_task(task_id, **payload.model_dump())
     if not task:
         raise HTTPException(status_code=404, detail="task not found")
-    return TaskResponse.model_validate(task.__dict__)
+    return TaskResponse.from_record(task)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task(task_id: str, repository: InMemoryRepository = Depends(get_repository)) -> None:
+async def delete_task(task_id: str, repository: Repository = Depends(get_repository)) -> None:
     deleted = await repository.delete_task(task_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="task not found")
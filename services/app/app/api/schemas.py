@@ -1,8 +1,22 @@
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
+from app.services.repositories import (
+    DashboardSummary,
+    JobRecord,
+    MonitorRecord,
+    ResultRecord,
+    TaskRecord,
+)
+
+
+def from_timestamp(value: float | None) -> datetime | None:
+    """Convert a repository epoch timestamp into an aware UTC datetime."""
+
+    return None if value is None else datetime.fromtimestamp(value, timezone.utc)
+
 
 class TaskBase(BaseModel):
     name: str
@@ -23,6 +37,16 @@ class TaskResponse(TaskBase):
     created_at: datetime
     updated_at: datetime
 
+    @classmethod
+    def from_record(cls, record: TaskRecord) -> "TaskResponse":
+        return cls(
+            id=record.id,
+            name=record.name,
+            payload=record.payload,
+            created_at=from_timestamp(record.created_at),
+            updated_at=from_timestamp(record.updated_at),
+        )
+
 
 class JobBase(BaseModel):
     task_id: str
@@ -45,6 +69,59 @@ class JobResponse(JobBase):
     created_at: datetime
     updated_at: datetime
 
+    @classmethod
+    def from_record(cls, record: JobRecord) -> "JobResponse":
+        return cls(
+            id=record.id,
+            task_id=record.task_id,
+            schedule_every_seconds=record.schedule_every_seconds,
+            enabled=record.enabled,
+            last_run_at=from_timestamp(record.last_run_at),
+            created_at=from_timestamp(record.created_at),
+            updated_at=from_timestamp(record.updated_at),
+        )
+
+
+class ResultResponse(BaseModel):
+    id: str
+    status: str
+    content: str | None = None
+    created_at: datetime
+
+    @classmethod
+    def from_record(cls, record: ResultRecord) -> "ResultResponse":
+        return cls(
+            id=record.id,
+            status=record.status,
+            content=record.content,
+            created_at=from_timestamp(record.created_at),
+        )
+
+
+class JobResultsResponse(BaseModel):
+    job: JobResponse
+    results: list[ResultResponse]
+
+
+class DashboardSummaryResponse(BaseModel):
+    tasks: int
+    jobs: int
+    monitors: int
+    changed_monitors: int
+    failing_jobs: int
+    recent_jobs: list[JobResponse]
+
+    @classmethod
+    def from_summary(cls, summary: DashboardSummary) -> "DashboardSummaryResponse":
+        return cls(
+            tasks=summary.tasks,
+            jobs=summary.jobs,
+            monitors=summary.monitors,
+            changed_monitors=summary.changed_monitors,
+            failing_jobs=summary.failing_jobs,
+            recent_jobs=[JobResponse.from_record(job) for job in summary.recent_jobs],
+        )
+
 
 class MonitorBase(BaseModel):
     name: str
@@ -67,7 +144,36 @@ class MonitorResponse(MonitorBase):
     created_at: datetime
     updated_at: datetime
 
+    @classmethod
+    def from_record(cls, record: MonitorRecord) -> "MonitorResponse":
+        return cls(
+            id=record.id,
+            name=record.name,
+            source_url=record.source_url,
+            last_snapshot_hash=record.last_snapshot_hash,
+            changed=record.changed,
+            created_at=from_timestamp(record.created_at),
+            updated_at=from_timestamp(record.updated_at),
+        )
+
 
 class RunResponse(BaseModel):
     status: str
     details: str
+
+
+class BulkItem(BaseModel):
+    """One line of a bulk request; ``data`` holds the create/update body."""
+
+    op: Literal["create", "update", "delete"] = "create"
+    id: str | None = None
+    data: dict[str, Any] = Field(default_factory=dict)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    id: str | None = None
+    item: dict[str, Any] | None = None
+    error: str | None = None
@@ -0,0 +1,100 @@
+"""Fast serialization path for large list responses.
+
+Repository records are trusted, so list endpoints skip per-item model validation and the
+second ``response_model`` pass: each record is mapped to a JSON-ready row by a pre-built
+function and the whole batch is encoded to bytes in one call. ``orjson`` is used when it is
+installed (``pip install webintel-app[fast]``); otherwise ``pydantic_core.to_json``. Both
+emit the same JSON as the response models, including ``Z``-suffixed UTC datetimes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any, TypeVar
+
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+from app.services.repositories import JobRecord, MonitorRecord, TaskRecord
+
+try:  # pragma: no cover - exercised only when the optional dependency is installed
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+RecordT = TypeVar("RecordT")
+Row = dict[str, Any]
+
+_fromtimestamp = datetime.fromtimestamp
+_UTC = timezone.utc
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode ``content`` to JSON bytes with the fastest available encoder."""
+
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return to_json(content)
+
+
+class JSONBytesResponse(Response):
+    """JSON response whose content is either pre-encoded bytes or encoded on render."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return encode_json(content)
+
+
+# Row builders mirror the field order of the matching ``*Response`` schema.
+
+
+def task_row(record: TaskRecord) -> Row:
+    return {
+        "name": record.name,
+        "payload": record.payload,
+        "id": record.id,
+        "created_at": _fromtimestamp(record.created_at, _UTC),
+        "updated_at": _fromtimestamp(record.updated_at, _UTC),
+    }
+
+
+def job_row(record: JobRecord) -> Row:
+    last_run_at = record.last_run_at
+    return {
+        "task_id": record.task_id,
+        "schedule_every_seconds": record.schedule_every_seconds,
+        "enabled": record.enabled,
+        "id": record.id,
+        "last_run_at": None if last_run_at is None else _fromtimestamp(last_run_at, _UTC),
+        "created_at": _fromtimestamp(record.created_at, _UTC),
+        "updated_at": _fromtimestamp(record.updated_at, _UTC),
+    }
+
+
+def monitor_row(record: MonitorRecord) -> Row:
+    digest = record.last_snapshot_digest
+    return {
+        "name": record.name,
+        "source_url": record.source_url,
+        "id": record.id,
+        "last_snapshot_hash": None if digest is None else digest.hex(),
+        "changed": record.changed,
+        "created_at": _fromtimestamp(record.created_at, _UTC),
+        "updated_at": _fromtimestamp(record.updated_at, _UTC),
+    }
+
+
+def render_row(row: Callable[[RecordT], Row], record: RecordT) -> JSONBytesResponse:
+    """Serialize one ``record`` with ``row`` into a pre-encoded JSON object response."""
+
+    return JSONBytesResponse(encode_json(row(record)))
+
+
+def render_rows(row: Callable[[RecordT], Row], records: Iterable[RecordT]) -> JSONBytesResponse:
+    """Serialize ``records`` with ``row`` into a single pre-encoded JSON array response."""
+
+    return JSONBytesResponse(encode_json([row(record) for record in records]))
@@ -0,0 +1,161 @@
+"""Batch snapshot ingest from an NDJSON body of ``{"monitor_id", "snapshot"}`` lines.
+
+The body is read line by line as it streams in: each snapshot is hashed as soon as its
+line is complete and only the digest is kept, so memory is bounded by one line and one
+group of digests rather than by the request. Every :data:`STREAM_CHUNK_LINES` lines the
+group is applied with one :meth:`MonitorService.ingest_digests` call (one repository
+lock or transaction). Per-line results are spooled to a temporary file and streamed
+back as NDJSON in request order once the body has been consumed; the response does not
+start while the request is still being read, because many HTTP clients cannot receive
+before they have finished sending.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+from contextlib import ExitStack
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from starlette.background import BackgroundTask
+
+from app.api.bulk import NDJSON_MEDIA_TYPE, STREAM_CHUNK_LINES, format_errors
+from app.api.serialization import Row, encode_json
+from app.services.monitoring import MonitorService
+from app.services.snapshots import snapshot_digest
+
+# Results beyond this many bytes move from memory to a temporary file.
+_SPOOL_MAX_BYTES = 1 << 20
+_READ_SIZE = 64 * 1024
+
+
+class SnapshotLine(BaseModel):
+    monitor_id: str
+    snapshot: str
+
+
+SNAPSHOT_BATCH_OPENAPI_EXTRA: dict[str, Any] = {
+    "requestBody": {
+        "required": True,
+        "content": {NDJSON_MEDIA_TYPE: {"schema": SnapshotLine.model_json_schema()}},
+    }
+}
+
+
+async def split_lines(stream: AsyncIterator[bytes], max_bytes: int) -> AsyncIterator[bytes | None]:
+    """Yield the lines of ``stream`` without their newline, blank ones included.
+
+    A line longer than ``max_bytes`` is discarded as it arrives and yielded as ``None``.
+    """
+
+    buffer = bytearray()
+    skipping = False
+    async for chunk in stream:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            if skipping or len(buffer) + end - start > max_bytes:
+                yield None
+            else:
+                buffer += chunk[start:end]
+                yield bytes(buffer)
+            buffer.clear()
+            skipping = False
+            start = end + 1
+        if not skipping:
+            buffer += chunk[start:]
+            if len(buffer) > max_bytes:
+                buffer.clear()
+                skipping = True
+    if skipping:
+        yield None
+    elif buffer.strip():
+        yield bytes(buffer)
+
+
+def _error_row(line: int, monitor_id: str | None, status: int, error: str) -> Row:
+    return {
+        "line": line,
+        "monitor_id": monitor_id,
+        "status": status,
+        "changed": None,
+        "snapshot_hash": None,
+        "error": error,
+    }
+
+
+class _Group:
+    """Result rows of the lines read since the last flush, in request order."""
+
+    def __init__(self) -> None:
+        self.rows: list[Row] = []
+        self.digests: list[tuple[str, bytes]] = []
+        self._pending: list[int] = []
+
+    def add(self, line: int, monitor_id: str, digest: bytes) -> None:
+        self._pending.append(len(self.rows))
+        self.rows.append(_error_row(line, monitor_id, 404, "monitor not found"))
+        self.digests.append((monitor_id, digest))
+
+    async def flush(self, monitor_service: MonitorService, out: IO[bytes]) -> None:
+        if self.digests:
+            monitors = await monitor_service.ingest_digests(self.digests)
+            for position, monitor in zip(self._pending, monitors):
+                if monitor is not None:
+                    self.rows[position].update(
+                        status=200,
+                        changed=monitor.changed,
+                        snapshot_hash=monitor.last_snapshot_hash,
+                        error=None,
+                    )
+        for row in self.rows:
+            out.write(encode_json(row) + b"\n")
+        self.rows.clear()
+        self.digests.clear()
+        self._pending.clear()
+
+
+def _read_spool(spool: IO[bytes]) -> Iterator[bytes]:
+    spool.seek(0)
+    while chunk := spool.read(_READ_SIZE):
+        yield chunk
+
+
+async def _ingest_into(
+    spool: IO[bytes], request: Request, monitor_service: MonitorService, *, max_line_bytes: int
+) -> None:
+    group = _Group()
+    line_number = 0
+    async for line in split_lines(request.stream(), max_line_bytes):
+        line_number += 1
+        if line is None:
+            group.rows.append(
+                _error_row(line_number, None, 413, f"line exceeds {max_line_bytes} bytes")
+            )
+        elif line.strip():
+            try:
+                item = SnapshotLine.model_validate_json(line)
+            except ValidationError as exc:
+                group.rows.append(_error_row(line_number, None, 422, format_errors(exc)))
+            else:
+                group.add(line_number, item.monitor_id, snapshot_digest(item.snapshot))
+        if len(group.rows) >= STREAM_CHUNK_LINES:
+            await group.flush(monitor_service, spool)
+    await group.flush(monitor_service, spool)
+
+
+async def ingest_snapshot_lines(
+    request: Request, monitor_service: MonitorService, *, max_line_bytes: int
+) -> StreamingResponse:
+    """Ingest every line of ``request`` and stream one result row back per non-blank line."""
+
+    with ExitStack() as cleanup:
+        spool = cleanup.enter_context(SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES))
+        await _ingest_into(spool, request, monitor_service, max_line_bytes=max_line_bytes)
+        # Outlives this call: the response streams it and closes it in a background task.
+        cleanup.pop_all()
+    return StreamingResponse(
+        _read_spool(spool), media_type=NDJSON_MEDIA_TYPE, background=BackgroundTask(spool.close)
+    )
@@ -1,6 +1,7 @@
 """Application configuration settings powered by pydantic-settings."""
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -25,6 +26,137 @@ class Settings(BaseSettings):
         default="sqlite+aiosqlite:///./webintel.db",
         description="Async SQLAlchemy connection URL.",
     )
+    database_replica_url: str | None = Field(
+        default=None,
+        description="Optional async SQLAlchemy URL of a read replica used for read-only sessions.",
+    )
+    db_read_your_writes_seconds: float = Field(
+        default=2.0,
+        ge=0,
+        description="After a write, reads in the same request stay on the primary this long.",
+    )
+    db_replica_retry_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="How long reads stay on the primary after the replica failed to connect.",
+    )
+    sqlite_profile: Literal["default", "production"] = Field(
+        default="default",
+        description=(
+            "SQLite tuning: 'production' enables WAL, synchronous=NORMAL, mmap/cache sizing and "
+            "funnels writes through a single writer connection."
+        ),
+    )
+    sqlite_mmap_size_bytes: int = Field(
+        default=268_435_456, ge=0, description="SQLite mmap_size for the production profile."
+    )
+    sqlite_cache_size_kib: int = Field(
+        default=65_536, ge=0, description="SQLite page cache per connection, in KiB."
+    )
+    sqlite_busy_timeout_ms: int = Field(
+        default=5_000, ge=0, description="How long a SQLite connection waits on a lock."
+    )
+    repository_backend: Literal["memory", "database"] = Field(
+        default="memory",
+        description="Repository implementation wired into the API: in-process or SQLAlchemy.",
+    )
+    db_pool_size: int = Field(default=5, ge=1, description="Persistent connections kept in the pool.")
+    db_max_overflow: int = Field(
+        default=10, ge=0, description="Extra connections allowed above the pool size under load."
+    )
+    db_pool_timeout_seconds: float = Field(
+        default=30.0, gt=0, description="Seconds to wait for a pooled connection before failing."
+    )
+    db_pool_recycle_seconds: int = Field(
+        default=1800,
+        description="Recycle connections older than this many seconds; -1 disables recycling.",
+    )
+    db_pool_pre_ping: bool = Field(
+        default=True, description="Test pooled connections for liveness on checkout."
+    )
+    repository_cache_ttl_seconds: float = Field(
+        default=0.0,
+        ge=0,
+        description=(
+            "TTL of the database repository's by-id and monitor-URL read-through cache; "
+            "0 disables it."
+        ),
+    )
+    repository_cache_max_entries: int = Field(
+        default=10_000, ge=1, description="Entries kept per repository cache before LRU eviction."
+    )
+    snapshot_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=1,
+        description="Largest decoded snapshot accepted by the streaming snapshot endpoint.",
+    )
+    response_cache_max_bytes: int = Field(
+        default=16 * 1024 * 1024,
+        ge=0,
+        description="Bytes of encoded GET responses kept in process (LRU); 0 disables the cache.",
+    )
+    repository_counts_max_age_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="Longest the database repository serves dashboard counters before reloading.",
+    )
+    event_buffer_size: int = Field(
+        default=256, ge=1, description="Change events buffered per live subscriber."
+    )
+    event_slow_consumer_policy: Literal["drop_oldest", "disconnect"] = Field(
+        default="drop_oldest",
+        description=(
+            "What a full subscriber buffer does: discard its oldest event, or disconnect the "
+            "client so it resumes from Last-Event-ID."
+        ),
+    )
+    metrics_cache_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description=(
+            "How long a multi-process /metrics payload is reused before the worker files are "
+            "merged again; 0 merges on every scrape."
+        ),
+    )
+    profiling_enabled: bool = Field(
+        default=False,
+        description=(
+            "Allow sampling profiles: of one request via the X-Profile header, or of a time "
+            "window via POST /api/profile."
+        ),
+    )
+    profiling_interval_seconds: float = Field(
+        default=0.005, gt=0, description="Interval between stack samples while profiling."
+    )
+    profiling_max_seconds: float = Field(
+        default=60.0, gt=0, description="Longest time window POST /api/profile may sample."
+    )
+    event_heartbeat_seconds: float = Field(
+        default=15.0, gt=0, description="Idle interval after which live streams send a keep-alive."
+    )
+    db_slow_query_seconds: float = Field(
+        default=0.5, ge=0, description="Statements slower than this are logged with a fingerprint."
+    )
+    result_batch_size: int = Field(
+        default=500, ge=1, description="Job results written per batched insert."
+    )
+    result_flush_interval_seconds: float = Field(
+        default=0.05, gt=0, description="Longest a buffered job result waits before being flushed."
+    )
+    result_max_pending: int = Field(
+        default=10_000,
+        ge=1,
+        description="Buffered job results at which producers block until a flush catches up.",
+    )
+    result_partition_seconds: int = Field(
+        default=86_400, ge=60, description="Time span covered by one results partition."
+    )
+    result_retention_periods: int = Field(
+        default=7, ge=1, description="Full partitions of raw results kept before rollup and drop."
+    )
+    result_compaction_interval_seconds: float = Field(
+        default=3_600.0, gt=0, description="How often expired results partitions are compacted."
+    )
 
 
 @lru_cache(maxsize=1)
@@ -1,8 +1,16 @@
+"""Prometheus metrics shared across the service.
+
+In multi-process mode (see :mod:`app.core.prometheus`) counters and histograms are summed
+across workers, and each gauge's ``multiprocess_mode`` says how its per-process values
+merge: ``mostrecent`` for a reading of shared state (the last write wins), ``livesum`` or
+``livemax`` for per-process state of workers that are still running.
+"""
+
 from prometheus_client import Counter, Gauge, Histogram
 
-TASK_COUNT = Gauge("task_count", "Current number of tasks")
-JOB_COUNT = Gauge("job_count", "Current number of jobs")
-MONITOR_COUNT = Gauge("monitor_count", "Current number of monitors")
+TASK_COUNT = Gauge("task_count", "Current number of tasks", multiprocess_mode="mostrecent")
+JOB_COUNT = Gauge("job_count", "Current number of jobs", multiprocess_mode="mostrecent")
+MONITOR_COUNT = Gauge("monitor_count", "Current number of monitors", multiprocess_mode="mostrecent")
 
 RUN_DURATION_SECONDS = Histogram(
     "run_duration_seconds",
@@ -15,3 +23,128 @@ FAILURE_COUNTER = Counter(
     "Failure counts by operation",
     labelnames=("operation",),
 )
+
+WRITE_BEHIND_PENDING = Gauge(
+    "write_behind_pending_rows",
+    "Rows buffered for a batched insert",
+    labelnames=("table",),
+    multiprocess_mode="livesum",
+)
+
+WRITE_BEHIND_FLUSH_ROWS = Histogram(
+    "write_behind_flush_rows",
+    "Rows written per write-behind batch",
+    labelnames=("table",),
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 5000),
+)
+
+RESULT_PARTITIONS_DROPPED = Counter(
+    "result_partitions_dropped_total",
+    "Expired results partitions rolled up into summaries and dropped",
+)
+
+DB_READ_SESSIONS = Counter(
+    "db_read_sessions_total",
+    "Read-only database sessions by the database they were routed to",
+    labelnames=("target",),
+)
+
+WORK_QUEUE_ITEMS = Counter(
+    "work_queue_items_total",
+    "Work queue items by queue and lifecycle event",
+    labelnames=("queue", "event"),
+)
+
+DB_STATEMENT_DURATION_SECONDS = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time by engine and statement type",
+    labelnames=("engine", "statement"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+DB_STATEMENT_ROWS = Histogram(
+    "db_statement_rows",
+    "Rows returned (queries) or affected (DML) per SQL statement",
+    labelnames=("engine", "statement"),
+    buckets=(0, 1, 10, 100, 1000, 10_000, 100_000),
+)
+
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL statements slower than the slow-query threshold",
+    labelnames=("engine", "statement"),
+)
+
+DB_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    labelnames=("engine",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool",
+    labelnames=("engine",),
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_SATURATION = Gauge(
+    "db_pool_saturation_ratio",
+    "Checked-out connections as a fraction of pool size plus overflow",
+    labelnames=("engine",),
+    multiprocess_mode="livemax",
+)
+
+REPOSITORY_CACHE_EVENTS = Counter(
+    "repository_cache_events_total",
+    "Repository read-through cache hits, misses, expirations and invalidations",
+    labelnames=("cache", "event"),
+)
+
+RESPONSE_CACHE_REQUESTS = Counter(
+    "response_cache_requests_total",
+    "GET responses looked up in the encoded response cache, by hit or miss",
+    labelnames=("result",),
+)
+
+RESPONSE_CACHE_BYTES = Gauge(
+    "response_cache_bytes",
+    "Bytes of encoded responses held by the response cache",
+    multiprocess_mode="livesum",
+)
+
+RESPONSE_CACHE_EVICTIONS = Counter(
+    "response_cache_evictions_total",
+    "Response cache entries dropped for space (lru) or by a write (invalidation)",
+    labelnames=("reason",),
+)
+
+EVENTS_PUBLISHED = Counter(
+    "change_events_published_total",
+    "Change events published to the live event hub",
+    labelnames=("type",),
+)
+
+EVENTS_DROPPED = Counter(
+    "change_events_dropped_total",
+    "Change events a slow subscriber lost, by slow-consumer policy",
+    labelnames=("policy",),
+)
+
+EVENT_SUBSCRIBERS = Gauge(
+    "change_event_subscribers", "Connected live event subscribers", multiprocess_mode="livesum"
+)
+
+HTTP_REQUEST_DURATION_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and response status",
+    labelnames=("method", "route", "status"),
+)
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served, by method and route template",
+    labelnames=("method", "route"),
+    multiprocess_mode="livesum",
+)
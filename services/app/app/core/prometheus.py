@@ -0,0 +1,66 @@
+"""Prometheus exposition for single- and multi-worker deployments.
+
+Each server worker is its own process with its own metric values, so with several
+workers a scrape of ``/metrics`` only sees the worker that happened to answer it.
+Setting ``PROMETHEUS_MULTIPROC_DIR`` in the environment before the server starts
+switches ``prometheus_client`` to multi-process mode: every worker writes its values to
+memory-mapped files in that directory, and :class:`MetricsExporter` merges the files of
+all workers on a scrape (gauges as declared in :mod:`app.core.metrics`). Merging reads
+every file, so the rendered payload is reused for ``metrics_cache_seconds``.
+
+The directory must exist and be emptied by whatever starts the server, before any
+worker runs; stale files from a previous run would otherwise be merged in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from time import monotonic
+
+from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def multiprocess_dir() -> str | None:
+    """Return the multi-process metrics directory, or ``None`` in single-process mode."""
+
+    return os.environ.get(MULTIPROC_DIR_ENV) or os.environ.get(MULTIPROC_DIR_ENV.lower())
+
+
+def mark_worker_exited(pid: int | None = None) -> None:
+    """Stop counting worker ``pid`` (this process by default) in the ``live*`` gauges."""
+
+    if multiprocess_dir() is not None:
+        multiprocess.mark_process_dead(pid or os.getpid(), multiprocess_dir())
+
+
+class MetricsExporter:
+    """Render the Prometheus text exposition, merging worker files when ``directory`` is set.
+
+    In single-process mode every scrape renders the default registry. Merged payloads are
+    cached for ``cache_seconds``; concurrent scrapes of a stale payload share one merge,
+    which runs in a thread so it does not block the event loop.
+    """
+
+    def __init__(self, *, directory: str | None, cache_seconds: float) -> None:
+        self.directory = directory
+        self.cache_seconds = cache_seconds
+        self._payload: bytes | None = None
+        self._rendered_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def render(self) -> bytes:
+        if self.directory is None:
+            return generate_latest()
+        async with self._lock:
+            if self._payload is None or monotonic() - self._rendered_at >= self.cache_seconds:
+                self._payload = await asyncio.to_thread(self._merge)
+                self._rendered_at = monotonic()
+            return self._payload
+
+    def _merge(self) -> bytes:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=self.directory)
+        return generate_latest(registry)
@@ -0,0 +1,75 @@
+"""In-process read-through cache for hot single-entity repository lookups."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from time import monotonic
+from typing import Generic, TypeVar
+
+from app.core.metrics import REPOSITORY_CACHE_EVENTS
+
+ValueT = TypeVar("ValueT")
+
+
+class RecordCache(Generic[ValueT]):
+    """TTL- and size-bounded read-through cache keyed by entity id (or any lookup key).
+
+    :meth:`get` returns a fresh entry or awaits the loader and stores what it
+    returns; misses (``None``) are not cached. Writers call :meth:`invalidate`
+    after their transaction commits. Every invalidation bumps a generation
+    counter, so a load that was already in flight when the entry was invalidated
+    returns its result without caching the possibly stale value. Entries written
+    by other processes are seen after at most ``ttl_seconds``. A ``ttl_seconds``
+    of ``0`` disables caching: every call goes to the loader.
+    """
+
+    def __init__(self, name: str, *, ttl_seconds: float, max_entries: int = 10_000) -> None:
+        self.name = name
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, ValueT]] = OrderedDict()
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(
+        self, key: Hashable, load: Callable[[], Awaitable[ValueT | None]]
+    ) -> ValueT | None:
+        if not self.enabled:
+            return await load()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > monotonic():
+                self._entries.move_to_end(key)
+                REPOSITORY_CACHE_EVENTS.labels(cache=self.name, event="hit").inc()
+                return value
+            del self._entries[key]
+            REPOSITORY_CACHE_EVENTS.labels(cache=self.name, event="expired").inc()
+        REPOSITORY_CACHE_EVENTS.labels(cache=self.name, event="miss").inc()
+        generation = self._generation
+        value = await load()
+        if value is not None and generation == self._generation:
+            self._entries[key] = (monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop ``keys``; with no arguments drop every entry."""
+
+        if not self.enabled:
+            return
+        self._generation += 1
+        if not keys:
+            self._entries.clear()
+        for key in keys:
+            self._entries.pop(key, None)
+        REPOSITORY_CACHE_EVENTS.labels(cache=self.name, event="invalidation").inc(max(len(keys), 1))
@@ -0,0 +1,150 @@
+"""SQLAlchemy engine event hooks feeding statement and connection-pool metrics."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from time import perf_counter
+from typing import Any
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT_SECONDS,
+    DB_POOL_SATURATION,
+    DB_SLOW_QUERIES,
+    DB_STATEMENT_DURATION_SECONDS,
+    DB_STATEMENT_ROWS,
+)
+
+logger = structlog.get_logger(__name__)
+
+_STATEMENT_TYPES = frozenset({"select", "insert", "update", "delete"})
+_STARTED_KEY = "statement_started"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_POSITIONAL_PARAM = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_VALUES_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_type(statement: str) -> str:
+    """Metric label for ``statement``: its leading verb, or ``other`` (DDL, PRAGMA, ...)."""
+
+    verb = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    return verb if verb in _STATEMENT_TYPES else "other"
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce ``statement`` to its shape: literals and parameters become ``?``.
+
+    Placeholder lists (expanded ``IN``, multi-row ``VALUES``) collapse to ``(?)``, so
+    the same query with a different number of bound values normalizes identically.
+    """
+
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _POSITIONAL_PARAM.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _PARAM_LIST.sub("?", normalized)
+    return _VALUES_LIST.sub("(?)", normalized)
+
+
+def fingerprint(statement: str) -> str:
+    """Stable short identifier of ``statement``'s normalized shape."""
+
+    return hashlib.sha1(normalize_statement(statement).encode()).hexdigest()[:16]
+
+
+def _row_count(cursor: Any) -> int | None:
+    if cursor.description is None:
+        # No result set: DML reports affected rows, DDL and PRAGMAs report -1.
+        return cursor.rowcount if cursor.rowcount >= 0 else None
+    # The asyncio DBAPI adapters buffer the whole result on execute, before any fetch.
+    buffered = getattr(cursor, "_rows", None)
+    return len(buffered) if buffered is not None else None
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits for a connection.
+
+    The engine label is the pool's ``logging_name`` (``pool_logging_name`` on the
+    engine), which survives the pool being recreated on ``dispose()``.
+    """
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT_SECONDS.labels(
+                engine=getattr(self, "logging_name", None) or "default"
+            ).observe(perf_counter() - started)
+
+
+def instrument_engine(
+    engine: Engine, *, name: str, slow_query_seconds: float, pool_capacity: int | None = None
+) -> None:
+    """Attach statement timing, row counts, slow-query logging and pool gauges to ``engine``.
+
+    ``engine`` is the sync engine (``AsyncEngine.sync_engine``). ``pool_capacity``
+    (pool size plus overflow) enables the saturation gauge; pass ``None`` for pools
+    without a fixed size.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(_STARTED_KEY, []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = perf_counter() - conn.info[_STARTED_KEY].pop()
+        kind = statement_type(statement)
+        DB_STATEMENT_DURATION_SECONDS.labels(engine=name, statement=kind).observe(elapsed)
+        rows = _row_count(cursor)
+        if rows is not None:
+            DB_STATEMENT_ROWS.labels(engine=name, statement=kind).observe(rows)
+        if elapsed >= slow_query_seconds:
+            DB_SLOW_QUERIES.labels(engine=name, statement=kind).inc()
+            logger.warning(
+                "slow_query",
+                engine=name,
+                statement_type=kind,
+                duration_ms=round(elapsed * 1000, 3),
+                rows=rows,
+                fingerprint=fingerprint(statement),
+                statement=normalize_statement(statement)[:1000],
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(exception_context) -> None:
+        # A failed execute never reaches after_cursor_execute; drop its start time.
+        connection = exception_context.connection
+        if connection is not None and exception_context.statement is not None:
+            started = connection.info.get(_STARTED_KEY)
+            if started:
+                started.pop()
+
+    if pool_capacity is None:
+        return
+    checked_out = 0
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        nonlocal checked_out
+        checked_out += 1
+        DB_POOL_CHECKED_OUT.labels(engine=name).set(checked_out)
+        DB_POOL_SATURATION.labels(engine=name).set(checked_out / pool_capacity)
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record) -> None:
+        nonlocal checked_out
+        checked_out = max(checked_out - 1, 0)
+        DB_POOL_CHECKED_OUT.labels(engine=name).set(checked_out)
+        DB_POOL_SATURATION.labels(engine=name).set(checked_out / pool_capacity)
@@ -5,7 +5,25 @@ from __future__ import annotations
 import enum
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Boolean,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    event,
+    false,
+    func,
+    text,
+    true,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -40,80 +58,153 @@ class ResultStatus(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     email: Mapped[str] = mapped_column(String(320), unique=True, nullable=False, index=True)
     full_name: Mapped[str | None] = mapped_column(String(255))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    tasks: Mapped[list[Task]] = relationship(back_populates="user", cascade="all, delete-orphan")
+    tasks: Mapped[list[Task]] = relationship(
+        back_populates="user", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
+    )
     monitors: Mapped[list[Monitor]] = relationship(
-        back_populates="user", cascade="all, delete-orphan"
+        back_populates="user", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
     )
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_user_id", "user_id"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    payload: Mapped[str | None] = mapped_column(Text)
+    payload: Mapped[str | None] = mapped_column(Text, doc="JSON-encoded task payload.")
     status: Mapped[TaskStatus] = mapped_column(
         Enum(TaskStatus, name="task_status"), default=TaskStatus.PENDING, nullable=False
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    version: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False, doc="Bumped by every update."
+    )
 
-    user: Mapped[User] = relationship(back_populates="tasks")
-    jobs: Mapped[list[Job]] = relationship(back_populates="task", cascade="all, delete-orphan")
+    user: Mapped[User | None] = relationship(back_populates="tasks", lazy="raise")
+    jobs: Mapped[list[Job]] = relationship(
+        back_populates="task", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
+    )
 
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_task_id_id", "task_id", "id"),
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        Index("ix_jobs_updated_at_id", "updated_at", "id"),
+        Index("ix_jobs_enabled_created_at_id", "enabled", "created_at", "id"),
+        Index(
+            "ix_jobs_queued",
+            "id",
+            postgresql_where=text("status = 'QUEUED'"),
+            sqlite_where=text("status = 'QUEUED'"),
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
     external_id: Mapped[str | None] = mapped_column(String(128), unique=True)
     status: Mapped[JobStatus] = mapped_column(
         Enum(JobStatus, name="job_status"), default=JobStatus.QUEUED, nullable=False
     )
+    schedule_every_seconds: Mapped[int] = mapped_column(
+        Integer, default=60, server_default="60", nullable=False
+    )
+    enabled: Mapped[bool] = mapped_column(Boolean, default=True, server_default=true(), nullable=False)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_run_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    version: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False, doc="Bumped by every update."
+    )
 
-    task: Mapped[Task] = relationship(back_populates="jobs")
+    task: Mapped[Task] = relationship(back_populates="jobs", lazy="raise")
     monitors: Mapped[list[Monitor]] = relationship(
-        back_populates="job", cascade="all, delete-orphan"
+        back_populates="job", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
+    )
+    # Results can live in time partitions; read them with app.db.queries.latest_results.
+    results: Mapped[list[Result]] = relationship(
+        back_populates="job", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
     )
-    results: Mapped[list[Result]] = relationship(back_populates="job", cascade="all, delete-orphan")
 
 
 class Monitor(Base):
     __tablename__ = "monitors"
+    __table_args__ = (
+        Index("ix_monitors_user_id", "user_id"),
+        Index("ix_monitors_job_id", "job_id"),
+        Index("ix_monitors_normalized_endpoint", "normalized_endpoint", unique=True),
+        Index("ix_monitors_created_at_id", "created_at", "id"),
+        Index("ix_monitors_updated_at_id", "updated_at", "id"),
+        Index(
+            "ix_monitors_changed_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("changed"),
+            sqlite_where=text("changed = 1"),
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    job_id: Mapped[int] = mapped_column(ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    job_id: Mapped[int | None] = mapped_column(ForeignKey("jobs.id", ondelete="CASCADE"))
+    name: Mapped[str] = mapped_column(String(255), server_default="", nullable=False)
     status: Mapped[MonitorStatus] = mapped_column(
         Enum(MonitorStatus, name="monitor_status"),
         default=MonitorStatus.ACTIVE,
         nullable=False,
     )
     endpoint: Mapped[str] = mapped_column(String(2048), nullable=False)
+    normalized_endpoint: Mapped[str] = mapped_column(
+        String(2048), server_default="", nullable=False, doc="Dedup key, see normalize_source_url."
+    )
+    last_snapshot_hash: Mapped[bytes | None] = mapped_column(
+        LargeBinary(32), doc="Raw SHA-256 digest of the latest snapshot."
+    )
+    changed: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    version: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False, doc="Bumped by every update."
+    )
 
-    user: Mapped[User] = relationship(back_populates="monitors")
-    job: Mapped[Job] = relationship(back_populates="monitors")
+    user: Mapped[User | None] = relationship(back_populates="monitors", lazy="raise")
+    job: Mapped[Job | None] = relationship(back_populates="monitors", lazy="raise")
 
 
 class Result(Base):
     __tablename__ = "results"
+    __table_args__ = (Index("ix_results_job_id_created_at", "job_id", "created_at"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     job_id: Mapped[int] = mapped_column(ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
     status: Mapped[ResultStatus] = mapped_column(
         Enum(ResultStatus, name="result_status"), default=ResultStatus.NEW, nullable=False
@@ -123,4 +214,63 @@ class Result(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    job: Mapped[Job] = relationship(back_populates="results")
+    job: Mapped[Job] = relationship(back_populates="results", lazy="raise")
+
+
+class ResultSummary(Base):
+    """Per-job rollup of one expired results partition."""
+
+    __tablename__ = "result_summaries"
+    __table_args__ = (UniqueConstraint("job_id", "period_start"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job_id: Mapped[int] = mapped_column(ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    period_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    result_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_result_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_result_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class WorkItem(Base):
+    """Durable queue entry; invisible to other workers until ``available_at`` once claimed."""
+
+    __tablename__ = "work_items"
+    __table_args__ = (
+        Index("ix_work_items_queue_available_at_id", "queue", "available_at", "id"),
+        Index("ix_work_items_queue_dedup_key", "queue", "dedup_key", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    queue: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    claim_token: Mapped[str | None] = mapped_column(String(32))
+    dedup_key: Mapped[str | None] = mapped_column(
+        String(255), doc="Idempotency key; unique per queue while the item exists."
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class CollectionVersion(Base):
+    """Change counter per API collection, bumped inside every transaction that writes it."""
+
+    __tablename__ = "collection_versions"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+
+
+# Counters are only ever updated, so their rows must exist as soon as the table does.
+COLLECTIONS = ("tasks", "jobs", "monitors")
+event.listen(
+    CollectionVersion.__table__,
+    "after_create",
+    DDL(
+        "INSERT INTO collection_versions (name, version) VALUES "
+        + ", ".join(f"('{name}', 0)" for name in COLLECTIONS)
+    ),
+)
@@ -0,0 +1,432 @@
+"""Time-partitioned storage and retention compaction for job results."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import Sequence
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from time import time
+from typing import Any
+
+import structlog
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ColumnElement,
+    DateTime,
+    Enum,
+    ForeignKey,
+    FromClause,
+    Index,
+    Integer,
+    MetaData,
+    Select,
+    Table,
+    Text,
+    case,
+    cast,
+    delete,
+    extract,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import DropTable
+
+from app.core.metrics import FAILURE_COUNTER, RESULT_PARTITIONS_DROPPED
+from app.db.models import Job, Result, ResultStatus, ResultSummary
+
+logger = structlog.get_logger(__name__)
+
+_PARTITION_PREFIX = "results_p"
+_PARTITION_NAME = re.compile(rf"^{_PARTITION_PREFIX}(\d{{8}}_\d{{4}})$")
+_PARTITION_FORMAT = "%Y%m%d_%H%M"
+# Holds the rows migration 0004 moved out of the unpartitioned table (PostgreSQL only).
+_DEFAULT_PARTITION = "results_default"
+# pg_advisory_xact_lock key serializing partition DDL across processes.
+_DDL_LOCK_KEY = 0x72_65_73_70
+# Standalone partitions number their rows from ``period index * _ID_RANGE`` so ids
+# stay unique across the union ``ResultPartitions.source`` reads from.
+_ID_RANGE = 1 << 32
+
+
+@dataclass(slots=True)
+class CompactionReport:
+    """Outcome of one retention pass."""
+
+    dropped: list[str]
+    summarized_rows: int
+
+
+def _to_datetime(value: float) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands timestamps back naive; they are stored in UTC.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _result_table(metadata: MetaData, name: str, **kwargs: Any) -> Table:
+    return Table(
+        name,
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("job_id", ForeignKey(Job.__table__.c.id, ondelete="CASCADE"), nullable=False),
+        Column("status", Enum(ResultStatus, name="result_status"), nullable=False),
+        Column("content", Text),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+        Index(f"ix_{name}_job_id_created_at", "job_id", "created_at"),
+        **kwargs,
+    )
+
+
+class ResultPartitions:
+    """Route results into per-period partitions and expire whole periods.
+
+    Each partition holds ``period_seconds`` of results by ``created_at``. On
+    PostgreSQL ``results`` is a natively range-partitioned table (migration 0004)
+    and partitions are attached to it; on other dialects every period is a
+    standalone ``results_pYYYYMMDD_HHMM`` table with the same columns, whose ids
+    start at a range of their own so reads across all of them never see one id
+    twice (on SQLite, through the table's ``sqlite_sequence`` entry). Retention
+    never deletes row ranges from partitions: once a period is older than
+    ``retention_periods`` its rows are rolled up into
+    :class:`~app.db.models.ResultSummary` (one row per job and period) and the
+    partition is dropped, in the same transaction.
+
+    Rows from before partitioning live in ``results_default`` on PostgreSQL and in
+    the plain ``results`` table elsewhere. A PostgreSQL partition is attached only
+    after the default partition's rows for its period have moved into it, and
+    retention rolls up and deletes the expired legacy rows with the partitions.
+
+    The list of partitions is read from the catalog once and then kept up to date
+    by :meth:`ensure` and :meth:`compact`; each compaction re-reads it, which picks
+    up partitions other processes created in the meantime.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        period_seconds: int = 86_400,
+        retention_periods: int = 7,
+        compaction_interval_seconds: float = 3_600.0,
+    ) -> None:
+        if period_seconds < 60 or period_seconds % 60:
+            raise ValueError("period_seconds must be a whole number of minutes")
+        if retention_periods < 1:
+            raise ValueError("retention_periods must be at least 1")
+        self._engine = engine
+        self._period = period_seconds
+        self._retention = retention_periods
+        self._interval = compaction_interval_seconds
+        self._native = engine.dialect.name == "postgresql"
+        self._metadata = MetaData()
+        self._tables: dict[float, Table] = {}
+        self._legacy = (
+            _result_table(self._metadata, _DEFAULT_PARTITION) if self._native else Result.__table__
+        )
+        self._known: set[str] = set()
+        self._listed: dict[str, float] | None = None
+        self._ddl_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    def period_start(self, at: float) -> float:
+        """Return the start of the period containing epoch ``at``."""
+
+        return at - at % self._period
+
+    def partition_name(self, start: float) -> str:
+        return _PARTITION_PREFIX + _to_datetime(start).strftime(_PARTITION_FORMAT)
+
+    def table(self, start: float) -> Table:
+        """Table object for the partition starting at ``start``; no DDL is issued."""
+
+        partition = self._tables.get(start)
+        if partition is None:
+            options = {} if self._native else {"sqlite_autoincrement": True}
+            partition = _result_table(self._metadata, self.partition_name(start), **options)
+            self._tables[start] = partition
+        return partition
+
+    async def ensure(self, at: float) -> Table:
+        """Create the partition covering epoch ``at`` if it does not exist yet."""
+
+        start = self.period_start(at)
+        partition = self.table(start)
+        if partition.name in self._known:
+            return partition
+        async with self._ddl_lock:
+            if partition.name not in self._known:
+                async with self._engine.begin() as conn:
+                    if self._native:
+                        await self._attach(conn, partition, start)
+                    else:
+                        await conn.run_sync(partition.create, checkfirst=True)
+                        await self._reserve_ids(conn, partition, start)
+                self._known.add(partition.name)
+                if self._listed is not None:
+                    self._listed[partition.name] = start
+        return partition
+
+    async def route(self, rows: Sequence[dict[str, Any]]) -> dict[Table, list[dict[str, Any]]]:
+        """Group ``rows`` by the partition their ``created_at`` falls in.
+
+        Used as the :class:`~app.db.write_behind.WriteBehindBuffer` router, so a
+        flush spanning a period boundary writes to both partitions in one
+        transaction.
+        """
+
+        groups: dict[float, list[dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(self.period_start(row["created_at"].timestamp()), []).append(row)
+        routed: dict[Table, list[dict[str, Any]]] = {}
+        for start, grouped in groups.items():
+            partition = await self.ensure(start)
+            # Postgres routes rows through the parent; the partition only has to exist.
+            routed[Result.__table__ if self._native else partition] = grouped
+        return routed
+
+    async def source(self) -> FromClause:
+        """Selectable spanning every partition, for reads such as ``latest_results``."""
+
+        if self._native:
+            return Result.__table__
+        tables = [Result.__table__, *(self.table(start) for start, _ in await self.partitions())]
+        return union_all(*(select(*table.c) for table in tables)).subquery("results_all")
+
+    async def partitions(self, *, refresh: bool = False) -> list[tuple[float, str]]:
+        """List existing partitions as ``(period start, table name)``, oldest first.
+
+        The catalog is only inspected on first use or with ``refresh``.
+        """
+
+        if self._listed is None or refresh:
+            async with self._engine.connect() as conn:
+                names = await conn.run_sync(lambda sync: inspect(sync).get_table_names())
+            listed: dict[str, float] = {}
+            for name in names:
+                match = _PARTITION_NAME.match(name)
+                if match:
+                    start = datetime.strptime(match.group(1), _PARTITION_FORMAT).replace(
+                        tzinfo=timezone.utc
+                    )
+                    listed[name] = start.timestamp()
+            self._listed = listed
+        return sorted((start, name) for name, start in self._listed.items())
+
+    async def compact(self, now: float | None = None) -> CompactionReport:
+        """Roll up and drop every partition older than the retention window."""
+
+        current = self.period_start(time() if now is None else now)
+        cutoff = current - self._retention * self._period
+        report = CompactionReport(dropped=[], summarized_rows=0)
+        for start, name in await self.partitions(refresh=True):
+            if start + self._period > cutoff:
+                break
+            report.summarized_rows += await self._summarize_and_drop(start)
+            report.dropped.append(name)
+            self._known.discard(name)
+            if self._listed is not None:
+                self._listed.pop(name, None)
+            RESULT_PARTITIONS_DROPPED.inc()
+        report.summarized_rows += await self._compact_legacy(cutoff)
+        # Keep the next period ready so writes at the boundary never wait on DDL.
+        await self.ensure(current + self._period)
+        return report
+
+    def start(self) -> None:
+        """Run :meth:`compact` every ``compaction_interval_seconds`` in the background."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="results-retention")
+
+    async def close(self) -> None:
+        """Stop the background retention task."""
+
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                report = await self.compact()
+                if report.dropped:
+                    logger.info(
+                        "result_partitions_compacted",
+                        dropped=report.dropped,
+                        summarized_rows=report.summarized_rows,
+                    )
+            except Exception:
+                FAILURE_COUNTER.labels(operation="result_compaction").inc()
+                logger.exception("result_compaction_failed")
+            await asyncio.sleep(self._interval)
+
+    async def _attach(self, conn: AsyncConnection, partition: Table, start: float) -> None:
+        """Create ``partition`` and attach it to ``results`` for its period.
+
+        PostgreSQL refuses a range the default partition still holds rows for, so
+        those rows move into the new table first, in the same transaction.
+        """
+
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _DDL_LOCK_KEY})
+        exists = await conn.scalar(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": partition.name}
+        )
+        if exists:
+            return
+        lower, upper = _to_datetime(start), _to_datetime(start + self._period)
+        columns = "id, job_id, status, content, created_at"
+        await conn.execute(text(f"CREATE TABLE {partition.name} (LIKE results INCLUDING DEFAULTS)"))
+        await conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {_DEFAULT_PARTITION} "
+                f"WHERE created_at >= :lower AND created_at < :upper RETURNING {columns}) "
+                f"INSERT INTO {partition.name} ({columns}) SELECT {columns} FROM moved"
+            ),
+            {"lower": lower, "upper": upper},
+        )
+        # DDL takes no bind parameters; both bounds are rendered from epoch floats.
+        await conn.execute(
+            text(
+                f"ALTER TABLE results ATTACH PARTITION {partition.name} "
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        )
+
+    async def _reserve_ids(self, conn: AsyncConnection, partition: Table, start: float) -> None:
+        """Start ``partition``'s ids at its period's range unless rows were already numbered."""
+
+        if conn.dialect.name != "sqlite":
+            return
+        await conn.execute(
+            text(
+                "INSERT INTO sqlite_sequence (name, seq) SELECT :name, :seq "
+                "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = :name)"
+            ),
+            {"name": partition.name, "seq": int(start // self._period) * _ID_RANGE},
+        )
+
+    @staticmethod
+    def _rollup(table: FromClause, *keys: ColumnElement[Any]) -> Select[Any]:
+        return select(
+            *keys,
+            func.count(),
+            func.sum(case((table.c.status == ResultStatus.ERROR, 1), else_=0)),
+            func.min(table.c.created_at),
+            func.max(table.c.created_at),
+        ).group_by(*keys)
+
+    @staticmethod
+    async def _store_summaries(conn: AsyncConnection, summaries: list[dict[str, Any]]) -> None:
+        """Insert ``summaries``, adding to those already stored for the same job and period.
+
+        A period can be rolled up twice: legacy rows and partition rows may share it.
+        """
+
+        if not summaries:
+            return
+        table = ResultSummary.__table__
+        stored = {
+            (row.job_id, _aware(row.period_start)): row
+            for row in await conn.execute(
+                select(table).where(
+                    table.c.job_id.in_({summary["job_id"] for summary in summaries}),
+                    table.c.period_start.in_({summary["period_start"] for summary in summaries}),
+                )
+            )
+        }
+        new: list[dict[str, Any]] = []
+        for summary in summaries:
+            row = stored.get((summary["job_id"], summary["period_start"]))
+            if row is None:
+                new.append(summary)
+                continue
+            await conn.execute(
+                update(table)
+                .where(table.c.id == row.id)
+                .values(
+                    result_count=row.result_count + summary["result_count"],
+                    error_count=row.error_count + summary["error_count"],
+                    first_result_at=min(_aware(row.first_result_at), summary["first_result_at"]),
+                    last_result_at=max(_aware(row.last_result_at), summary["last_result_at"]),
+                )
+            )
+        if new:
+            await conn.execute(insert(table), new)
+
+    @staticmethod
+    def _summary(
+        job_id: int,
+        period_start: datetime,
+        count: int,
+        errors: int,
+        first: datetime,
+        last: datetime,
+    ) -> dict[str, Any]:
+        return {
+            "job_id": job_id,
+            "period_start": period_start,
+            "result_count": count,
+            "error_count": errors or 0,
+            "first_result_at": _aware(first),
+            "last_result_at": _aware(last),
+        }
+
+    async def _summarize_and_drop(self, start: float) -> int:
+        partition = self.table(start)
+        period_start = _to_datetime(start)
+        async with self._engine.begin() as conn:
+            rows = (await conn.execute(self._rollup(partition, partition.c.job_id))).all()
+            await self._store_summaries(
+                conn, [self._summary(job_id, period_start, *rest) for job_id, *rest in rows]
+            )
+            await conn.execute(DropTable(partition))
+        self._metadata.remove(self._tables.pop(start))
+        return sum(row[1] for row in rows)
+
+    async def _compact_legacy(self, cutoff: float) -> int:
+        """Roll up and delete pre-partitioning rows older than ``cutoff``, per period."""
+
+        legacy = self._legacy
+        expired = legacy.c.created_at < _to_datetime(cutoff)
+        epoch = extract("epoch", legacy.c.created_at)
+        if self._native:
+            epoch = func.floor(epoch)
+        # Group by a column of the subquery rather than repeating the bucket expression.
+        bucketed = (
+            select(
+                legacy.c.job_id,
+                legacy.c.status,
+                legacy.c.created_at,
+                (cast(epoch, BigInteger) // self._period * self._period).label("period"),
+            )
+            .where(expired)
+            .subquery()
+        )
+        async with self._engine.begin() as conn:
+            rollup = self._rollup(bucketed, bucketed.c.job_id, bucketed.c.period)
+            rows = (await conn.execute(rollup)).all()
+            if not rows:
+                return 0
+            await self._store_summaries(
+                conn,
+                [
+                    self._summary(job_id, _to_datetime(start), *rest)
+                    for job_id, start, *rest in rows
+                ],
+            )
+            await conn.execute(delete(legacy).where(expired))
+        return sum(row[2] for row in rows)
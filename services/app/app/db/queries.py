@@ -0,0 +1,126 @@
+"""Eager-loading query helpers for the ORM relationship graph.
+
+Every relationship in :mod:`app.db.models` is ``lazy="raise"``: touching an
+unloaded one raises instead of issuing a query per row (or failing with
+``MissingGreenlet`` under asyncio). Access patterns that need related rows
+load them through the helpers here, which issue a fixed number of statements
+however many rows come back.
+
+The hot single-entity lookups are built once at import time. A statement object
+memoizes its cache key, so executing one of them skips both construction and
+cache-key generation and goes straight to the engine's compiled-statement cache.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import FromClause, Row, Select, bindparam, func, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.db.models import CollectionVersion, Job, JobStatus, Monitor, Result, Task, User
+
+TASK_BY_ID = select(Task).where(Task.id == bindparam("id"))
+JOB_BY_ID = select(Job).where(Job.id == bindparam("id"))
+MONITOR_BY_ID = select(Monitor).where(Monitor.id == bindparam("id"))
+JOBS_FOR_TASK = select(Job).where(Job.task_id == bindparam("task_id")).order_by(Job.id)
+MONITORS_FOR_URL = (
+    select(Monitor).where(Monitor.normalized_endpoint == bindparam("url")).order_by(Monitor.id)
+)
+FIRST_MONITOR_FOR_URL = MONITORS_FOR_URL.limit(1)
+
+COLLECTION_VERSION = select(CollectionVersion.version).where(
+    CollectionVersion.name == bindparam("name")
+)
+BUMP_COLLECTIONS = (
+    update(CollectionVersion)
+    .where(CollectionVersion.name.in_(bindparam("names", expanding=True)))
+    .values(version=CollectionVersion.version + 1)
+)
+
+RECENT_JOBS = select(Job).order_by(Job.created_at.desc(), Job.id.desc()).limit(bindparam("limit"))
+
+
+def _count(model: type[Task | Job | Monitor], *criteria: Any) -> Any:
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+
+DASHBOARD_COUNTS = select(
+    _count(Task).label("tasks"),
+    _count(Job).label("jobs"),
+    _count(Monitor).label("monitors"),
+    # Matches the predicate of the partial index ix_monitors_changed_created_at_id.
+    _count(Monitor, Monitor.changed == true()).label("changed_monitors"),
+    _count(Job, Job.status == JobStatus.FAILED).label("failing_jobs"),
+)
+
+BY_ID: dict[type[Task | Job | Monitor], Select[Any]] = {
+    Task: TASK_BY_ID,
+    Job: JOB_BY_ID,
+    Monitor: MONITOR_BY_ID,
+}
+
+
+def user_overview(user_id: int) -> Select[tuple[User]]:
+    """Select a user with tasks, their jobs and monitors with their job: four statements.
+
+    Collections use ``selectinload`` (one ``IN`` query per level, no row
+    multiplication); the many-to-one ``Monitor.job`` is joined into the monitor query.
+    """
+
+    return (
+        select(User)
+        .where(User.id == user_id)
+        .options(
+            selectinload(User.tasks).selectinload(Task.jobs),
+            selectinload(User.monitors).joinedload(Monitor.job),
+        )
+    )
+
+
+def latest_results(
+    job_ids: Sequence[int], limit: int, source: FromClause | None = None
+) -> Select[Any]:
+    """Select the ``limit`` newest results of each job in ``job_ids`` in one statement.
+
+    ``source`` defaults to ``results``; pass
+    :meth:`~app.db.partitions.ResultPartitions.source` to read across partitions.
+    """
+
+    source = Result.__table__ if source is None else source
+    ranked = (
+        select(
+            source.c.id,
+            source.c.job_id,
+            source.c.status,
+            source.c.content,
+            source.c.created_at,
+            func.row_number()
+            .over(
+                partition_by=source.c.job_id,
+                order_by=(source.c.created_at.desc(), source.c.id.desc()),
+            )
+            .label("rank"),
+        )
+        .where(source.c.job_id.in_(job_ids))
+        .subquery("ranked_results")
+    )
+    return (
+        select(ranked.c.id, ranked.c.job_id, ranked.c.status, ranked.c.content, ranked.c.created_at)
+        .where(ranked.c.rank <= limit)
+        .order_by(ranked.c.job_id, ranked.c.rank)
+    )
+
+
+async def job_with_latest_results(
+    session: AsyncSession, job_id: int, limit: int, source: FromClause | None = None
+) -> tuple[Job | None, list[Row[Any]]]:
+    """Load one job and its ``limit`` newest results: two statements."""
+
+    job = await session.get(Job, job_id)
+    if job is None:
+        return None, []
+    rows = (await session.execute(latest_results([job_id], limit, source))).all()
+    return job, list(rows)
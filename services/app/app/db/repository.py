@@ -0,0 +1,962 @@
+"""SQLAlchemy-backed implementation of :class:`~app.services.interfaces.Repository`."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import partial
+from time import monotonic
+from typing import Any, TypeVar
+
+from sqlalchemy import ColumnElement, Row, and_, delete, false, insert, or_, select, true
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.metrics import JOB_COUNT, MONITOR_COUNT, TASK_COUNT
+from app.db.cache import RecordCache
+from app.db.models import Job, JobStatus, Monitor, Result, Task
+from app.db.partitions import ResultPartitions
+from app.db.queries import (
+    BUMP_COLLECTIONS,
+    BY_ID,
+    COLLECTION_VERSION,
+    DASHBOARD_COUNTS,
+    FIRST_MONITOR_FOR_URL,
+    JOBS_FOR_TASK,
+    MONITORS_FOR_URL,
+    RECENT_JOBS,
+    job_with_latest_results,
+)
+from app.db.results import result_row
+from app.db.session import SessionRouter
+from app.services.repositories import (
+    BatchOperation,
+    BatchResult,
+    ChangeListener,
+    CollectionName,
+    DashboardSummary,
+    JobRecord,
+    MonitorRecord,
+    MonitorUrlConflict,
+    Page,
+    PageKey,
+    ResultRecord,
+    TaskRecord,
+    normalize_source_url,
+)
+from app.services.snapshots import snapshot_digest
+
+ModelT = TypeVar("ModelT", Task, Job, Monitor)
+RecordT = TypeVar("RecordT", TaskRecord, JobRecord, MonitorRecord)
+
+# session.info key holding callbacks run once the transaction commits.
+_AFTER_COMMIT = "after_commit"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _to_epoch(value: datetime) -> float:
+    # SQLite drops tzinfo on the way back; every stored timestamp is UTC.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _from_epoch(value: float) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
+def _parse_id(value: str | None) -> int | None:
+    """Map an API id onto an integer primary key; unknown formats simply match nothing."""
+
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _task_record(row: Task) -> TaskRecord:
+    return TaskRecord(
+        id=str(row.id),
+        name=row.name,
+        payload=json.loads(row.payload) if row.payload else {},
+        created_at=_to_epoch(row.created_at),
+        updated_at=_to_epoch(row.updated_at),
+        version=row.version,
+    )
+
+
+def _result_record(row: Row[Any]) -> ResultRecord:
+    return ResultRecord(
+        id=str(row.id),
+        job_id=str(row.job_id),
+        status=row.status.value,
+        content=row.content,
+        created_at=_to_epoch(row.created_at),
+    )
+
+
+def _job_record(row: Job) -> JobRecord:
+    return JobRecord(
+        id=str(row.id),
+        task_id=str(row.task_id),
+        schedule_every_seconds=row.schedule_every_seconds,
+        enabled=row.enabled,
+        last_run_at=_to_epoch(row.last_run_at) if row.last_run_at is not None else None,
+        created_at=_to_epoch(row.created_at),
+        updated_at=_to_epoch(row.updated_at),
+        version=row.version,
+    )
+
+
+def _monitor_record(row: Monitor) -> MonitorRecord:
+    return MonitorRecord(
+        id=str(row.id),
+        name=row.name,
+        source_url=row.endpoint,
+        last_snapshot_digest=row.last_snapshot_hash,
+        changed=row.changed,
+        created_at=_to_epoch(row.created_at),
+        updated_at=_to_epoch(row.updated_at),
+        version=row.version,
+    )
+
+
+def _apply_task_update(row: Task, updates: dict[str, Any], now: datetime) -> None:
+    if updates.get("name") is not None:
+        row.name = updates["name"]
+    if updates.get("payload") is not None:
+        row.payload = json.dumps(updates["payload"])
+    row.updated_at = now
+    row.version += 1
+
+
+def _apply_job_update(row: Job, updates: dict[str, Any], now: datetime) -> None:
+    if updates.get("schedule_every_seconds") is not None:
+        row.schedule_every_seconds = updates["schedule_every_seconds"]
+    if updates.get("enabled") is not None:
+        row.enabled = updates["enabled"]
+    row.updated_at = now
+    row.version += 1
+
+
+def _apply_monitor_update(row: Monitor, updates: dict[str, Any], now: datetime) -> None:
+    if updates.get("name") is not None:
+        row.name = updates["name"]
+    if updates.get("source_url") is not None:
+        row.endpoint = updates["source_url"]
+        row.normalized_endpoint = normalize_source_url(updates["source_url"])
+    row.updated_at = now
+    row.version += 1
+
+
+def _new_task(name: str, payload: dict[str, Any], now: datetime) -> Task:
+    return Task(name=name, payload=json.dumps(payload), created_at=now, updated_at=now)
+
+
+def _new_job(task_id: str, schedule_every_seconds: int, enabled: bool, now: datetime) -> Job:
+    return Job(
+        task_id=int(task_id),
+        schedule_every_seconds=schedule_every_seconds,
+        enabled=enabled,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+async def _flush_monitors(session: AsyncSession, source_url: str | None = None) -> None:
+    """Flush pending monitor rows; the unique URL index turns a duplicate into a conflict."""
+
+    try:
+        await session.flush()
+    except IntegrityError as exc:
+        raise MonitorUrlConflict(source_url or "a source_url of the batch") from exc
+
+
+def _new_monitor(name: str, source_url: str, now: datetime) -> Monitor:
+    return Monitor(
+        name=name,
+        endpoint=source_url,
+        normalized_endpoint=normalize_source_url(source_url),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class SqlAlchemyRepository:
+    """Repository persisting tasks, jobs and monitors through an async session factory.
+
+    Every public method runs in its own transaction; the ``apply_*_batch`` methods apply a
+    whole batch in one transaction with a constant number of lookup queries. Given a
+    :class:`~app.db.session.SessionRouter`, reads go through its replica routing and
+    writes pin the caller's subsequent reads to the primary. With ``partitions`` job
+    results are written to and read from their time partitions.
+
+    A positive ``cache_ttl_seconds`` puts a :class:`~app.db.cache.RecordCache` in front
+    of the by-id lookups and :meth:`find_monitor_by_url`; writes through this
+    repository invalidate the entries they touch once they commit, and writes from
+    other processes become visible after the TTL.
+
+    Every write bumps the version of the collections it changes (cascades included)
+    in the same transaction, so :meth:`collection_version` never runs ahead of the
+    data a reader can see.
+
+    :meth:`summary` and the entity count gauges are served from counters kept in
+    memory: they are loaded with one aggregate query, moved by each write's own delta
+    once it commits, and reloaded only on the first write, after a reset or a delete
+    that cascades, or once they are ``counts_max_age_seconds`` old, so writes from
+    other processes are picked up too. No write counts a table.
+    """
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker[AsyncSession] | SessionRouter,
+        *,
+        partitions: ResultPartitions | None = None,
+        cache_ttl_seconds: float = 0.0,
+        cache_max_entries: int = 10_000,
+        counts_max_age_seconds: float = 30.0,
+    ) -> None:
+        self._sessions = (
+            sessions if isinstance(sessions, SessionRouter) else SessionRouter(sessions)
+        )
+        self._partitions = partitions
+        self._caches: dict[type[Task | Job | Monitor], RecordCache[Any]] = {
+            model: RecordCache(
+                model.__tablename__, ttl_seconds=cache_ttl_seconds, max_entries=cache_max_entries
+            )
+            for model in (Task, Job, Monitor)
+        }
+        self._monitor_urls: RecordCache[MonitorRecord] = RecordCache(
+            "monitor_urls", ttl_seconds=cache_ttl_seconds, max_entries=cache_max_entries
+        )
+        self._counts: dict[str, int] | None = None
+        self._counts_loaded_at = 0.0
+        self._counts_max_age = counts_max_age_seconds
+        self._listeners: list[ChangeListener] = []
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[AsyncSession]:
+        async with self._sessions.write_session() as session:
+            async with session.begin():
+                yield session
+            for callback in session.info.pop(_AFTER_COMMIT, ()):
+                callback()
+        if self._counts is None:
+            # First write of the process, or a cascade left the counters unknown.
+            await self._load_counts()
+
+    @staticmethod
+    def _after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+        session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+    def _invalidate(
+        self, session: AsyncSession, model: type[Task | Job | Monitor], *ids: int
+    ) -> None:
+        """Drop cached ``model`` rows after commit; no ``ids`` drops all of them.
+
+        Dropping all monitors also drops every URL lookup; otherwise callers name the
+        affected URLs with :meth:`_invalidate_urls`.
+        """
+
+        self._after_commit(session, partial(self._caches[model].invalidate, *ids))
+        if model is Monitor and not ids:
+            self._after_commit(session, self._monitor_urls.invalidate)
+
+    def _invalidate_urls(self, session: AsyncSession, *urls: str) -> None:
+        self._after_commit(session, partial(self._monitor_urls.invalidate, *urls))
+
+    def _invalidate_cascade(self, session: AsyncSession, model: type[Task | Job]) -> None:
+        """Deleting tasks or jobs cascades in the database to their dependent rows."""
+
+        if model is Task:
+            self._invalidate(session, Job)
+        self._invalidate(session, Monitor)
+        self._after_commit(session, self._expire_counts)
+
+    def _expire_counts(self) -> None:
+        self._counts = None
+
+    def _adjust_count(self, session: AsyncSession, name: str, delta: int) -> None:
+        """Move counter ``name`` (and its gauge) by ``delta`` once the transaction commits."""
+
+        def apply() -> None:
+            if self._counts is not None:
+                self._counts[name] = max(self._counts[name] + delta, 0)
+                self._publish_counts()
+
+        if delta:
+            self._after_commit(session, apply)
+
+    async def _load_counts(self) -> dict[str, int]:
+        """Count every collection with one statement; the only full recount."""
+
+        loaded_at = monotonic()
+        async with self._sessions.read_session() as session:
+            counts = dict((await session.execute(DASHBOARD_COUNTS)).one()._mapping)
+        self._counts, self._counts_loaded_at = counts, loaded_at
+        self._publish_counts()
+        return counts
+
+    def _publish_counts(self) -> None:
+        if self._counts is not None:
+            TASK_COUNT.set(self._counts["tasks"])
+            JOB_COUNT.set(self._counts["jobs"])
+            MONITOR_COUNT.set(self._counts["monitors"])
+
+    async def reset(self) -> None:
+        async with self._transaction() as session:
+            await session.execute(delete(Monitor))
+            await session.execute(delete(Job))
+            await session.execute(delete(Task))
+            for model in (Task, Job, Monitor):
+                self._invalidate(session, model)
+            self._after_commit(session, self._expire_counts)
+            await self._bump(session, "tasks", cascade=("jobs", "monitors"))
+
+    async def create_task(self, name: str, payload: dict[str, Any]) -> TaskRecord:
+        async with self._transaction() as session:
+            row = _new_task(name, payload, _utcnow())
+            session.add(row)
+            await session.flush()
+            self._adjust_count(session, "tasks", 1)
+            await self._bump(session, "tasks", row.id)
+            return _task_record(row)
+
+    async def list_tasks(self) -> list[TaskRecord]:
+        async with self._sessions.read_session() as session:
+            rows = await session.scalars(select(Task).order_by(Task.id))
+            return [_task_record(row) for row in rows]
+
+    async def page_tasks(
+        self,
+        *,
+        after: PageKey | None = None,
+        limit: int,
+        updated_since: float | None = None,
+    ) -> Page[TaskRecord]:
+        """Return a keyset page ordered like :meth:`InMemoryRepository.page_tasks`."""
+
+        return await self._page(
+            Task, _task_record, after=after, limit=limit, updated_since=updated_since
+        )
+
+    async def get_task(self, task_id: str) -> TaskRecord | None:
+        return await self._get(Task, task_id, _task_record)
+
+    async def update_task(self, task_id: str, **updates: Any) -> TaskRecord | None:
+        pk = _parse_id(task_id)
+        if pk is None:
+            return None
+        async with self._transaction() as session:
+            row = await session.get(Task, pk, with_for_update=True)
+            if row is None:
+                return None
+            _apply_task_update(row, updates, _utcnow())
+            self._invalidate(session, Task, pk)
+            await self._bump(session, "tasks", pk)
+            return _task_record(row)
+
+    async def delete_task(self, task_id: str) -> bool:
+        """Delete a task; its jobs go with it through the ``ON DELETE CASCADE`` foreign key."""
+
+        pk = _parse_id(task_id)
+        if pk is None:
+            return False
+        async with self._transaction() as session:
+            result = await session.execute(delete(Task).where(Task.id == pk))
+            self._invalidate(session, Task, pk)
+            if result.rowcount:
+                self._invalidate_cascade(session, Task)
+                await self._bump(session, "tasks", pk, cascade=("jobs", "monitors"))
+            return result.rowcount > 0
+
+    async def apply_task_batch(
+        self, operations: list[BatchOperation]
+    ) -> list[BatchResult[TaskRecord]]:
+        """Apply ``operations`` in order inside a single transaction."""
+
+        results: list[BatchResult[TaskRecord]] = []
+        async with self._transaction() as session:
+            rows = await self._load(session, Task, operations)
+            now = _utcnow()
+            created: list[tuple[int, Task]] = []
+            deleted: list[Task] = []
+            for operation in operations:
+                if operation.op == "create":
+                    row = _new_task(now=now, **operation.fields)
+                    session.add(row)
+                    created.append((len(results), row))
+                    results.append(BatchResult("created"))
+                    continue
+                row = rows.get(_parse_id(operation.id))
+                if row is None:
+                    results.append(BatchResult("not_found"))
+                elif operation.op == "update":
+                    _apply_task_update(row, operation.fields, now)
+                    results.append(BatchResult("updated", row))
+                else:
+                    deleted.append(rows.pop(row.id))
+                    results.append(BatchResult("deleted", row))
+            await session.flush()
+            await self._delete_rows(session, Task, deleted)
+            for position, row in created:
+                results[position].record = row
+            self._invalidate(session, Task, *(row.id for row in deleted), *rows)
+            if deleted:
+                self._invalidate_cascade(session, Task)
+            self._adjust_count(session, "tasks", len(created) - len(deleted))
+            if changed := [r.record.id for r in results if r.applied and r.record]:
+                cascade = ("jobs", "monitors") if deleted else ()
+                await self._bump(session, "tasks", *changed, cascade=cascade)
+            return [
+                BatchResult(r.outcome, _task_record(r.record) if r.record else None)
+                for r in results
+            ]
+
+    async def create_job(
+        self, task_id: str, schedule_every_seconds: int, enabled: bool
+    ) -> JobRecord:
+        async with self._transaction() as session:
+            row = _new_job(task_id, schedule_every_seconds, enabled, _utcnow())
+            session.add(row)
+            await session.flush()
+            self._adjust_count(session, "jobs", 1)
+            await self._bump(session, "jobs", row.id)
+            return _job_record(row)
+
+    async def list_jobs(self) -> list[JobRecord]:
+        async with self._sessions.read_session() as session:
+            rows = await session.scalars(select(Job).order_by(Job.id))
+            return [_job_record(row) for row in rows]
+
+    async def page_jobs(
+        self,
+        *,
+        after: PageKey | None = None,
+        limit: int,
+        enabled: bool | None = None,
+        updated_since: float | None = None,
+    ) -> Page[JobRecord]:
+        return await self._page(
+            Job,
+            _job_record,
+            after=after,
+            limit=limit,
+            updated_since=updated_since,
+            condition=None if enabled is None else Job.enabled == enabled,
+        )
+
+    async def list_jobs_for_task(self, task_id: str) -> list[JobRecord]:
+        pk = _parse_id(task_id)
+        if pk is None:
+            return []
+        async with self._sessions.read_session() as session:
+            rows = await session.scalars(JOBS_FOR_TASK, {"task_id": pk})
+            return [_job_record(row) for row in rows]
+
+    async def get_job(self, job_id: str) -> JobRecord | None:
+        return await self._get(Job, job_id, _job_record)
+
+    async def update_job(self, job_id: str, **updates: Any) -> JobRecord | None:
+        pk = _parse_id(job_id)
+        if pk is None:
+            return None
+        async with self._transaction() as session:
+            row = await session.get(Job, pk, with_for_update=True)
+            if row is None:
+                return None
+            _apply_job_update(row, updates, _utcnow())
+            self._invalidate(session, Job, pk)
+            await self._bump(session, "jobs", pk)
+            return _job_record(row)
+
+    async def delete_job(self, job_id: str) -> bool:
+        pk = _parse_id(job_id)
+        if pk is None:
+            return False
+        async with self._transaction() as session:
+            result = await session.execute(delete(Job).where(Job.id == pk))
+            self._invalidate(session, Job, pk)
+            if result.rowcount:
+                self._invalidate_cascade(session, Job)
+                await self._bump(session, "jobs", pk, cascade=("monitors",))
+            return result.rowcount > 0
+
+    async def apply_job_batch(
+        self, operations: list[BatchOperation]
+    ) -> list[BatchResult[JobRecord]]:
+        """Apply ``operations`` in order inside a single transaction.
+
+        Creates referencing an unknown ``task_id`` yield ``not_found``.
+        """
+
+        results: list[BatchResult[JobRecord]] = []
+        async with self._transaction() as session:
+            rows = await self._load(session, Job, operations)
+            task_ids = {
+                pk
+                for operation in operations
+                if operation.op == "create"
+                and (pk := _parse_id(operation.fields["task_id"])) is not None
+            }
+            known_tasks: set[int] = set()
+            if task_ids:
+                known_tasks.update(
+                    await session.scalars(select(Task.id).where(Task.id.in_(task_ids)))
+                )
+            now = _utcnow()
+            created: list[tuple[int, Job]] = []
+            deleted: list[Job] = []
+            for operation in operations:
+                if operation.op == "create":
+                    if _parse_id(operation.fields["task_id"]) not in known_tasks:
+                        results.append(BatchResult("not_found"))
+                        continue
+                    row = _new_job(now=now, **operation.fields)
+                    session.add(row)
+                    created.append((len(results), row))
+                    results.append(BatchResult("created"))
+                    continue
+                row = rows.get(_parse_id(operation.id))
+                if row is None:
+                    results.append(BatchResult("not_found"))
+                elif operation.op == "update":
+                    _apply_job_update(row, operation.fields, now)
+                    results.append(BatchResult("updated", row))
+                else:
+                    deleted.append(rows.pop(row.id))
+                    results.append(BatchResult("deleted", row))
+            await session.flush()
+            await self._delete_rows(session, Job, deleted)
+            for position, row in created:
+                results[position].record = row
+            self._invalidate(session, Job, *(row.id for row in deleted), *rows)
+            if deleted:
+                self._invalidate_cascade(session, Job)
+            self._adjust_count(session, "jobs", len(created) - len(deleted))
+            if changed := [r.record.id for r in results if r.applied and r.record]:
+                cascade = ("monitors",) if deleted else ()
+                await self._bump(session, "jobs", *changed, cascade=cascade)
+            return [
+                BatchResult(r.outcome, _job_record(r.record) if r.record else None) for r in results
+            ]
+
+    async def mark_job_run(self, job_id: str) -> JobRecord | None:
+        pk = _parse_id(job_id)
+        if pk is None:
+            return None
+        async with self._transaction() as session:
+            row = await session.get(Job, pk, with_for_update=True)
+            if row is None:
+                return None
+            now = _utcnow()
+            self._adjust_count(session, "failing_jobs", -(row.status is JobStatus.FAILED))
+            row.status = JobStatus.SUCCEEDED
+            row.last_run_at = now
+            row.updated_at = now
+            row.version += 1
+            self._invalidate(session, Job, pk)
+            await self._bump(session, "jobs", pk)
+            return _job_record(row)
+
+    async def mark_job_failed(self, job_id: str) -> JobRecord | None:
+        pk = _parse_id(job_id)
+        if pk is None:
+            return None
+        async with self._transaction() as session:
+            row = await session.get(Job, pk, with_for_update=True)
+            if row is None:
+                return None
+            self._adjust_count(session, "failing_jobs", int(row.status is not JobStatus.FAILED))
+            row.status = JobStatus.FAILED
+            row.updated_at = _utcnow()
+            row.version += 1
+            self._invalidate(session, Job, pk)
+            await self._bump(session, "jobs", pk)
+            return _job_record(row)
+
+    async def record_result(
+        self, job_id: str, *, succeeded: bool, content: str | None, at: float | None = None
+    ) -> None:
+        """Insert one result immediately; use :class:`~app.db.results.ResultWriter` to batch."""
+
+        pk = _parse_id(job_id)
+        if pk is None:
+            return
+        row = result_row(pk, succeeded=succeeded, content=content, at=at)
+        targets = (
+            {Result.__table__: [row]}
+            if self._partitions is None
+            else await self._partitions.route([row])
+        )
+        async with self._transaction() as session:
+            if await session.get(Job, pk) is None:
+                return
+            for table, rows in targets.items():
+                await session.execute(insert(table), rows)
+
+    async def get_job_with_results(
+        self, job_id: str, limit: int
+    ) -> tuple[JobRecord, list[ResultRecord]] | None:
+        pk = _parse_id(job_id)
+        if pk is None:
+            return None
+        source = None if self._partitions is None else await self._partitions.source()
+        async with self._sessions.read_session() as session:
+            job, rows = await job_with_latest_results(session, pk, limit, source)
+        if job is None:
+            return None
+        return _job_record(job), [_result_record(row) for row in rows]
+
+    async def summary(self, recent_jobs: int) -> DashboardSummary:
+        """Return the in-memory counters and the ``recent_jobs`` newest jobs.
+
+        The counters cost no query unless they have to be (re)loaded; the recent jobs
+        are read backwards along ``ix_jobs_created_at_id``.
+        """
+
+        counts = self._counts
+        if counts is None or monotonic() - self._counts_loaded_at > self._counts_max_age:
+            counts = await self._load_counts()
+        jobs: list[JobRecord] = []
+        if recent_jobs > 0:
+            async with self._sessions.read_session() as session:
+                rows = await session.scalars(RECENT_JOBS, {"limit": recent_jobs})
+                jobs = [_job_record(row) for row in rows]
+        return DashboardSummary(**counts, recent_jobs=jobs)
+
+    async def create_monitor(self, name: str, source_url: str) -> MonitorRecord:
+        async with self._transaction() as session:
+            row = _new_monitor(name, source_url, _utcnow())
+            session.add(row)
+            await _flush_monitors(session, source_url)
+            self._adjust_count(session, "monitors", 1)
+            await self._bump(session, "monitors", row.id)
+            return _monitor_record(row)
+
+    async def list_monitors(self) -> list[MonitorRecord]:
+        async with self._sessions.read_session() as session:
+            rows = await session.scalars(select(Monitor).order_by(Monitor.id))
+            return [_monitor_record(row) for row in rows]
+
+    async def page_monitors(
+        self,
+        *,
+        after: PageKey | None = None,
+        limit: int,
+        changed: bool | None = None,
+        updated_since: float | None = None,
+    ) -> Page[MonitorRecord]:
+        condition = None
+        if changed is not None:
+            # Always a literal, never a bound parameter, so that even a generic plan can
+            # prove the predicate of the partial index ix_monitors_changed_created_at_id.
+            condition = Monitor.changed == (true() if changed else false())
+        return await self._page(
+            Monitor,
+            _monitor_record,
+            after=after,
+            limit=limit,
+            updated_since=updated_since,
+            condition=condition,
+        )
+
+    async def list_monitors_for_url(self, source_url: str) -> list[MonitorRecord]:
+        async with self._sessions.read_session() as session:
+            rows = await session.scalars(
+                MONITORS_FOR_URL, {"url": normalize_source_url(source_url)}
+            )
+            return [_monitor_record(row) for row in rows]
+
+    async def find_monitor_by_url(self, source_url: str) -> MonitorRecord | None:
+        url = normalize_source_url(source_url)
+
+        async def load() -> MonitorRecord | None:
+            async with self._sessions.read_session() as session:
+                row = await session.scalar(FIRST_MONITOR_FOR_URL, {"url": url})
+                return _monitor_record(row) if row is not None else None
+
+        return await self._monitor_urls.get(url, load)
+
+    async def get_monitor(self, monitor_id: str) -> MonitorRecord | None:
+        return await self._get(Monitor, monitor_id, _monitor_record)
+
+    async def update_monitor(self, monitor_id: str, **updates: Any) -> MonitorRecord | None:
+        pk = _parse_id(monitor_id)
+        if pk is None:
+            return None
+        async with self._transaction() as session:
+            row = await session.get(Monitor, pk, with_for_update=True)
+            if row is None:
+                return None
+            previous_url = row.normalized_endpoint
+            _apply_monitor_update(row, updates, _utcnow())
+            if updates.get("source_url") is not None:
+                await _flush_monitors(session, updates["source_url"])
+            self._invalidate(session, Monitor, pk)
+            self._invalidate_urls(session, previous_url, row.normalized_endpoint)
+            await self._bump(session, "monitors", pk)
+            return _monitor_record(row)
+
+    async def set_monitor_snapshot(self, monitor_id: str, snapshot: str) -> MonitorRecord | None:
+        return await self.set_monitor_digest(monitor_id, snapshot_digest(snapshot))
+
+    async def set_monitor_digest(self, monitor_id: str, digest: bytes) -> MonitorRecord | None:
+        return (await self.set_monitor_digests([(monitor_id, digest)]))[0]
+
+    async def set_monitor_digests(
+        self, digests: list[tuple[str, bytes]]
+    ) -> list[MonitorRecord | None]:
+        """Apply ``(monitor_id, digest)`` pairs in order inside one transaction.
+
+        The targeted monitors are locked and loaded with a single query.
+        """
+
+        pks = {pk for monitor_id, _ in digests if (pk := _parse_id(monitor_id)) is not None}
+        if not pks:
+            return [None] * len(digests)
+        records: list[MonitorRecord | None] = []
+        async with self._transaction() as session:
+            rows = {
+                row.id: row
+                for row in await session.scalars(
+                    select(Monitor).where(Monitor.id.in_(pks)).with_for_update()
+                )
+            }
+            now = _utcnow()
+            changed_delta = 0
+            for monitor_id, digest in digests:
+                row = rows.get(_parse_id(monitor_id))
+                if row is None:
+                    records.append(None)
+                    continue
+                changed = row.last_snapshot_hash not in (None, digest)
+                changed_delta += int(changed) - int(row.changed)
+                row.changed = changed
+                row.last_snapshot_hash = digest
+                row.updated_at = now
+                row.version += 1
+                records.append(_monitor_record(row))
+            touched = [rows[pk] for pk in dict.fromkeys(int(r.id) for r in records if r)]
+            if touched:
+                self._adjust_count(session, "changed_monitors", changed_delta)
+                self._invalidate(session, Monitor, *(row.id for row in touched))
+                self._invalidate_urls(session, *(row.normalized_endpoint for row in touched))
+                await self._bump(session, "monitors", *(row.id for row in touched))
+        return records
+
+    async def delete_monitor(self, monitor_id: str) -> bool:
+        pk = _parse_id(monitor_id)
+        if pk is None:
+            return False
+        async with self._transaction() as session:
+            deleted = (
+                await session.execute(
+                    delete(Monitor)
+                    .where(Monitor.id == pk)
+                    .returning(Monitor.normalized_endpoint, Monitor.changed)
+                )
+            ).all()
+            self._invalidate(session, Monitor, pk)
+            self._invalidate_urls(session, *(url for url, _ in deleted))
+            if deleted:
+                self._adjust_count(session, "monitors", -1)
+                self._adjust_count(session, "changed_monitors", -int(deleted[0].changed))
+                await self._bump(session, "monitors", pk)
+            return bool(deleted)
+
+    async def apply_monitor_batch(
+        self, operations: list[BatchOperation]
+    ) -> list[BatchResult[MonitorRecord]]:
+        """Apply ``operations`` in order inside a single transaction.
+
+        URL conflicts are checked against stored monitors and earlier items of the batch.
+        A URL given up by an earlier update or delete is written out before another
+        monitor claims it, so the unique URL index never sees it held twice.
+        """
+
+        results: list[BatchResult[MonitorRecord]] = []
+        async with self._transaction() as session:
+            rows = await self._load(session, Monitor, operations)
+            urls = {
+                normalize_source_url(operation.fields["source_url"])
+                for operation in operations
+                if operation.fields.get("source_url")
+            }
+            # normalized URL -> owning monitor id (None for monitors created in this batch)
+            owners: dict[str | None, int | None] = {}
+            if urls:
+                stored = await session.execute(
+                    select(Monitor.normalized_endpoint, Monitor.id).where(
+                        Monitor.normalized_endpoint.in_(urls)
+                    )
+                )
+                owners.update((url, monitor_id) for url, monitor_id in stored)
+            now = _utcnow()
+            created: list[tuple[int, Monitor]] = []
+            deleted: list[Monitor] = []
+            unwritten: list[Monitor] = []
+            released: set[str] = set()
+            for operation in operations:
+                url = operation.fields.get("source_url")
+                key = normalize_source_url(url) if url else None
+                if key in released:
+                    await _flush_monitors(session, url)
+                    await self._delete_rows(session, Monitor, unwritten)
+                    unwritten.clear()
+                    released.clear()
+                if operation.op == "create":
+                    if key in owners:
+                        results.append(BatchResult("conflict"))
+                        continue
+                    row = _new_monitor(now=now, **operation.fields)
+                    session.add(row)
+                    owners[key] = None
+                    created.append((len(results), row))
+                    results.append(BatchResult("created"))
+                    continue
+                row = rows.get(_parse_id(operation.id))
+                if row is None:
+                    results.append(BatchResult("not_found"))
+                elif operation.op == "update":
+                    if key is not None and key in owners and owners[key] != row.id:
+                        results.append(BatchResult("conflict", row))
+                        continue
+                    owners.pop(row.normalized_endpoint, None)
+                    released.add(row.normalized_endpoint)
+                    _apply_monitor_update(row, operation.fields, now)
+                    owners[row.normalized_endpoint] = row.id
+                    results.append(BatchResult("updated", row))
+                else:
+                    deleted.append(rows.pop(row.id))
+                    unwritten.append(row)
+                    owners.pop(row.normalized_endpoint, None)
+                    released.add(row.normalized_endpoint)
+                    results.append(BatchResult("deleted", row))
+            await _flush_monitors(session)
+            await self._delete_rows(session, Monitor, unwritten)
+            for position, row in created:
+                results[position].record = row
+            self._invalidate(session, Monitor, *(row.id for row in deleted), *rows)
+            # URL ownership may have moved between monitors within the batch.
+            self._invalidate_urls(session)
+            self._adjust_count(session, "monitors", len(created) - len(deleted))
+            self._adjust_count(session, "changed_monitors", -sum(row.changed for row in deleted))
+            if changed := [r.record.id for r in results if r.applied and r.record]:
+                await self._bump(session, "monitors", *changed)
+            return [
+                BatchResult(r.outcome, _monitor_record(r.record) if r.record else None)
+                for r in results
+            ]
+
+    async def collection_version(self, collection: CollectionName) -> int:
+        """Return the committed version of ``collection``: one primary-key lookup."""
+
+        async with self._sessions.read_session() as session:
+            return await session.scalar(COLLECTION_VERSION, {"name": collection}) or 0
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Call ``listener`` after every committed change made through this repository."""
+
+        self._listeners.append(listener)
+
+    async def _bump(
+        self,
+        session: AsyncSession,
+        collection: CollectionName,
+        *ids: int,
+        cascade: tuple[CollectionName, ...] = (),
+    ) -> None:
+        """Version ``collection`` and ``cascade`` in this transaction; notify after commit."""
+
+        await session.execute(BUMP_COLLECTIONS, {"names": [collection, *cascade]})
+        changes = [(collection, tuple(map(str, ids))), *((name, ()) for name in cascade)]
+
+        def notify() -> None:
+            for listener in self._listeners:
+                for name, changed in changes:
+                    listener(name, changed)
+
+        self._after_commit(session, notify)
+
+    async def _get(
+        self, model: type[ModelT], record_id: str, to_record: Callable[[ModelT], RecordT]
+    ) -> RecordT | None:
+        pk = _parse_id(record_id)
+        if pk is None:
+            return None
+
+        async def load() -> RecordT | None:
+            async with self._sessions.read_session() as session:
+                row = await session.scalar(BY_ID[model], {"id": pk})
+                return to_record(row) if row is not None else None
+
+        return await self._caches[model].get(pk, load)
+
+    @staticmethod
+    async def _delete_rows(session: AsyncSession, model: type[ModelT], rows: list[ModelT]) -> None:
+        """Delete ``rows`` with one statement, leaving dependent rows to ``ON DELETE CASCADE``.
+
+        A bulk DELETE avoids the ORM cascade, which would lazy-load relationships.
+        """
+
+        if not rows:
+            return
+        await session.execute(delete(model).where(model.id.in_([row.id for row in rows])))
+        for row in rows:
+            session.expunge(row)
+
+    @staticmethod
+    async def _load(
+        session: AsyncSession, model: type[ModelT], operations: list[BatchOperation]
+    ) -> dict[int, ModelT]:
+        """Fetch every row targeted by the update/delete operations in one query."""
+
+        ids = {
+            pk
+            for operation in operations
+            if operation.op != "create" and (pk := _parse_id(operation.id)) is not None
+        }
+        if not ids:
+            return {}
+        rows = await session.scalars(select(model).where(model.id.in_(ids)).with_for_update())
+        return {row.id: row for row in rows}
+
+    async def _page(
+        self,
+        model: type[ModelT],
+        to_record: Any,
+        *,
+        after: PageKey | None,
+        limit: int,
+        updated_since: float | None,
+        condition: ColumnElement[bool] | None = None,
+    ) -> Page[Any]:
+        """Run a keyset query ordered by ``(created_at, id)`` or ``(updated_at, id)``."""
+
+        order_column = model.created_at if updated_since is None else model.updated_at
+        statement = select(model)
+        if condition is not None:
+            statement = statement.where(condition)
+        if updated_since is not None:
+            statement = statement.where(order_column >= _from_epoch(updated_since))
+        if after is not None:
+            after_at, after_id = _from_epoch(after[0]), _parse_id(after[1]) or 0
+            statement = statement.where(
+                or_(order_column > after_at, and_(order_column == after_at, model.id > after_id))
+            )
+        statement = statement.order_by(order_column, model.id).limit(limit + 1)
+        async with self._sessions.read_session() as session:
+            rows = list(await session.scalars(statement))
+        items = [to_record(row) for row in rows[:limit]]
+        if len(rows) <= limit:
+            return Page(items)
+        last = items[-1]
+        return Page(
+            items, next_key=(last.created_at if updated_since is None else last.updated_at, last.id)
+        )
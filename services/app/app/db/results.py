@@ -0,0 +1,76 @@
+"""Job result persistence for the database backend."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from time import time
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.models import Result, ResultStatus
+from app.db.partitions import ResultPartitions
+from app.db.write_behind import WriteBehindBuffer
+
+
+def result_row(job_id: int, *, succeeded: bool, content: str | None, at: float | None) -> dict[str, Any]:
+    """Build a ``results`` row, stamped now unless ``at`` is given."""
+
+    return {
+        "job_id": job_id,
+        "status": ResultStatus.PROCESSED if succeeded else ResultStatus.ERROR,
+        "content": content,
+        # Stamp the row now: with write-behind the server default would be flush time.
+        "created_at": datetime.fromtimestamp(time() if at is None else at, timezone.utc),
+    }
+
+
+class ResultWriter:
+    """Append job results to ``results`` through a :class:`WriteBehindBuffer`.
+
+    With ``partitions`` every row goes to the partition of its ``created_at``.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        max_batch: int = 500,
+        max_delay_seconds: float = 0.05,
+        max_pending: int = 10_000,
+        partitions: ResultPartitions | None = None,
+    ) -> None:
+        self.partitions = partitions
+        self.buffer = WriteBehindBuffer(
+            session_factory,
+            Result.__table__,
+            max_batch=max_batch,
+            max_delay_seconds=max_delay_seconds,
+            max_pending=max_pending,
+            router=None if partitions is None else partitions.route,
+        )
+
+    def start(self) -> None:
+        """Start flushing buffered results and expiring partitions in the background."""
+
+        self.buffer.start()
+        if self.partitions is not None:
+            self.partitions.start()
+
+    async def close(self) -> None:
+        """Flush outstanding results and stop the background tasks."""
+
+        await self.buffer.close()
+        if self.partitions is not None:
+            await self.partitions.close()
+
+    async def record_result(
+        self, job_id: str, *, succeeded: bool, content: str | None, at: float | None = None
+    ) -> None:
+        """Queue one execution result; ids that cannot be job keys are ignored."""
+
+        try:
+            pk = int(job_id)
+        except ValueError:
+            return
+        await self.buffer.put(result_row(pk, succeeded=succeeded, content=content, at=at))
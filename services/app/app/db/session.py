@@ -1,30 +1,290 @@
-"""Async SQLAlchemy engine/session helpers for FastAPI."""
+"""Async SQLAlchemy engine/session helpers for FastAPI.
+
+This module keeps no engines of its own: :func:`get_session_router` returns the one
+owned by the application container (:mod:`app.dependencies`), so importing it opens no
+connection pools and every session of a process comes from the same engines.
+"""
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import TYPE_CHECKING, Any
 
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+from starlette.requests import HTTPConnection
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import DB_READ_SESSIONS
+from app.db.instrumentation import TimedQueuePool, instrument_engine
+
+if TYPE_CHECKING:
+    from app.dependencies import Container
+
+# Monotonic deadline until which reads in the current request context stay on the primary.
+_primary_pinned_until: ContextVar[float] = ContextVar("primary_pinned_until", default=0.0)
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def pool_options(settings: Settings, url: str | None = None) -> dict[str, Any]:
+    """Return engine pool keyword arguments derived from ``settings``.
+
+    In-memory SQLite must share one connection, so it gets a ``StaticPool`` instead of the
+    sized queue pool used for every server or file-backed database. ``url`` defaults to
+    ``settings.database_url``.
+    """
+
+    if _is_sqlite_memory(url or settings.database_url):
+        return {"poolclass": StaticPool}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _is_sqlite_file(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite" and not _is_sqlite_memory(url)
+
+
+def sqlite_pragmas(settings: Settings) -> list[str]:
+    """Return the PRAGMAs run on every new SQLite connection for ``settings``."""
+
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are enabled per connection.
+    pragmas = ["PRAGMA foreign_keys=ON"]
+    if settings.sqlite_profile == "production":
+        pragmas += [
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            f"PRAGMA mmap_size={settings.sqlite_mmap_size_bytes}",
+            f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+            f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+            "PRAGMA temp_store=MEMORY",
+        ]
+    return pragmas
 
-from app.core.settings import Settings, get_settings
 
+def create_engine(
+    settings: Settings | None = None,
+    *,
+    url: str | None = None,
+    single_writer: bool = False,
+    name: str = "primary",
+) -> AsyncEngine:
+    """Create and return an async SQLAlchemy engine, for ``url`` or the primary database.
 
-def create_engine(settings: Settings | None = None) -> AsyncEngine:
-    """Create and return the application's async SQLAlchemy engine."""
+    ``single_writer`` caps the pool at one connection, so concurrent writers queue for
+    it in FIFO order instead of contending for SQLite's write lock. ``name`` labels the
+    engine's statement and pool metrics.
+    """
 
     cfg = settings or get_settings()
-    return create_async_engine(cfg.database_url, future=True, pool_pre_ping=True)
+    url = url or cfg.database_url
+    options = pool_options(cfg, url)
+    capacity = None
+    if "poolclass" not in options:
+        if single_writer:
+            options.update(pool_size=1, max_overflow=0)
+        options.update(poolclass=TimedQueuePool, pool_logging_name=name)
+        capacity = options["pool_size"] + options["max_overflow"]
+    engine = create_async_engine(url, **options)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _sqlite_connect_listener(sqlite_pragmas(cfg)))
+    instrument_engine(
+        engine.sync_engine,
+        name=name,
+        slow_query_seconds=cfg.db_slow_query_seconds,
+        pool_capacity=capacity,
+    )
+    return engine
+
+
+def _sqlite_connect_listener(pragmas: list[str]) -> Callable[[Any, Any], None]:
+    def configure(dbapi_connection: Any, _connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return configure
+
+
+def create_session_factory(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Build the session factory used by request handlers and repositories."""
+
+    return async_sessionmaker(bind=bind, autoflush=False, expire_on_commit=False)
+
+
+def pin_primary(seconds: float) -> None:
+    """Route reads in the current context to the primary for the next ``seconds``."""
+
+    if seconds > 0:
+        _primary_pinned_until.set(max(_primary_pinned_until.get(), monotonic() + seconds))
+
+
+def primary_pinned() -> bool:
+    """Whether a recent write in the current context pins reads to the primary."""
+
+    return _primary_pinned_until.get() > monotonic()
+
+
+class SessionRouter:
+    """Hand out write sessions from the primary and read sessions from a replica.
+
+    Reads go to the replica unless none is configured, a write in the same context
+    (one request, one background task) finished less than ``read_your_writes_seconds``
+    ago, or the replica recently failed to connect. A replica that cannot connect is
+    skipped for ``replica_retry_seconds`` and the read falls back to the primary.
+    """
 
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replica: async_sessionmaker[AsyncSession] | None = None,
+        *,
+        read_your_writes_seconds: float = 2.0,
+        replica_retry_seconds: float = 5.0,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self._read_your_writes = read_your_writes_seconds
+        self._retry = replica_retry_seconds
+        self._replica_down_until = 0.0
 
-engine: AsyncEngine = create_engine()
-AsyncSessionFactory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    @asynccontextmanager
+    async def write_session(self) -> AsyncIterator[AsyncSession]:
+        """Yield a primary session and pin this context's reads to the primary afterwards."""
 
+        try:
+            async with self.primary() as session:
+                yield session
+        finally:
+            if self.replica is not None:
+                pin_primary(self._read_your_writes)
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """FastAPI dependency yielding an async database session."""
+    @asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        """Yield a session for read-only work, preferring the replica."""
 
-    async with AsyncSessionFactory() as session:
+        replica = await self._connect_replica()
+        if replica is not None:
+            DB_READ_SESSIONS.labels(target="replica").inc()
+            async with replica:
+                yield replica
+            return
+        DB_READ_SESSIONS.labels(target="primary").inc()
+        async with self.primary() as session:
+            yield session
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Engine of the primary database."""
+
+        return self.primary.kw["bind"]
+
+    async def dispose(self) -> None:
+        """Close the pooled connections of the primary and replica engines."""
+
+        await self.engine.dispose()
+        if self.replica is not None:
+            await self.replica.kw["bind"].dispose()
+
+    async def _connect_replica(self) -> AsyncSession | None:
+        if self.replica is None or primary_pinned() or self._replica_down_until > monotonic():
+            return None
+        session = self.replica()
+        try:
+            await session.connection()
+        except (DBAPIError, OSError):
+            await session.close()
+            self._replica_down_until = monotonic() + self._retry
+            DB_READ_SESSIONS.labels(target="replica_unavailable").inc()
+            return None
+        return session
+
+
+def create_session_router(settings: Settings | None = None) -> SessionRouter:
+    """Build the primary (and optional replica) engines and route sessions between them.
+
+    The SQLite production profile without a replica splits one database file into a
+    single-connection writer engine and a pooled reader engine; WAL readers see every
+    committed write, so reads are never pinned to the writer.
+    """
+
+    cfg = settings or get_settings()
+    read_your_writes = cfg.db_read_your_writes_seconds
+    if cfg.database_replica_url:
+        primary = create_engine(cfg)
+        replica = create_session_factory(
+            create_engine(cfg, url=cfg.database_replica_url, name="replica")
+        )
+    elif cfg.sqlite_profile == "production" and _is_sqlite_file(cfg.database_url):
+        primary = create_engine(cfg, single_writer=True, name="writer")
+        replica = create_session_factory(create_engine(cfg, name="reader"))
+        read_your_writes = 0.0
+    else:
+        primary = create_engine(cfg)
+        replica = None
+    return SessionRouter(
+        create_session_factory(primary),
+        replica,
+        read_your_writes_seconds=read_your_writes,
+        replica_retry_seconds=cfg.db_replica_retry_seconds,
+    )
+
+
+def get_session_router(app_container: Container | None = None) -> SessionRouter:
+    """Return the session router of ``app_container``, building it on first use.
+
+    ``app_container`` defaults to the process-wide container. Request dependencies and
+    the repository share the router, and the container disposes its engines when the
+    application shuts down.
+    """
+
+    if app_container is None:
+        from app.dependencies import container as app_container
+
+    session_router = app_container.session_router
+    if session_router is None:
+        raise RuntimeError("database sessions need REPOSITORY_BACKEND=database")
+    return session_router
+
+
+async def get_db_session(connection: HTTPConnection) -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency yielding a session on the primary database."""
+
+    from app.dependencies import get_container
+
+    async with get_session_router(get_container(connection)).write_session() as session:
+        yield session
+
+
+async def get_read_db_session(
+    connection: HTTPConnection,
+) -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency yielding a read-only session, routed to the replica when possible."""
+
+    from app.dependencies import get_container
+
+    async with get_session_router(get_container(connection)).read_session() as session:
         yield session
 
 
@@ -34,3 +294,11 @@ def db_session_dependency(
     """Reusable dependency alias for endpoint signatures."""
 
     return session
+
+
+def read_db_session_dependency(
+    session: AsyncSession = Depends(get_read_db_session),
+) -> AsyncSession:
+    """Reusable dependency alias for read-only endpoint signatures."""
+
+    return session
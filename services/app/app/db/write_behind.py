@@ -0,0 +1,164 @@
+"""Write-behind buffering that turns many small inserts into batched transactions."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from contextlib import suppress
+from typing import Any
+
+import structlog
+from sqlalchemy import Table, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.metrics import FAILURE_COUNTER, WRITE_BEHIND_FLUSH_ROWS, WRITE_BEHIND_PENDING
+
+logger = structlog.get_logger(__name__)
+
+Router = Callable[[Sequence[dict[str, Any]]], Awaitable[dict[Table, list[dict[str, Any]]]]]
+
+
+class WriteBehindBuffer:
+    """Buffer rows for ``table`` and insert them in batches from a background task.
+
+    A flush runs once ``max_batch`` rows are waiting or ``max_delay_seconds`` after
+    the first buffered row, whichever comes first; each batch is one executemany
+    inside one transaction. When ``max_pending`` rows are waiting, :meth:`put`
+    blocks until a flush makes room, so producers slow down instead of growing
+    the buffer without bound while the database is behind. Batches that fail to
+    connect or commit stay buffered and are retried; a batch rejected by a
+    constraint is replayed row by row so one bad row (say, for a job deleted in
+    the meantime) is dropped without losing its neighbours. :meth:`close` stops
+    the background task and flushes whatever is left.
+
+    ``router`` optionally splits a batch across several tables with the same
+    columns (e.g. time partitions); all of them are written in one transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        table: Table,
+        *,
+        max_batch: int = 500,
+        max_delay_seconds: float = 0.05,
+        max_pending: int = 10_000,
+        router: Router | None = None,
+    ) -> None:
+        if max_batch < 1 or max_pending < max_batch:
+            raise ValueError("max_pending must be at least max_batch, which must be positive")
+        self._session_factory = session_factory
+        self._table = table
+        self._max_batch = max_batch
+        self._max_delay = max_delay_seconds
+        self._max_pending = max_pending
+        self._router = router
+        self._rows: list[dict[str, Any]] = []
+        self._has_rows = asyncio.Event()
+        self._full = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Number of rows waiting to be written."""
+
+        return len(self._rows)
+
+    def start(self) -> None:
+        """Start the background flusher on the running event loop."""
+
+        if self._task is None:
+            self._closed = False
+            self._task = asyncio.create_task(self._run(), name=f"write-behind-{self._table.name}")
+
+    async def put(self, row: Mapping[str, Any]) -> None:
+        """Buffer ``row``, waiting while the buffer is at ``max_pending``."""
+
+        while len(self._rows) >= self._max_pending:
+            self._space.clear()
+            await self._space.wait()
+        if self._closed:
+            raise RuntimeError(f"write-behind buffer for {self._table.name} is closed")
+        self._rows.append(dict(row))
+        self._has_rows.set()
+        if len(self._rows) >= self._max_batch:
+            self._full.set()
+        WRITE_BEHIND_PENDING.labels(table=self._table.name).set(len(self._rows))
+
+    async def flush(self) -> int:
+        """Write every buffered row now and return how many were written."""
+
+        written = 0
+        async with self._flush_lock:
+            while self._rows:
+                batch = self._rows[: self._max_batch]
+                written += await self._write(batch)
+                # Rows are only ever appended, so the written batch is still the prefix.
+                del self._rows[: len(batch)]
+                WRITE_BEHIND_FLUSH_ROWS.labels(table=self._table.name).observe(len(batch))
+                self._drained()
+            self._has_rows.clear()
+            self._full.clear()
+        return written
+
+    async def close(self) -> None:
+        """Stop the background flusher and write the remaining rows."""
+
+        self._closed = True
+        self._has_rows.set()
+        self._full.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._closed:
+            await self._has_rows.wait()
+            if not self._closed and len(self._rows) < self._max_batch:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._full.wait(), self._max_delay)
+            if self._closed:
+                return
+            try:
+                await self.flush()
+            except Exception:
+                FAILURE_COUNTER.labels(operation="write_behind_flush").inc()
+                logger.exception(
+                    "write_behind_flush_failed", table=self._table.name, pending=len(self._rows)
+                )
+                await asyncio.sleep(self._max_delay)
+
+    async def _write(self, batch: list[dict[str, Any]]) -> int:
+        try:
+            await self._insert(batch)
+            return len(batch)
+        except IntegrityError:
+            pass
+        rejected = 0
+        for row in batch:
+            try:
+                await self._insert([row])
+            except IntegrityError:
+                rejected += 1
+        FAILURE_COUNTER.labels(operation="write_behind_rejected").inc(rejected)
+        logger.warning("write_behind_rows_rejected", table=self._table.name, rejected=rejected)
+        return len(batch) - rejected
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        targets = {self._table: rows} if self._router is None else await self._router(rows)
+        async with self._session_factory() as session, session.begin():
+            for table, table_rows in targets.items():
+                await session.execute(insert(table), table_rows)
+
+    def _drained(self) -> None:
+        WRITE_BEHIND_PENDING.labels(table=self._table.name).set(len(self._rows))
+        if len(self._rows) < self._max_pending:
+            self._space.set()
+        if len(self._rows) < self._max_batch:
+            self._full.clear()
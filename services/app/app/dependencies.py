@@ -1,29 +1,224 @@
-"""Application-scoped dependency wiring for services and repositories."""
+"""Application-scoped dependency wiring for services and repositories.
 
+Nothing is built at import time. A :class:`Container` creates each component on first
+use and the application's lifespan starts and closes it, so importing the app (or forking
+workers from a process that did) opens no database engine and shares no live objects.
+Request dependencies resolve from the container on ``app.state``; the default application
+uses the process-wide :data:`container`.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from starlette.requests import HTTPConnection
+
+from app.api.response_cache import ResponseCache
+from app.core.config import Settings, get_settings
+from app.core.prometheus import MetricsExporter, multiprocess_dir
+from app.services.events import EventHub
 from app.services.executor import JobExecutor
+from app.services.interfaces import Repository
 from app.services.monitoring import MonitorService
 from app.services.repositories import InMemoryRepository
 from app.services.scheduler import Scheduler
 
-repository = InMemoryRepository()
-executor = JobExecutor()
-monitor_service = MonitorService(repository)
-scheduler = Scheduler(repository, executor)
+if TYPE_CHECKING:
+    from app.db.results import ResultWriter
+    from app.db.session import SessionRouter
+
+
+def build_repository(
+    settings: Settings,
+    result_writer: ResultWriter | None = None,
+    session_router: SessionRouter | None = None,
+) -> Repository:
+    """Instantiate the repository selected by ``settings.repository_backend``.
+
+    The database repository uses ``session_router`` (the container's by default)
+    and reads job results from ``result_writer``'s partitions.
+    """
+
+    if settings.repository_backend == "database":
+        from app.db.repository import SqlAlchemyRepository
+        from app.db.session import get_session_router
+
+        partitions = result_writer.partitions if result_writer is not None else None
+        return SqlAlchemyRepository(
+            session_router or get_session_router(),
+            partitions=partitions,
+            cache_ttl_seconds=settings.repository_cache_ttl_seconds,
+            cache_max_entries=settings.repository_cache_max_entries,
+            counts_max_age_seconds=settings.repository_counts_max_age_seconds,
+        )
+    return InMemoryRepository()
+
+
+def build_result_writer(
+    settings: Settings, session_router: SessionRouter | None = None
+) -> ResultWriter | None:
+    """Instantiate the buffered, partitioned job result writer when results are persisted."""
+
+    if settings.repository_backend != "database":
+        return None
+    from app.db.partitions import ResultPartitions
+    from app.db.results import ResultWriter
+    from app.db.session import get_session_router
+
+    session_router = session_router or get_session_router()
+    return ResultWriter(
+        session_router.primary,
+        max_batch=settings.result_batch_size,
+        max_delay_seconds=settings.result_flush_interval_seconds,
+        max_pending=max(settings.result_max_pending, settings.result_batch_size),
+        partitions=ResultPartitions(
+            session_router.engine,
+            period_seconds=settings.result_partition_seconds,
+            retention_periods=settings.result_retention_periods,
+            compaction_interval_seconds=settings.result_compaction_interval_seconds,
+        ),
+    )
+
+
+class Container:
+    """The services and repositories of one process, each built on first access.
+
+    ``settings`` defaults to :func:`get_settings`. :meth:`start` starts the background
+    result writer; :meth:`aclose` drains it, disposes the database engines and forgets
+    every component, so the next access (a new lifespan, another test) builds afresh.
+    """
+
+    _COMPONENTS = (
+        "settings",
+        "session_router",
+        "result_writer",
+        "repository",
+        "executor",
+        "events",
+        "response_cache",
+        "monitor_service",
+        "scheduler",
+        "metrics_exporter",
+    )
+
+    def __init__(self, settings: Settings | None = None) -> None:
+        self._settings = settings
+
+    @cached_property
+    def settings(self) -> Settings:
+        return self._settings or get_settings()
+
+    @cached_property
+    def session_router(self) -> SessionRouter | None:
+        """Database engines and sessions; ``None`` with the memory backend."""
+
+        if self.settings.repository_backend != "database":
+            return None
+        from app.db.session import create_session_router
+
+        return create_session_router(self.settings)
+
+    @cached_property
+    def result_writer(self) -> ResultWriter | None:
+        return build_result_writer(self.settings, self.session_router)
+
+    @cached_property
+    def repository(self) -> Repository:
+        repository = build_repository(self.settings, self.result_writer, self.session_router)
+        repository.add_change_listener(self.response_cache.invalidate)
+        return repository
 
+    @cached_property
+    def executor(self) -> JobExecutor:
+        return JobExecutor()
 
-def get_repository() -> InMemoryRepository:
+    @cached_property
+    def events(self) -> EventHub:
+        return EventHub(
+            buffer_size=self.settings.event_buffer_size,
+            policy=self.settings.event_slow_consumer_policy,
+        )
+
+    @cached_property
+    def response_cache(self) -> ResponseCache:
+        return ResponseCache(max_bytes=self.settings.response_cache_max_bytes)
+
+    @cached_property
+    def monitor_service(self) -> MonitorService:
+        return MonitorService(self.repository, self.events)
+
+    @cached_property
+    def scheduler(self) -> Scheduler:
+        # Without the buffered writer (memory backend) the repository stores results itself.
+        return Scheduler(
+            self.repository, self.executor, self.result_writer or self.repository, self.events
+        )
+
+    @cached_property
+    def metrics_exporter(self) -> MetricsExporter:
+        return MetricsExporter(
+            directory=multiprocess_dir(), cache_seconds=self.settings.metrics_cache_seconds
+        )
+
+    def start(self) -> None:
+        """Start the background result writer, if results are persisted."""
+
+        if self.result_writer is not None:
+            self.result_writer.start()
+
+    async def aclose(self) -> None:
+        """Flush and stop background work, dispose engines and drop every component."""
+
+        built = vars(self)
+        if built.get("result_writer") is not None:
+            await built["result_writer"].close()
+        if built.get("session_router") is not None:
+            await built["session_router"].dispose()
+        for name in self._COMPONENTS:
+            built.pop(name, None)
+
+
+container = Container()
+
+
+def get_container(connection: HTTPConnection) -> Container:
+    """Return the container of the application serving ``connection``."""
+
+    return getattr(connection.app.state, "container", container)
+
+
+def get_repository(connection: HTTPConnection) -> Repository:
     """Return the active repository implementation."""
 
-    return repository
+    return get_container(connection).repository
+
+
+def get_events(connection: HTTPConnection) -> EventHub:
+    """Return the live change event hub."""
+
+    return get_container(connection).events
+
+
+def get_response_cache(connection: HTTPConnection) -> ResponseCache:
+    """Return the encoded GET response cache."""
+
+    return get_container(connection).response_cache
+
+
+def get_metrics_exporter(connection: HTTPConnection) -> MetricsExporter:
+    """Return the Prometheus metrics exporter."""
+
+    return get_container(connection).metrics_exporter
 
 
-def get_monitor_service() -> MonitorService:
+def get_monitor_service(connection: HTTPConnection) -> MonitorService:
     """Return the monitor service."""
 
-    return monitor_service
+    return get_container(connection).monitor_service
 
 
-def get_scheduler() -> Scheduler:
+def get_scheduler(connection: HTTPConnection) -> Scheduler:
     """Return the scheduler service."""
 
-    return scheduler
+    return get_container(connection).scheduler
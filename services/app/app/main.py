@@ -1,18 +1,46 @@
-"""FastAPI application factory and router registration."""
+"""FastAPI application factory and router registration.
+
+Importing this module builds nothing: the default application is created on first access
+to ``app.main.app`` (as ``uvicorn app.main:app`` does), and its services when first used.
+"""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.api.middleware import ProfileMiddleware, RequestMetricsMiddleware
 from app.api.routers import api_router, metrics_router
 from app.api.routers.dashboard import router as dashboard_router
 from app.core.config import Settings, get_settings
 from app.core.logger import configure_logging
+from app.core.prometheus import mark_worker_exited
+from app.dependencies import Container, container
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    """Start the app's dependency container for its lifetime and close it on shutdown.
+
+    On shutdown the worker also drops out of the multi-process ``live*`` gauges.
+    """
+
+    app_container: Container = application.state.container
+    app_container.start()
+    try:
+        yield
+    finally:
+        await app_container.aclose()
+        mark_worker_exited()
 
 
 def create_app(settings: Settings | None = None) -> FastAPI:
     """Build and configure the FastAPI application instance.
 
     Args:
-        settings: Optional settings override for tests or custom runtime wiring.
+        settings: Optional settings override for tests or custom runtime wiring. The app
+            then gets a container of its own built from them; without an override it
+            shares the process-wide :data:`app.dependencies.container`.
 
     Returns:
         A configured :class:`fastapi.FastAPI` application.
@@ -24,11 +52,22 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         title=resolved_settings.app_name,
         debug=resolved_settings.debug,
         version=resolved_settings.app_version,
+        lifespan=lifespan,
     )
+    application.state.container = container if settings is None else Container(resolved_settings)
     application.include_router(dashboard_router)
     application.include_router(api_router, prefix=resolved_settings.api_prefix)
     application.include_router(metrics_router)
+    if resolved_settings.profiling_enabled:
+        application.add_middleware(
+            ProfileMiddleware, interval=resolved_settings.profiling_interval_seconds
+        )
+    application.add_middleware(RequestMetricsMiddleware, schema=application.openapi)
     return application
 
 
-app = create_app()
+def __getattr__(name: str) -> FastAPI:
+    if name == "app":
+        application = globals()["app"] = create_app()
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,174 @@
+"""In-process fan-out of change events to live subscribers (SSE and WebSocket clients)."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Collection
+from dataclasses import dataclass, field
+from itertools import count
+from time import time
+from typing import TYPE_CHECKING, Any, Literal
+
+from app.core.metrics import EVENT_SUBSCRIBERS, EVENTS_DROPPED, EVENTS_PUBLISHED
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+SlowConsumerPolicy = Literal["drop_oldest", "disconnect"]
+
+MONITOR_CHANGED = "monitor.changed"
+JOB_SUCCEEDED = "job.succeeded"
+JOB_FAILED = "job.failed"
+ANALYSIS_COMPLETED = "analysis.completed"
+
+
+@dataclass(slots=True, frozen=True)
+class ChangeEvent:
+    id: int
+    type: str
+    data: dict[str, Any]
+    at: float = field(default_factory=time)
+
+
+class Subscription:
+    """One subscriber's bounded buffer, filled by :meth:`EventHub.publish`.
+
+    When the buffer is full, ``drop_oldest`` discards the oldest buffered event and
+    counts it (see :meth:`take_dropped`); ``disconnect`` closes the subscription so
+    the client reconnects and resumes from its last event id.
+    """
+
+    def __init__(
+        self,
+        hub: EventHub,
+        types: Collection[str] | None,
+        *,
+        buffer_size: int,
+        policy: SlowConsumerPolicy,
+    ) -> None:
+        self._hub = hub
+        self._types = frozenset(types) if types else None
+        self._buffer: deque[ChangeEvent] = deque()
+        self._buffer_size = buffer_size
+        self._policy = policy
+        self._ready = asyncio.Event()
+        self._dropped = 0
+        self.closed = False
+
+    def wants(self, event: ChangeEvent) -> bool:
+        return self._types is None or event.type in self._types
+
+    def offer(self, event: ChangeEvent) -> None:
+        """Buffer ``event`` without blocking the publisher."""
+
+        if self.closed:
+            return
+        if len(self._buffer) >= self._buffer_size:
+            EVENTS_DROPPED.labels(policy=self._policy).inc()
+            if self._policy == "disconnect":
+                self.close()
+                return
+            self._buffer.popleft()
+            self._dropped += 1
+        self._buffer.append(event)
+        self._ready.set()
+
+    async def get(self, timeout: float | None = None) -> ChangeEvent | None:
+        """Next buffered event; ``None`` on timeout or once the subscription is closed."""
+
+        while not self._buffer:
+            if self.closed:
+                return None
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._buffer.popleft()
+
+    def take_dropped(self) -> int:
+        """Events discarded since the last call (``drop_oldest`` policy)."""
+
+        dropped, self._dropped = self._dropped, 0
+        return dropped
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._ready.set()
+            self._hub.unsubscribe(self)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class EventHub:
+    """Publish change events to every matching subscriber.
+
+    :meth:`publish` is synchronous and never waits on a subscriber: each one has its
+    own bounded buffer and slow-consumer policy. The last ``history_size`` events are
+    kept so a reconnecting client can resume after its ``Last-Event-ID``. The hub
+    lives in one process; subscribers only see events published in it.
+    """
+
+    def __init__(
+        self,
+        *,
+        buffer_size: int = 256,
+        policy: SlowConsumerPolicy = "drop_oldest",
+        history_size: int = 256,
+    ) -> None:
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self._subscribers: set[Subscription] = set()
+        self._history: deque[ChangeEvent] = deque(maxlen=history_size)
+        self._ids = count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: dict[str, Any]) -> ChangeEvent:
+        event = ChangeEvent(next(self._ids), event_type, data)
+        self._history.append(event)
+        EVENTS_PUBLISHED.labels(type=event_type).inc()
+        # Copy: a "disconnect" subscriber removes itself while we iterate.
+        for subscription in list(self._subscribers):
+            if subscription.wants(event):
+                subscription.offer(event)
+        return event
+
+    def subscribe(
+        self,
+        types: Collection[str] | None = None,
+        *,
+        after_id: int | None = None,
+        buffer_size: int | None = None,
+        policy: SlowConsumerPolicy | None = None,
+    ) -> Subscription:
+        """Register a subscriber for ``types`` (all when empty).
+
+        With ``after_id`` the retained events newer than it are buffered first.
+        """
+
+        subscription = Subscription(
+            self,
+            types,
+            buffer_size=buffer_size or self.buffer_size,
+            policy=policy or self.policy,
+        )
+        if after_id is not None:
+            for event in self._history:
+                if event.id > after_id and subscription.wants(event):
+                    subscription.offer(event)
+        self._subscribers.add(subscription)
+        EVENT_SUBSCRIBERS.set(len(self._subscribers))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        EVENT_SUBSCRIBERS.set(len(self._subscribers))
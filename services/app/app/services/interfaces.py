@@ -0,0 +1,149 @@
+"""Typed protocol shared by the repository implementations."""
+
+from typing import Any, Protocol, runtime_checkable
+
+from app.services.repositories import (
+    BatchOperation,
+    BatchResult,
+    ChangeListener,
+    CollectionName,
+    DashboardSummary,
+    JobRecord,
+    MonitorRecord,
+    Page,
+    PageKey,
+    ResultRecord,
+    TaskRecord,
+)
+
+
+@runtime_checkable
+class Repository(Protocol):
+    """Storage for tasks, jobs and monitors used by routers and services.
+
+    Implemented by :class:`~app.services.repositories.InMemoryRepository` and
+    :class:`~app.db.repository.SqlAlchemyRepository`.
+    """
+
+    async def reset(self) -> None:
+        """Remove every task, job and monitor."""
+
+    async def create_task(self, name: str, payload: dict[str, Any]) -> TaskRecord: ...
+
+    async def list_tasks(self) -> list[TaskRecord]: ...
+
+    async def page_tasks(
+        self, *, after: PageKey | None = None, limit: int, updated_since: float | None = None
+    ) -> Page[TaskRecord]: ...
+
+    async def get_task(self, task_id: str) -> TaskRecord | None: ...
+
+    async def update_task(self, task_id: str, **updates: Any) -> TaskRecord | None: ...
+
+    async def delete_task(self, task_id: str) -> bool:
+        """Delete a task together with its jobs."""
+
+    async def apply_task_batch(
+        self, operations: list[BatchOperation]
+    ) -> list[BatchResult[TaskRecord]]: ...
+
+    async def create_job(
+        self, task_id: str, schedule_every_seconds: int, enabled: bool
+    ) -> JobRecord: ...
+
+    async def list_jobs(self) -> list[JobRecord]: ...
+
+    async def page_jobs(
+        self,
+        *,
+        after: PageKey | None = None,
+        limit: int,
+        enabled: bool | None = None,
+        updated_since: float | None = None,
+    ) -> Page[JobRecord]: ...
+
+    async def list_jobs_for_task(self, task_id: str) -> list[JobRecord]: ...
+
+    async def get_job(self, job_id: str) -> JobRecord | None: ...
+
+    async def update_job(self, job_id: str, **updates: Any) -> JobRecord | None: ...
+
+    async def delete_job(self, job_id: str) -> bool: ...
+
+    async def apply_job_batch(
+        self, operations: list[BatchOperation]
+    ) -> list[BatchResult[JobRecord]]: ...
+
+    async def mark_job_run(self, job_id: str) -> JobRecord | None:
+        """Record a successful run: set ``last_run_at`` and clear the failing flag."""
+
+    async def mark_job_failed(self, job_id: str) -> JobRecord | None:
+        """Flag the job as failing until its next successful run."""
+
+    async def record_result(
+        self, job_id: str, *, succeeded: bool, content: str | None, at: float | None = None
+    ) -> None:
+        """Store one execution result; results for unknown jobs are dropped."""
+
+    async def get_job_with_results(
+        self, job_id: str, limit: int
+    ) -> tuple[JobRecord, list[ResultRecord]] | None:
+        """Return the job and its ``limit`` most recent results, newest first."""
+
+    async def summary(self, recent_jobs: int) -> DashboardSummary:
+        """Return entity counters without scanning, plus the ``recent_jobs`` newest jobs."""
+
+    async def create_monitor(self, name: str, source_url: str) -> MonitorRecord:
+        """Create a monitor; raises ``MonitorUrlConflict`` if its URL is already watched."""
+
+    async def list_monitors(self) -> list[MonitorRecord]: ...
+
+    async def page_monitors(
+        self,
+        *,
+        after: PageKey | None = None,
+        limit: int,
+        changed: bool | None = None,
+        updated_since: float | None = None,
+    ) -> Page[MonitorRecord]: ...
+
+    async def list_monitors_for_url(self, source_url: str) -> list[MonitorRecord]: ...
+
+    async def find_monitor_by_url(self, source_url: str) -> MonitorRecord | None: ...
+
+    async def get_monitor(self, monitor_id: str) -> MonitorRecord | None: ...
+
+    async def update_monitor(self, monitor_id: str, **updates: Any) -> MonitorRecord | None:
+        """Update a monitor; raises ``MonitorUrlConflict`` if another one watches its new URL."""
+
+    async def set_monitor_snapshot(self, monitor_id: str, snapshot: str) -> MonitorRecord | None:
+        """Store the snapshot hash and flag whether it differs from the previous one."""
+
+    async def set_monitor_digest(self, monitor_id: str, digest: bytes) -> MonitorRecord | None:
+        """Like :meth:`set_monitor_snapshot` for a snapshot already hashed with SHA-256."""
+
+    async def set_monitor_digests(
+        self, digests: list[tuple[str, bytes]]
+    ) -> list[MonitorRecord | None]:
+        """Apply ``(monitor_id, digest)`` pairs in order in one lock acquisition/transaction."""
+
+    async def delete_monitor(self, monitor_id: str) -> bool: ...
+
+    async def apply_monitor_batch(
+        self, operations: list[BatchOperation]
+    ) -> list[BatchResult[MonitorRecord]]: ...
+
+    async def collection_version(self, collection: CollectionName) -> int:
+        """Return a version of ``collection`` that grows with every change to it."""
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Notify ``listener`` of every change made through this repository."""
+
+
+@runtime_checkable
+class ResultSink(Protocol):
+    """Destination for job execution results, e.g. :class:`~app.db.results.ResultWriter`."""
+
+    async def record_result(
+        self, job_id: str, *, succeeded: bool, content: str | None, at: float | None = None
+    ) -> None: ...
@@ -1,17 +1,54 @@
 from time import perf_counter
 
 from app.core.metrics import RUN_DURATION_SECONDS
-from app.services.repositories import InMemoryRepository
+from app.services.events import MONITOR_CHANGED, EventHub
+from app.services.interfaces import Repository
+from app.services.repositories import MonitorRecord
+from app.services.snapshots import snapshot_digest
 
 
 class MonitorService:
-    def __init__(self, repository: InMemoryRepository) -> None:
+    def __init__(self, repository: Repository, events: EventHub | None = None) -> None:
         self.repository = repository
+        self.events = events
 
     async def ingest_snapshot(self, monitor_id: str, snapshot: str) -> bool:
+        monitor = await self.ingest_digest(monitor_id, snapshot_digest(snapshot))
+        return monitor is not None and monitor.changed
+
+    async def ingest_digest(self, monitor_id: str, digest: bytes) -> MonitorRecord | None:
+        """Record a snapshot by its SHA-256 ``digest``, e.g. from a streamed body.
+
+        Returns the updated monitor, or ``None`` when it does not exist.
+        """
+
         start = perf_counter()
-        monitor = await self.repository.set_monitor_snapshot(monitor_id, snapshot)
+        monitor = await self.repository.set_monitor_digest(monitor_id, digest)
         RUN_DURATION_SECONDS.labels(operation="monitor_ingest", status="success").observe(perf_counter() - start)
-        if monitor is None:
-            return False
-        return monitor.changed
+        if monitor is not None:
+            self._publish_change(monitor)
+        return monitor
+
+    async def ingest_digests(self, digests: list[tuple[str, bytes]]) -> list[MonitorRecord | None]:
+        """Record a group of ``(monitor_id, digest)`` pairs with one repository call."""
+
+        start = perf_counter()
+        monitors = await self.repository.set_monitor_digests(digests)
+        RUN_DURATION_SECONDS.labels(operation="monitor_ingest_batch", status="success").observe(
+            perf_counter() - start
+        )
+        for monitor in monitors:
+            if monitor is not None:
+                self._publish_change(monitor)
+        return monitors
+
+    def _publish_change(self, monitor: MonitorRecord) -> None:
+        if monitor.changed and self.events is not None:
+            self.events.publish(
+                MONITOR_CHANGED,
+                {
+                    "monitor_id": monitor.id,
+                    "source_url": monitor.source_url,
+                    "snapshot_hash": monitor.last_snapshot_hash,
+                },
+            )
@@ -1,46 +1,283 @@
 import asyncio
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from hashlib import sha256
-from typing import Any
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, replace
+from time import time, time_ns
+from typing import Any, Generic, Literal, TypeVar
+from urllib.parse import urlsplit, urlunsplit
 from uuid import uuid4
 
 from app.core.metrics import JOB_COUNT, MONITOR_COUNT, TASK_COUNT
+from app.services.snapshots import snapshot_digest
 
+_DEFAULT_PORTS = {"http": 80, "https": 443}
 
-def utcnow() -> datetime:
-    return datetime.now(timezone.utc)
 
+class MonitorUrlConflict(ValueError):
+    """Another monitor already watches the same normalized ``source_url``."""
 
-@dataclass
+
+def normalize_source_url(source_url: str) -> str:
+    """Return the canonical form of ``source_url`` used for URL-level dedup.
+
+    Scheme and host are lower-cased, default ports and fragments are dropped and an
+    empty path becomes ``/``. Path and query are kept verbatim.
+    """
+
+    parts = urlsplit(source_url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, _DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+    if parts.username or parts.password:
+        credentials = parts.username or ""
+        if parts.password:
+            credentials = f"{credentials}:{parts.password}"
+        netloc = f"{credentials}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+# Records are slotted and keep timestamps as epoch seconds and snapshot hashes as raw
+# SHA-256 digests; they are converted to datetimes/hex strings only by the API schemas.
+# ``version`` starts at 1 and grows by one with every change to the record.
+
+
+@dataclass(slots=True)
 class TaskRecord:
     id: str
     name: str
     payload: dict[str, Any]
-    created_at: datetime
-    updated_at: datetime
+    created_at: float
+    updated_at: float
+    version: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class JobRecord:
     id: str
     task_id: str
     schedule_every_seconds: int
     enabled: bool
-    last_run_at: datetime | None
-    created_at: datetime
-    updated_at: datetime
+    last_run_at: float | None
+    created_at: float
+    updated_at: float
+    version: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
+class ResultRecord:
+    id: str
+    job_id: str
+    status: str
+    content: str | None
+    created_at: float
+
+
+# Latest results kept per job by the in-memory repository.
+MEMORY_RESULTS_PER_JOB = 100
+
+
+@dataclass(slots=True)
 class MonitorRecord:
     id: str
     name: str
     source_url: str
-    last_snapshot_hash: str | None = None
+    last_snapshot_digest: bytes | None = None
     changed: bool = False
-    created_at: datetime = field(default_factory=utcnow)
-    updated_at: datetime = field(default_factory=utcnow)
+    created_at: float = field(default_factory=time)
+    updated_at: float = field(default_factory=time)
+    version: int = 1
+
+    @property
+    def last_snapshot_hash(self) -> str | None:
+        """Hex form of :attr:`last_snapshot_digest`."""
+
+        return self.last_snapshot_digest.hex() if self.last_snapshot_digest is not None else None
+
+
+@dataclass(slots=True)
+class DashboardSummary:
+    """Entity counters plus the most recently created jobs, newest first."""
+
+    tasks: int
+    jobs: int
+    monitors: int
+    changed_monitors: int
+    failing_jobs: int
+    recent_jobs: list[JobRecord]
+
+
+# Collections with a version that grows with every create, update or delete in them.
+CollectionName = Literal["tasks", "jobs", "monitors"]
+# Notified of a change to a collection with the ids of the changed records; no ids
+# means any record of the collection may have changed (cascades, resets).
+ChangeListener = Callable[[CollectionName, tuple[str, ...]], None]
+
+PageKey = tuple[float, str]
+RecordT = TypeVar("RecordT", TaskRecord, JobRecord, MonitorRecord)
+
+
+@dataclass(slots=True)
+class Page(Generic[RecordT]):
+    """One keyset page; ``next_key`` is ``None`` once the walk is exhausted."""
+
+    items: list[RecordT]
+    next_key: PageKey | None = None
+
+
+class OrderedIndex:
+    """Sorted set of ``(timestamp, id)`` keys supporting ``O(log n)`` keyset seeks.
+
+    Keys live in sorted blocks of at most ``2 * block_size`` keys, found by bisecting
+    the list of block maxima, so an insert or delete shifts the keys of one block
+    rather than of the whole index: ``O(log n + block_size)`` plus an occasional
+    ``O(n / block_size)`` split or removal of a block.
+    """
+
+    __slots__ = ("_block_size", "_blocks", "_len", "_maxes")
+
+    def __init__(self, *, block_size: int = 512) -> None:
+        self._blocks: list[list[PageKey]] = []
+        self._maxes: list[PageKey] = []
+        self._len = 0
+        self._block_size = block_size
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key: PageKey) -> None:
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return
+        position = min(bisect_left(self._maxes, key), len(self._blocks) - 1)
+        block = self._blocks[position]
+        index = bisect_left(block, key)
+        if index < len(block) and block[index] == key:
+            return
+        block.insert(index, key)
+        self._maxes[position] = block[-1]
+        self._len += 1
+        if len(block) > 2 * self._block_size:
+            self._blocks.insert(position + 1, block[self._block_size :])
+            del block[self._block_size :]
+            self._maxes.insert(position, block[-1])
+
+    def discard(self, key: PageKey) -> None:
+        position = bisect_left(self._maxes, key)
+        if position == len(self._blocks):
+            return
+        block = self._blocks[position]
+        index = bisect_left(block, key)
+        if block[index] != key:
+            return
+        del block[index]
+        self._len -= 1
+        if block:
+            self._maxes[position] = block[-1]
+        else:
+            del self._blocks[position]
+            del self._maxes[position]
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._maxes.clear()
+        self._len = 0
+
+    def latest(self, count: int) -> list[PageKey]:
+        """Return the ``count`` greatest keys, greatest first."""
+
+        keys: list[PageKey] = []
+        for block in reversed(self._blocks):
+            if len(keys) >= count:
+                break
+            keys.extend(block[: -count + len(keys) - 1 : -1])
+        return keys
+
+    def iter_from(self, start: PageKey | None, *, inclusive: bool) -> Iterator[PageKey]:
+        """Yield keys from ``start`` onwards; must be consumed without awaiting."""
+
+        seek = bisect_left if inclusive else bisect_right
+        position = 0 if start is None else seek(self._maxes, start)
+        for block_position in range(position, len(self._blocks)):
+            block = self._blocks[block_position]
+            index = 0 if start is None or block_position > position else seek(block, start)
+            yield from block[index:]
+
+
+def _created_key(record: TaskRecord | JobRecord | MonitorRecord) -> PageKey:
+    return (record.created_at, record.id)
+
+
+def _updated_key(record: TaskRecord | JobRecord | MonitorRecord) -> PageKey:
+    return (record.updated_at, record.id)
+
+
+def _page(
+    records: dict[str, RecordT],
+    index: OrderedIndex,
+    *,
+    after: PageKey | None,
+    limit: int,
+    floor: PageKey | None = None,
+    predicate: Callable[[RecordT], bool] | None = None,
+) -> Page[RecordT]:
+    """Walk ``index`` after ``after`` (or from ``floor``) and collect up to ``limit`` records.
+
+    Without a ``predicate`` a page touches exactly ``limit + 1`` keys; with one, keys that do
+    not match are skipped while walking.
+    """
+
+    if after is not None and (floor is None or after >= floor):
+        keys = index.iter_from(after, inclusive=False)
+    else:
+        keys = index.iter_from(floor, inclusive=True)
+
+    items: list[RecordT] = []
+    last_key: PageKey | None = None
+    for key in keys:
+        record = records[key[1]]
+        if predicate is not None and not predicate(record):
+            continue
+        if len(items) == limit:
+            return Page(items, next_key=last_key)
+        items.append(record)
+        last_key = key
+    return Page(items)
+
+
+BatchOp = Literal["create", "update", "delete"]
+BatchOutcome = Literal["created", "updated", "deleted", "not_found", "conflict"]
+
+
+@dataclass(slots=True)
+class BatchOperation:
+    """One already-validated bulk mutation; ``fields`` are the create/update arguments."""
+
+    op: BatchOp
+    id: str | None = None
+    fields: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class BatchResult(Generic[RecordT]):
+    outcome: BatchOutcome
+    record: RecordT | None = None
+
+    @property
+    def applied(self) -> bool:
+        return self.outcome in ("created", "updated", "deleted")
+
+
+def _applied_ids(results: list[BatchResult[Any]]) -> tuple[str, ...]:
+    return tuple(result.record.id for result in results if result.applied and result.record)
 
 
 class InMemoryRepository:
@@ -48,6 +285,26 @@ class InMemoryRepository:
         self._tasks: dict[str, TaskRecord] = {}
         self._jobs: dict[str, JobRecord] = {}
         self._monitors: dict[str, MonitorRecord] = {}
+        # Secondary indexes, maintained under ``_lock`` by every mutation.
+        self._jobs_by_task: dict[str, dict[str, JobRecord]] = {}
+        self._monitors_by_url: dict[str, dict[str, MonitorRecord]] = {}
+        self._results_by_job: dict[str, deque[ResultRecord]] = {}
+        # Jobs whose latest run failed.
+        self._failing_jobs: set[str] = set()
+        # Keyset pagination indexes: creation order, update order and filtered subsets.
+        self._task_order = OrderedIndex()
+        self._task_updates = OrderedIndex()
+        self._job_order = OrderedIndex()
+        self._job_updates = OrderedIndex()
+        self._jobs_by_enabled = {True: OrderedIndex(), False: OrderedIndex()}
+        self._monitor_order = OrderedIndex()
+        self._monitor_updates = OrderedIndex()
+        self._monitors_by_changed = {True: OrderedIndex(), False: OrderedIndex()}
+        # Collection versions start at the wall clock (microseconds) so they keep growing
+        # across restarts of a process that lost all data, and survive :meth:`reset`.
+        start = time_ns() // 1000
+        self._versions: dict[CollectionName, int] = dict.fromkeys(("tasks", "jobs", "monitors"), start)
+        self._listeners: list[ChangeListener] = []
         self._lock = asyncio.Lock()
 
     async def reset(self) -> None:
@@ -55,21 +312,55 @@ class InMemoryRepository:
             self._tasks.clear()
             self._jobs.clear()
             self._monitors.clear()
+            self._jobs_by_task.clear()
+            self._monitors_by_url.clear()
+            self._results_by_job.clear()
+            self._failing_jobs.clear()
+            for index in (
+                self._task_order,
+                self._task_updates,
+                self._job_order,
+                self._job_updates,
+                self._monitor_order,
+                self._monitor_updates,
+                *self._jobs_by_enabled.values(),
+                *self._monitors_by_changed.values(),
+            ):
+                index.clear()
+            self._bump("tasks", cascade=("jobs", "monitors"))
             TASK_COUNT.set(0)
             JOB_COUNT.set(0)
             MONITOR_COUNT.set(0)
 
     async def create_task(self, name: str, payload: dict[str, Any]) -> TaskRecord:
         async with self._lock:
-            now = utcnow()
-            record = TaskRecord(str(uuid4()), name, payload, now, now)
-            self._tasks[record.id] = record
+            record = self._insert_task(name, payload)
+            self._bump("tasks", record.id)
             TASK_COUNT.set(len(self._tasks))
             return record
 
     async def list_tasks(self) -> list[TaskRecord]:
         return list(self._tasks.values())
 
+    async def page_tasks(
+        self,
+        *,
+        after: PageKey | None = None,
+        limit: int,
+        updated_since: float | None = None,
+    ) -> Page[TaskRecord]:
+        """Return a keyset page of tasks.
+
+        Pages are ordered by ``(created_at, id)``, or by ``(updated_at, id)`` when
+        ``updated_since`` is given so the walk can seek straight to the first match.
+        """
+
+        if updated_since is not None:
+            return _page(
+                self._tasks, self._task_updates, after=after, limit=limit, floor=(updated_since, "")
+            )
+        return _page(self._tasks, self._task_order, after=after, limit=limit)
+
     async def get_task(self, task_id: str) -> TaskRecord | None:
         return self._tasks.get(task_id)
 
@@ -78,38 +369,87 @@ class InMemoryRepository:
             task = self._tasks.get(task_id)
             if not task:
                 return None
-            if "name" in updates and updates["name"] is not None:
-                task.name = updates["name"]
-            if "payload" in updates and updates["payload"] is not None:
-                task.payload = updates["payload"]
-            task.updated_at = utcnow()
+            self._apply_task_update(task, updates)
+            self._bump("tasks", task_id)
             return task
 
     async def delete_task(self, task_id: str) -> bool:
+        """Delete a task and cascade the delete to all of its jobs."""
+
         async with self._lock:
-            deleted = self._tasks.pop(task_id, None) is not None
+            deleted = self._remove_task(task_id)
+            if deleted:
+                self._bump("tasks", task_id, cascade=("jobs",))
             TASK_COUNT.set(len(self._tasks))
+            JOB_COUNT.set(len(self._jobs))
             return deleted
 
+    async def apply_task_batch(self, operations: list[BatchOperation]) -> list[BatchResult[TaskRecord]]:
+        """Apply ``operations`` in order under a single lock acquisition."""
+
+        results: list[BatchResult[TaskRecord]] = []
+        async with self._lock:
+            for operation in operations:
+                if operation.op == "create":
+                    results.append(BatchResult("created", self._insert_task(**operation.fields)))
+                    continue
+                task = self._tasks.get(operation.id or "")
+                if task is None:
+                    results.append(BatchResult("not_found"))
+                elif operation.op == "update":
+                    self._apply_task_update(task, operation.fields)
+                    results.append(BatchResult("updated", task))
+                else:
+                    self._remove_task(task.id)
+                    results.append(BatchResult("deleted", task))
+            if changed := _applied_ids(results):
+                deletes = any(result.outcome == "deleted" for result in results)
+                self._bump("tasks", *changed, cascade=("jobs",) if deletes else ())
+            TASK_COUNT.set(len(self._tasks))
+            JOB_COUNT.set(len(self._jobs))
+        return results
+
     async def create_job(self, task_id: str, schedule_every_seconds: int, enabled: bool) -> JobRecord:
         async with self._lock:
-            now = utcnow()
-            record = JobRecord(
-                id=str(uuid4()),
-                task_id=task_id,
-                schedule_every_seconds=schedule_every_seconds,
-                enabled=enabled,
-                last_run_at=None,
-                created_at=now,
-                updated_at=now,
-            )
-            self._jobs[record.id] = record
+            record = self._insert_job(task_id, schedule_every_seconds, enabled)
+            self._bump("jobs", record.id)
             JOB_COUNT.set(len(self._jobs))
             return record
 
     async def list_jobs(self) -> list[JobRecord]:
         return list(self._jobs.values())
 
+    async def page_jobs(
+        self,
+        *,
+        after: PageKey | None = None,
+        limit: int,
+        enabled: bool | None = None,
+        updated_since: float | None = None,
+    ) -> Page[JobRecord]:
+        """Return a keyset page of jobs, optionally filtered by ``enabled``.
+
+        See :meth:`page_tasks` for ordering. The ``enabled`` filter is served from its own
+        index unless combined with ``updated_since``, in which case it is applied while walking.
+        """
+
+        if updated_since is not None:
+            return _page(
+                self._jobs,
+                self._job_updates,
+                after=after,
+                limit=limit,
+                floor=(updated_since, ""),
+                predicate=None if enabled is None else (lambda job: job.enabled is enabled),
+            )
+        index = self._job_order if enabled is None else self._jobs_by_enabled[enabled]
+        return _page(self._jobs, index, after=after, limit=limit)
+
+    async def list_jobs_for_task(self, task_id: str) -> list[JobRecord]:
+        """Return the jobs of ``task_id`` via the task index, without a full scan."""
+
+        return list(self._jobs_by_task.get(task_id, {}).values())
+
     async def get_job(self, job_id: str) -> JobRecord | None:
         return self._jobs.get(job_id)
 
@@ -118,40 +458,156 @@ class InMemoryRepository:
             job = self._jobs.get(job_id)
             if not job:
                 return None
-            if "schedule_every_seconds" in updates and updates["schedule_every_seconds"] is not None:
-                job.schedule_every_seconds = updates["schedule_every_seconds"]
-            if "enabled" in updates and updates["enabled"] is not None:
-                job.enabled = updates["enabled"]
-            job.updated_at = utcnow()
+            self._apply_job_update(job, updates)
+            self._bump("jobs", job_id)
             return job
 
     async def delete_job(self, job_id: str) -> bool:
         async with self._lock:
-            deleted = self._jobs.pop(job_id, None) is not None
+            job = self._jobs.pop(job_id, None)
+            if job is not None:
+                self._unindex_job(job)
+                self._bump("jobs", job_id)
             JOB_COUNT.set(len(self._jobs))
-            return deleted
+            return job is not None
+
+    async def apply_job_batch(self, operations: list[BatchOperation]) -> list[BatchResult[JobRecord]]:
+        """Apply ``operations`` in order under a single lock acquisition.
+
+        Creates referencing an unknown ``task_id`` yield ``not_found``.
+        """
+
+        results: list[BatchResult[JobRecord]] = []
+        async with self._lock:
+            for operation in operations:
+                if operation.op == "create":
+                    if operation.fields["task_id"] not in self._tasks:
+                        results.append(BatchResult("not_found"))
+                    else:
+                        results.append(BatchResult("created", self._insert_job(**operation.fields)))
+                    continue
+                job = self._jobs.get(operation.id or "")
+                if job is None:
+                    results.append(BatchResult("not_found"))
+                elif operation.op == "update":
+                    self._apply_job_update(job, operation.fields)
+                    results.append(BatchResult("updated", job))
+                else:
+                    del self._jobs[job.id]
+                    self._unindex_job(job)
+                    results.append(BatchResult("deleted", job))
+            if changed := _applied_ids(results):
+                self._bump("jobs", *changed)
+            JOB_COUNT.set(len(self._jobs))
+        return results
 
     async def mark_job_run(self, job_id: str) -> JobRecord | None:
         async with self._lock:
             job = self._jobs.get(job_id)
             if not job:
                 return None
-            now = utcnow()
+            now = time()
             job.last_run_at = now
-            job.updated_at = now
+            self._failing_jobs.discard(job_id)
+            self._touch(job, self._job_updates, now)
+            self._bump("jobs", job_id)
+            return job
+
+    async def mark_job_failed(self, job_id: str) -> JobRecord | None:
+        async with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            self._failing_jobs.add(job_id)
             return job
 
+    async def record_result(
+        self, job_id: str, *, succeeded: bool, content: str | None, at: float | None = None
+    ) -> None:
+        async with self._lock:
+            if job_id not in self._jobs:
+                return
+            results = self._results_by_job.get(job_id)
+            if results is None:
+                results = self._results_by_job[job_id] = deque(maxlen=MEMORY_RESULTS_PER_JOB)
+            results.append(
+                ResultRecord(
+                    id=str(uuid4()),
+                    job_id=job_id,
+                    status="processed" if succeeded else "error",
+                    content=content,
+                    created_at=time() if at is None else at,
+                )
+            )
+
+    async def get_job_with_results(
+        self, job_id: str, limit: int
+    ) -> tuple[JobRecord, list[ResultRecord]] | None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        results = self._results_by_job.get(job_id, ())
+        return job, list(reversed(results))[:limit]
+
+    async def summary(self, recent_jobs: int) -> DashboardSummary:
+        """Return the dashboard counters in ``O(1)`` plus the ``recent_jobs`` newest jobs."""
+
+        return DashboardSummary(
+            tasks=len(self._tasks),
+            jobs=len(self._jobs),
+            monitors=len(self._monitors),
+            changed_monitors=len(self._monitors_by_changed[True]),
+            failing_jobs=len(self._failing_jobs),
+            recent_jobs=[self._jobs[job_id] for _, job_id in self._job_order.latest(recent_jobs)],
+        )
+
     async def create_monitor(self, name: str, source_url: str) -> MonitorRecord:
         async with self._lock:
-            now = utcnow()
-            record = MonitorRecord(id=str(uuid4()), name=name, source_url=source_url, created_at=now, updated_at=now)
-            self._monitors[record.id] = record
+            if self._find_monitor_by_url(source_url) is not None:
+                raise MonitorUrlConflict(source_url)
+            record = self._insert_monitor(name, source_url)
+            self._bump("monitors", record.id)
             MONITOR_COUNT.set(len(self._monitors))
             return record
 
     async def list_monitors(self) -> list[MonitorRecord]:
         return list(self._monitors.values())
 
+    async def page_monitors(
+        self,
+        *,
+        after: PageKey | None = None,
+        limit: int,
+        changed: bool | None = None,
+        updated_since: float | None = None,
+    ) -> Page[MonitorRecord]:
+        """Return a keyset page of monitors, optionally filtered by ``changed``.
+
+        Ordering and filter/index interplay follow :meth:`page_jobs`.
+        """
+
+        if updated_since is not None:
+            return _page(
+                self._monitors,
+                self._monitor_updates,
+                after=after,
+                limit=limit,
+                floor=(updated_since, ""),
+                predicate=None if changed is None else (lambda monitor: monitor.changed is changed),
+            )
+        index = self._monitor_order if changed is None else self._monitors_by_changed[changed]
+        return _page(self._monitors, index, after=after, limit=limit)
+
+    async def list_monitors_for_url(self, source_url: str) -> list[MonitorRecord]:
+        """Return monitors whose normalized ``source_url`` matches ``source_url``."""
+
+        return list(self._monitors_by_url.get(normalize_source_url(source_url), {}).values())
+
+    async def find_monitor_by_url(self, source_url: str) -> MonitorRecord | None:
+        """Return the first monitor watching ``source_url``, used for URL-level dedup."""
+
+        return self._find_monitor_by_url(source_url)
+
     async def get_monitor(self, monitor_id: str) -> MonitorRecord | None:
         return self._monitors.get(monitor_id)
 
@@ -160,26 +616,239 @@ class InMemoryRepository:
             monitor = self._monitors.get(monitor_id)
             if not monitor:
                 return None
-            if "name" in updates and updates["name"] is not None:
-                monitor.name = updates["name"]
-            if "source_url" in updates and updates["source_url"] is not None:
-                monitor.source_url = updates["source_url"]
-            monitor.updated_at = utcnow()
+            if updates.get("source_url") is not None:
+                existing = self._find_monitor_by_url(updates["source_url"])
+                if existing is not None and existing.id != monitor_id:
+                    raise MonitorUrlConflict(updates["source_url"])
+            self._apply_monitor_update(monitor, updates)
+            self._bump("monitors", monitor_id)
             return monitor
 
     async def set_monitor_snapshot(self, monitor_id: str, snapshot: str) -> MonitorRecord | None:
+        return await self.set_monitor_digest(monitor_id, snapshot_digest(snapshot))
+
+    async def set_monitor_digest(self, monitor_id: str, digest: bytes) -> MonitorRecord | None:
+        """Store a snapshot hashed by the caller; only the comparison runs under the lock."""
+
+        return (await self.set_monitor_digests([(monitor_id, digest)]))[0]
+
+    async def set_monitor_digests(
+        self, digests: list[tuple[str, bytes]]
+    ) -> list[MonitorRecord | None]:
+        """Apply ``(monitor_id, digest)`` pairs in order under a single lock acquisition.
+
+        Each result is a copy of the monitor as that pair left it (``None`` when unknown),
+        so repeated monitors in one group report their own ``changed`` flag.
+        """
+
+        records: list[MonitorRecord | None] = []
         async with self._lock:
-            monitor = self._monitors.get(monitor_id)
-            if not monitor:
-                return None
-            digest = sha256(snapshot.encode("utf-8")).hexdigest()
-            monitor.changed = monitor.last_snapshot_hash not in (None, digest)
-            monitor.last_snapshot_hash = digest
-            monitor.updated_at = utcnow()
-            return monitor
+            now = time()
+            for monitor_id, digest in digests:
+                monitor = self._monitors.get(monitor_id)
+                if not monitor:
+                    records.append(None)
+                    continue
+                changed = monitor.last_snapshot_digest not in (None, digest)
+                if changed is not monitor.changed:
+                    self._monitors_by_changed[monitor.changed].discard(_created_key(monitor))
+                    monitor.changed = changed
+                    self._monitors_by_changed[changed].add(_created_key(monitor))
+                monitor.last_snapshot_digest = digest
+                self._touch(monitor, self._monitor_updates, now)
+                records.append(replace(monitor))
+            if changed_ids := tuple({record.id: None for record in records if record}):
+                self._bump("monitors", *changed_ids)
+        return records
 
     async def delete_monitor(self, monitor_id: str) -> bool:
         async with self._lock:
-            deleted = self._monitors.pop(monitor_id, None) is not None
+            monitor = self._monitors.pop(monitor_id, None)
+            if monitor is not None:
+                self._unindex_monitor(monitor)
+                self._bump("monitors", monitor_id)
             MONITOR_COUNT.set(len(self._monitors))
-            return deleted
+            return monitor is not None
+
+    async def apply_monitor_batch(
+        self, operations: list[BatchOperation]
+    ) -> list[BatchResult[MonitorRecord]]:
+        """Apply ``operations`` in order under a single lock acquisition.
+
+        A create or ``source_url`` update that collides with another monitor's normalized URL
+        (including one created earlier in the same batch) yields ``conflict``.
+        """
+
+        results: list[BatchResult[MonitorRecord]] = []
+        async with self._lock:
+            for operation in operations:
+                source_url = operation.fields.get("source_url")
+                if operation.op == "create":
+                    if self._find_monitor_by_url(source_url) is not None:
+                        results.append(BatchResult("conflict"))
+                    else:
+                        results.append(BatchResult("created", self._insert_monitor(**operation.fields)))
+                    continue
+                monitor = self._monitors.get(operation.id or "")
+                if monitor is None:
+                    results.append(BatchResult("not_found"))
+                elif operation.op == "update":
+                    existing = self._find_monitor_by_url(source_url) if source_url else None
+                    if existing is not None and existing.id != monitor.id:
+                        results.append(BatchResult("conflict", monitor))
+                        continue
+                    self._apply_monitor_update(monitor, operation.fields)
+                    results.append(BatchResult("updated", monitor))
+                else:
+                    del self._monitors[monitor.id]
+                    self._unindex_monitor(monitor)
+                    results.append(BatchResult("deleted", monitor))
+            if changed := _applied_ids(results):
+                self._bump("monitors", *changed)
+            MONITOR_COUNT.set(len(self._monitors))
+        return results
+
+    async def collection_version(self, collection: CollectionName) -> int:
+        """Return the version of ``collection``; it grows with every change to it."""
+
+        return self._versions[collection]
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Call ``listener`` after every change, with the collection and changed record ids."""
+
+        self._listeners.append(listener)
+
+    # Lock-free mutation helpers; callers hold ``_lock`` and refresh the gauges.
+
+    def _bump(
+        self, collection: CollectionName, *ids: str, cascade: tuple[CollectionName, ...] = ()
+    ) -> None:
+        """Version ``collection`` (records ``ids``) and the ``cascade`` collections it reached."""
+
+        self._versions[collection] += 1
+        for listener in self._listeners:
+            listener(collection, ids)
+        for dependent in cascade:
+            self._versions[dependent] += 1
+            for listener in self._listeners:
+                listener(dependent, ())
+
+    def _insert_task(self, name: str, payload: dict[str, Any]) -> TaskRecord:
+        now = time()
+        record = TaskRecord(str(uuid4()), name, payload, now, now)
+        self._tasks[record.id] = record
+        self._task_order.add(_created_key(record))
+        self._task_updates.add(_updated_key(record))
+        return record
+
+    def _apply_task_update(self, task: TaskRecord, updates: dict[str, Any]) -> None:
+        if "name" in updates and updates["name"] is not None:
+            task.name = updates["name"]
+        if "payload" in updates and updates["payload"] is not None:
+            task.payload = updates["payload"]
+        self._touch(task, self._task_updates, time())
+
+    def _remove_task(self, task_id: str) -> bool:
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            self._task_order.discard(_created_key(task))
+            self._task_updates.discard(_updated_key(task))
+        for job in list(self._jobs_by_task.get(task_id, {}).values()):
+            del self._jobs[job.id]
+            self._unindex_job(job)
+        return task is not None
+
+    def _insert_job(self, task_id: str, schedule_every_seconds: int, enabled: bool) -> JobRecord:
+        now = time()
+        record = JobRecord(
+            id=str(uuid4()),
+            task_id=task_id,
+            schedule_every_seconds=schedule_every_seconds,
+            enabled=enabled,
+            last_run_at=None,
+            created_at=now,
+            updated_at=now,
+        )
+        self._jobs[record.id] = record
+        self._index_job(record)
+        return record
+
+    def _apply_job_update(self, job: JobRecord, updates: dict[str, Any]) -> None:
+        if "schedule_every_seconds" in updates and updates["schedule_every_seconds"] is not None:
+            job.schedule_every_seconds = updates["schedule_every_seconds"]
+        if "enabled" in updates and updates["enabled"] is not None:
+            self._jobs_by_enabled[job.enabled].discard(_created_key(job))
+            job.enabled = updates["enabled"]
+            self._jobs_by_enabled[job.enabled].add(_created_key(job))
+        self._touch(job, self._job_updates, time())
+
+    def _insert_monitor(self, name: str, source_url: str) -> MonitorRecord:
+        now = time()
+        record = MonitorRecord(id=str(uuid4()), name=name, source_url=source_url, created_at=now, updated_at=now)
+        self._monitors[record.id] = record
+        self._index_monitor(record)
+        return record
+
+    def _apply_monitor_update(self, monitor: MonitorRecord, updates: dict[str, Any]) -> None:
+        if "name" in updates and updates["name"] is not None:
+            monitor.name = updates["name"]
+        if "source_url" in updates and updates["source_url"] is not None:
+            self._unindex_monitor_url(monitor)
+            monitor.source_url = updates["source_url"]
+            self._index_monitor_url(monitor)
+        self._touch(monitor, self._monitor_updates, time())
+
+    def _find_monitor_by_url(self, source_url: str) -> MonitorRecord | None:
+        matches = self._monitors_by_url.get(normalize_source_url(source_url))
+        return next(iter(matches.values())) if matches else None
+
+    @staticmethod
+    def _touch(record: TaskRecord | JobRecord | MonitorRecord, updates: OrderedIndex, now: float) -> None:
+        updates.discard(_updated_key(record))
+        record.updated_at = now
+        record.version += 1
+        updates.add(_updated_key(record))
+
+    def _index_job(self, job: JobRecord) -> None:
+        self._jobs_by_task.setdefault(job.task_id, {})[job.id] = job
+        self._job_order.add(_created_key(job))
+        self._job_updates.add(_updated_key(job))
+        self._jobs_by_enabled[job.enabled].add(_created_key(job))
+
+    def _unindex_job(self, job: JobRecord) -> None:
+        self._results_by_job.pop(job.id, None)
+        self._failing_jobs.discard(job.id)
+        self._job_order.discard(_created_key(job))
+        self._job_updates.discard(_updated_key(job))
+        self._jobs_by_enabled[job.enabled].discard(_created_key(job))
+        siblings = self._jobs_by_task.get(job.task_id)
+        if siblings is None:
+            return
+        siblings.pop(job.id, None)
+        if not siblings:
+            del self._jobs_by_task[job.task_id]
+
+    def _index_monitor(self, monitor: MonitorRecord) -> None:
+        self._monitor_order.add(_created_key(monitor))
+        self._monitor_updates.add(_updated_key(monitor))
+        self._monitors_by_changed[monitor.changed].add(_created_key(monitor))
+        self._index_monitor_url(monitor)
+
+    def _unindex_monitor(self, monitor: MonitorRecord) -> None:
+        self._monitor_order.discard(_created_key(monitor))
+        self._monitor_updates.discard(_updated_key(monitor))
+        self._monitors_by_changed[monitor.changed].discard(_created_key(monitor))
+        self._unindex_monitor_url(monitor)
+
+    def _index_monitor_url(self, monitor: MonitorRecord) -> None:
+        key = normalize_source_url(monitor.source_url)
+        self._monitors_by_url.setdefault(key, {})[monitor.id] = monitor
+
+    def _unindex_monitor_url(self, monitor: MonitorRecord) -> None:
+        key = normalize_source_url(monitor.source_url)
+        siblings = self._monitors_by_url.get(key)
+        if siblings is None:
+            return
+        siblings.pop(monitor.id, None)
+        if not siblings:
+            del self._monitors_by_url[key]
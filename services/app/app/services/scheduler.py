@@ -1,25 +1,33 @@
-from datetime import datetime, timezone
-from time import perf_counter
+from time import perf_counter, time
 
 from app.core.metrics import FAILURE_COUNTER, RUN_DURATION_SECONDS
+from app.services.events import JOB_FAILED, JOB_SUCCEEDED, EventHub
 from app.services.executor import JobExecutor
-from app.services.repositories import InMemoryRepository
+from app.services.interfaces import Repository, ResultSink
 
 
 class Scheduler:
-    def __init__(self, repository: InMemoryRepository, executor: JobExecutor) -> None:
+    def __init__(
+        self,
+        repository: Repository,
+        executor: JobExecutor,
+        results: ResultSink | None = None,
+        events: EventHub | None = None,
+    ) -> None:
         self.repository = repository
         self.executor = executor
+        self.results = results
+        self.events = events
 
     async def run_once(self) -> dict[str, int]:
         start = perf_counter()
         success = 0
         failures = 0
-        now = datetime.now(timezone.utc)
+        now = time()
         for job in await self.repository.list_jobs():
             if not job.enabled:
                 continue
-            due = job.last_run_at is None or (now - job.last_run_at).total_seconds() >= job.schedule_every_seconds
+            due = job.last_run_at is None or now - job.last_run_at >= job.schedule_every_seconds
             if not due:
                 continue
             task = await self.repository.get_task(job.task_id)
@@ -28,12 +36,24 @@ class Scheduler:
                 FAILURE_COUNTER.labels(operation="scheduler_missing_task").inc()
                 continue
             try:
-                await self.executor.execute(task)
+                output = await self.executor.execute(task)
                 await self.repository.mark_job_run(job.id)
                 success += 1
-            except Exception:
+            except Exception as exc:
                 failures += 1
                 FAILURE_COUNTER.labels(operation="scheduler_execution").inc()
+                await self.repository.mark_job_failed(job.id)
+                if self.results is not None:
+                    await self.results.record_result(job.id, succeeded=False, content=str(exc))
+                if self.events is not None:
+                    self.events.publish(
+                        JOB_FAILED, {"job_id": job.id, "task_id": job.task_id, "error": str(exc)}
+                    )
+                continue
+            if self.results is not None:
+                await self.results.record_result(job.id, succeeded=True, content=output)
+            if self.events is not None:
+                self.events.publish(JOB_SUCCEEDED, {"job_id": job.id, "task_id": job.task_id})
         status = "success" if failures == 0 else "failure"
         RUN_DURATION_SECONDS.labels(operation="scheduler_run", status=status).observe(perf_counter() - start)
         return {"success": success, "failures": failures}
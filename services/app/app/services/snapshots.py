@@ -0,0 +1,79 @@
+"""Incremental SHA-256 digests of monitor snapshots, decoding gzip as the body streams.
+
+A snapshot's identity is the SHA-256 of its UTF-8 bytes, whichever way it arrives:
+:func:`snapshot_digest` hashes an in-memory string, :class:`SnapshotHasher` hashes a
+raw or gzip-encoded body chunk by chunk without ever holding the whole snapshot.
+Repositories only compare and store the finished digest.
+"""
+
+from __future__ import annotations
+
+import zlib
+from hashlib import sha256
+
+SUPPORTED_ENCODINGS = frozenset({"identity", "gzip", "x-gzip"})
+
+# zlib window bits selecting the gzip container.
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+# Upper bound on the decompressed bytes produced per call, so a small, highly
+# compressed chunk cannot expand into a huge buffer before the size check runs.
+_INFLATE_STEP = 1 << 20
+
+
+class SnapshotTooLarge(ValueError):
+    """The decoded snapshot exceeds the configured size limit."""
+
+
+class SnapshotDecodeError(ValueError):
+    """The body is not valid for its declared content encoding."""
+
+
+def snapshot_digest(snapshot: str) -> bytes:
+    return sha256(snapshot.encode("utf-8")).digest()
+
+
+class SnapshotHasher:
+    """Feed body chunks to :meth:`update`, then read the digest with :meth:`digest`.
+
+    ``content_encoding`` is an HTTP ``Content-Encoding`` from :data:`SUPPORTED_ENCODINGS`;
+    gzip bodies (including concatenated members) are inflated incrementally and the
+    decoded bytes are hashed. More than ``max_bytes`` decoded bytes raise
+    :class:`SnapshotTooLarge`.
+    """
+
+    def __init__(self, *, content_encoding: str = "identity", max_bytes: int) -> None:
+        if content_encoding not in SUPPORTED_ENCODINGS:
+            raise SnapshotDecodeError(f"unsupported content encoding {content_encoding!r}")
+        self._hash = sha256()
+        self._max_bytes = max_bytes
+        gzip = content_encoding != "identity"
+        self._inflater = zlib.decompressobj(wbits=_GZIP_WBITS) if gzip else None
+        self.size = 0
+
+    def update(self, chunk: bytes) -> None:
+        if self._inflater is None:
+            self._consume(chunk)
+            return
+        try:
+            while chunk:
+                if self._inflater.eof:
+                    # Another gzip member follows the previous one's trailer.
+                    self._inflater = zlib.decompressobj(wbits=_GZIP_WBITS)
+                self._consume(self._inflater.decompress(chunk, _INFLATE_STEP))
+                inflater = self._inflater
+                chunk = inflater.unused_data if inflater.eof else inflater.unconsumed_tail
+        except zlib.error as exc:
+            raise SnapshotDecodeError(f"invalid gzip body: {exc}") from exc
+
+    def digest(self) -> bytes:
+        """Finish the body and return the snapshot's SHA-256 digest."""
+
+        if self._inflater is not None and not self._inflater.eof:
+            raise SnapshotDecodeError("truncated gzip body")
+        return self._hash.digest()
+
+    def _consume(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self._max_bytes:
+            raise SnapshotTooLarge(f"snapshot exceeds {self._max_bytes} bytes")
+        self._hash.update(data)
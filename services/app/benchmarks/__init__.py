@@ -0,0 +1 @@
+"""Standalone benchmarks; run from ``services/app`` with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,82 @@
+"""Compare req/s and latency of the fast list serializer against model validation.
+
+Both variants serve the same repository page in-process over ASGI; the legacy variant
+validates one response model per record and then again through ``response_model``.
+
+Usage::
+
+    python -m benchmarks.list_serialization --monitors 20000 --limit 1000 --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+from time import perf_counter
+
+import httpx
+from fastapi import APIRouter, Depends
+
+from app.api.schemas import MonitorResponse
+from app.dependencies import container, get_repository
+from app.main import create_app
+from app.services.repositories import InMemoryRepository
+
+legacy_router = APIRouter()
+
+
+@legacy_router.get("/legacy/monitors", response_model=list[MonitorResponse])
+async def legacy_list_monitors(
+    limit: int,
+    repository: InMemoryRepository = Depends(get_repository),
+) -> list[MonitorResponse]:
+    page = await repository.page_monitors(limit=limit)
+    return [MonitorResponse.from_record(monitor) for monitor in page.items]
+
+
+async def _measure(
+    client: httpx.AsyncClient, url: str, requests: int
+) -> tuple[float, float, float]:
+    await client.get(url)
+    latencies = []
+    started = perf_counter()
+    for _ in range(requests):
+        request_started = perf_counter()
+        response = await client.get(url)
+        response.raise_for_status()
+        latencies.append(perf_counter() - request_started)
+    elapsed = perf_counter() - started
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    return requests / elapsed, statistics.median(latencies), p99
+
+
+async def main(monitors: int, limit: int, requests: int) -> None:
+    repository = container.repository
+    for index in range(monitors):
+        monitor = await repository.create_monitor(
+            f"monitor-{index}", f"https://example.com/{index}"
+        )
+        await repository.set_monitor_snapshot(monitor.id, f"content-{index}")
+
+    app = create_app()
+    app.include_router(legacy_router)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, url in (
+            ("legacy", f"/legacy/monitors?limit={limit}"),
+            ("fast", f"/api/monitors?limit={limit}"),
+        ):
+            rps, p50, p99 = await _measure(client, url, requests)
+            print(f"{label:6} {rps:8.1f} req/s  p50 {p50 * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--monitors", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.monitors, args.limit, args.requests))
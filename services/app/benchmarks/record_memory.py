@@ -0,0 +1,91 @@
+"""Measure resident bytes per monitor record for the compact and legacy layouts.
+
+Usage::
+
+    python -m benchmarks.record_memory --count 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from hashlib import sha256
+from time import time
+from uuid import uuid4
+
+from app.services.repositories import MonitorRecord
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class LegacyMonitorRecord:
+    """The pre-compaction layout: ``__dict__`` per instance, hex hash, aware datetimes."""
+
+    id: str
+    name: str
+    source_url: str
+    last_snapshot_hash: str | None = None
+    changed: bool = False
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: datetime = field(default_factory=_utcnow)
+
+
+def _build_compact(index: int) -> MonitorRecord:
+    return MonitorRecord(
+        id=str(uuid4()),
+        name=f"monitor-{index}",
+        source_url=f"https://example.com/{index}",
+        last_snapshot_digest=sha256(str(index).encode()).digest(),
+        created_at=time(),
+        updated_at=time(),
+    )
+
+
+def _build_legacy(index: int) -> LegacyMonitorRecord:
+    return LegacyMonitorRecord(
+        id=str(uuid4()),
+        name=f"monitor-{index}",
+        source_url=f"https://example.com/{index}",
+        last_snapshot_hash=sha256(str(index).encode()).hexdigest(),
+        created_at=_utcnow(),
+        updated_at=_utcnow(),
+    )
+
+
+def measure(build: Callable[[int], object], count: int) -> float:
+    """Return traced bytes per record for ``count`` records stored in an id-keyed dict."""
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    store = {}
+    for index in range(count):
+        record = build(index)
+        store[record.id] = record
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return (current - baseline) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    legacy = measure(_build_legacy, args.count)
+    compact = measure(_build_compact, args.count)
+    print(f"records: {args.count}")
+    print(f"legacy  bytes/record: {legacy:8.1f}")
+    print(f"compact bytes/record: {compact:8.1f}  ({compact / legacy:.0%} of legacy)")
+
+
+if __name__ == "__main__":
+    main()
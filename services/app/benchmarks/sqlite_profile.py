@@ -0,0 +1,110 @@
+"""Compare concurrent write/read throughput of the default and production SQLite profiles.
+
+Usage::
+
+    python -m benchmarks.sqlite_profile --clients 32 --iterations 50 --reads-per-write 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import Settings
+from app.db.base import Base
+from app.db.repository import SqlAlchemyRepository
+from app.db.session import SessionRouter, create_session_router
+
+
+@dataclass(slots=True)
+class ProfileResult:
+    writes: int = 0
+    reads: int = 0
+    locked: int = 0
+    seconds: float = 0.0
+    write_latencies: list[float] = field(default_factory=list)
+
+    def p99_write_ms(self) -> float:
+        ordered = sorted(self.write_latencies)
+        return ordered[int(len(ordered) * 0.99) - 1] * 1000 if ordered else 0.0
+
+
+async def _dispose(router: SessionRouter) -> None:
+    await router.primary.kw["bind"].dispose()
+    if router.replica is not None:
+        await router.replica.kw["bind"].dispose()
+
+
+async def run_profile(
+    profile: str, directory: Path, *, clients: int, iterations: int, reads_per_write: int
+) -> ProfileResult:
+    """Run ``clients`` concurrent loops of one write followed by ``reads_per_write`` reads."""
+
+    db_path = directory / f"{profile}.db"
+    sync_engine = create_sync_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    router = create_session_router(
+        Settings(database_url=f"sqlite+aiosqlite:///{db_path}", sqlite_profile=profile)
+    )
+    repo = SqlAlchemyRepository(router)
+    result = ProfileResult()
+
+    async def client(index: int) -> None:
+        for n in range(iterations):
+            began = perf_counter()
+            try:
+                await repo.create_task(f"task-{index}-{n}", {"n": n})
+                result.writes += 1
+                result.write_latencies.append(perf_counter() - began)
+            except OperationalError:
+                result.locked += 1
+            for _ in range(reads_per_write):
+                try:
+                    await repo.page_tasks(limit=100)
+                    result.reads += 1
+                except OperationalError:
+                    result.locked += 1
+
+    start = perf_counter()
+    await asyncio.gather(*(client(index) for index in range(clients)))
+    result.seconds = perf_counter() - start
+    await _dispose(router)
+    return result
+
+
+async def _main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in ("default", "production"):
+            result = await run_profile(
+                profile,
+                Path(directory),
+                clients=args.clients,
+                iterations=args.iterations,
+                reads_per_write=args.reads_per_write,
+            )
+            print(
+                f"{profile:10s} writes/s: {result.writes / result.seconds:8.1f}  "
+                f"reads/s: {result.reads / result.seconds:8.1f}  "
+                f"p99 write: {result.p99_write_ms():7.1f} ms  "
+                f"locked errors: {result.locked}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--reads-per-write", type=int, default=4)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Measure cold import time of ``app.main`` and the time to the first served request.
+
+Every run starts a fresh interpreter, so nothing is cached in ``sys.modules``. It times
+importing ``app.main``, getting the application, running its lifespan startup and
+serving a first request over ASGI. Settings come from the environment as usual, e.g.
+``REPOSITORY_BACKEND=database`` with a migrated ``DATABASE_URL``.
+
+Usage::
+
+    python -m benchmarks.startup --runs 10 --path /api/tasks?limit=1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Runs in the child interpreter; prints one JSON object of cumulative timings.
+_CHILD = """
+import asyncio, json, logging, sys
+from time import perf_counter
+
+started = perf_counter()
+import app.main
+imported = perf_counter()
+application = app.main.app
+created = perf_counter()
+
+
+async def first_request():
+    import httpx
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Drive the ASGI lifespan protocol so middleware sees startup, as under a server.
+    messages = asyncio.Queue()
+    startup_done = asyncio.Event()
+
+    async def send(message):
+        if message["type"].startswith("lifespan.startup."):
+            startup_done.set()
+
+    await messages.put({"type": "lifespan.startup"})
+    scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+    lifespan = asyncio.create_task(application(scope, messages.get, send))
+    await startup_done.wait()
+    ready = perf_counter()
+    transport = httpx.ASGITransport(app=application)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        (await client.get(sys.argv[1])).raise_for_status()
+    served = perf_counter()
+    await messages.put({"type": "lifespan.shutdown"})
+    await lifespan
+    return ready, served
+
+
+ready, served = asyncio.run(first_request())
+print(json.dumps({
+    "import": imported - started,
+    "create app": created - started,
+    "lifespan startup": ready - started,
+    "first request": served - started,
+}))
+"""
+
+
+def _run_once(path: str) -> dict[str, float]:
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD, path],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main(runs: int, path: str) -> None:
+    samples = [_run_once(path) for _ in range(runs)]
+    print(f"{runs} cold starts, cumulative from the start of the import; first request {path}")
+    for stage in samples[0]:
+        values = [sample[stage] * 1000 for sample in samples]
+        print(
+            f"{stage:17} median {statistics.median(values):8.1f} ms"
+            f"  min {min(values):8.1f} ms  max {max(values):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/api/health")
+    args = parser.parse_args()
+    main(args.runs, args.path)
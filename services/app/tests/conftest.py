@@ -1,17 +1,74 @@
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.dependencies import repository
+from app.core.config import Settings
+from app.db.base import Base
+from app.db.repository import SqlAlchemyRepository
+from app.db.session import create_engine, create_session_factory
+from app.dependencies import container, get_monitor_service, get_repository, get_scheduler
 from app.main import app
+from app.services.monitoring import MonitorService
+from app.services.scheduler import Scheduler
 
 
 @pytest.fixture(autouse=True)
 async def reset_repository() -> None:
-    await repository.reset()
+    await container.repository.reset()
+    container.response_cache.clear()
     yield
-    await repository.reset()
+    await container.repository.reset()
+    container.response_cache.clear()
+
+
+def _create_sqlite_schema(path: Path) -> None:
+    sync_engine = create_sync_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+
+@pytest.fixture
+async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    """Session factory bound to a fresh SQLite file with the full schema."""
+
+    db_path = tmp_path / "webintel.db"
+    _create_sqlite_schema(db_path)
+    engine = create_engine(Settings(database_url=f"sqlite+aiosqlite:///{db_path}"))
+    yield create_session_factory(engine)
+    await engine.dispose()
+
+
+@pytest.fixture(params=["memory", "database"])
+def client(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[TestClient]:
+    """API client for each repository backend; the database one runs on aiosqlite."""
 
+    if request.param == "memory":
+        with TestClient(app) as test_client:
+            yield test_client
+        return
 
-@pytest.fixture()
-def client() -> TestClient:
-    return TestClient(app)
+    db_path = tmp_path / "webintel.db"
+    _create_sqlite_schema(db_path)
+    settings = Settings(
+        database_url=f"sqlite+aiosqlite:///{db_path}", repository_backend="database"
+    )
+    engine = create_engine(settings)
+    db_repository = SqlAlchemyRepository(create_session_factory(engine))
+    db_repository.add_change_listener(container.response_cache.invalidate)
+    app.dependency_overrides[get_repository] = lambda: db_repository
+    app.dependency_overrides[get_monitor_service] = lambda: MonitorService(
+        db_repository, container.events
+    )
+    app.dependency_overrides[get_scheduler] = lambda: Scheduler(
+        db_repository, container.executor, db_repository, container.events
+    )
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+            test_client.portal.call(engine.dispose)
+    finally:
+        app.dependency_overrides.clear()
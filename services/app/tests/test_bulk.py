@@ -0,0 +1,104 @@
+import json
+
+from fastapi.testclient import TestClient
+
+
+def test_bulk_monitors_json_array(client: TestClient) -> None:
+    response = client.post(
+        "/api/monitors/bulk",
+        json=[
+            {"data": {"name": "a", "source_url": "https://a.example"}},
+            {"data": {"name": "dup", "source_url": "https://A.example/"}},
+            {"op": "create", "data": {"name": "missing-url"}},
+        ],
+    )
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status"] for result in results] == [201, 409, 422]
+    monitor_id = results[0]["id"]
+    assert results[0]["item"]["source_url"] == "https://a.example"
+
+    response = client.post(
+        "/api/monitors/bulk",
+        json=[
+            {"op": "update", "id": monitor_id, "data": {"name": "renamed"}},
+            {"op": "delete", "id": "unknown"},
+            {"op": "delete"},
+        ],
+    )
+    assert [result["status"] for result in response.json()] == [200, 404, 422]
+    assert client.get(f"/api/monitors/{monitor_id}").json()["name"] == "renamed"
+    assert len(client.get("/api/monitors").json()) == 1
+
+
+def test_bulk_monitors_hand_urls_over_within_a_batch(client: TestClient) -> None:
+    a, b = client.post(
+        "/api/monitors/bulk",
+        json=[
+            {"data": {"name": "a", "source_url": "https://a.example"}},
+            {"data": {"name": "b", "source_url": "https://b.example"}},
+        ],
+    ).json()
+
+    response = client.post(
+        "/api/monitors/bulk",
+        json=[
+            # The later monitor gives its URL to the earlier one, then a freed URL is reused.
+            {"op": "update", "id": b["id"], "data": {"source_url": "https://c.example"}},
+            {"op": "update", "id": a["id"], "data": {"source_url": "https://b.example"}},
+            {"op": "delete", "id": b["id"]},
+            {"data": {"name": "d", "source_url": "https://c.example"}},
+        ],
+    )
+
+    assert [result["status"] for result in response.json()] == [200, 200, 204, 201]
+    assert sorted(monitor["source_url"] for monitor in client.get("/api/monitors").json()) == [
+        "https://b.example",
+        "https://c.example",
+    ]
+
+
+def test_bulk_jobs_ndjson_is_streamed_in_order(client: TestClient) -> None:
+    task_id = client.post("/api/tasks", json={"name": "crawl"}).json()["id"]
+    lines = [
+        {"data": {"task_id": task_id, "schedule_every_seconds": 30}},
+        {"data": {"task_id": "unknown"}},
+        {"data": {"task_id": task_id, "schedule_every_seconds": 0}},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n"
+
+    response = client.post(
+        "/api/jobs/bulk",
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [(result["index"], result["status"]) for result in results] == [
+        (0, 201),
+        (1, 404),
+        (2, 422),
+    ]
+    assert len(client.get(f"/api/tasks/{task_id}/jobs").json()) == 1
+
+
+def test_bulk_task_delete_cascades_and_rejects_bad_bodies(client: TestClient) -> None:
+    created = client.post(
+        "/api/tasks/bulk", json=[{"data": {"name": "a"}}, {"data": {"name": "b"}}]
+    ).json()
+    client.post("/api/jobs", json={"task_id": created[0]["id"]})
+
+    deleted = client.post("/api/tasks/bulk", json=[{"op": "delete", "id": created[0]["id"]}])
+    assert deleted.json()[0]["status"] == 204
+    assert client.get("/api/jobs").json() == []
+
+    assert client.post("/api/tasks/bulk", json={"op": "create"}).status_code == 400
+    assert (
+        client.post(
+            "/api/tasks/bulk", content=b"{", headers={"content-type": "application/json"}
+        ).status_code
+        == 400
+    )
@@ -0,0 +1,57 @@
+from fastapi.testclient import TestClient
+
+from app.api.conditional import etag_matches
+
+
+def test_etag_matching_uses_weak_comparison() -> None:
+    assert etag_matches('"a", W/"b"', 'W/"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", 'W/"b"')
+    assert not etag_matches('W/"c"', 'W/"b"')
+    assert not etag_matches(None, 'W/"b"')
+
+
+def test_record_reads_answer_if_none_match_until_the_record_changes(client: TestClient) -> None:
+    monitor_id = client.post(
+        "/api/monitors", json={"name": "site", "source_url": "https://example.com"}
+    ).json()["id"]
+    first = client.get(f"/api/monitors/{monitor_id}")
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    cached = client.get(f"/api/monitors/{monitor_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    client.post(f"/api/monitors/{monitor_id}/snapshot", json={"snapshot": "A"})
+    refreshed = client.get(f"/api/monitors/{monitor_id}", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert refreshed.json()["last_snapshot_hash"] is not None
+
+
+def test_list_etags_follow_their_collection_version(client: TestClient) -> None:
+    task_id = client.post("/api/tasks", json={"name": "scrape", "payload": {}}).json()["id"]
+    job_id = client.post(
+        "/api/jobs", json={"task_id": task_id, "schedule_every_seconds": 60, "enabled": True}
+    ).json()["id"]
+    jobs_etag = client.get("/api/jobs").headers["ETag"]
+    task_jobs_etag = client.get(f"/api/tasks/{task_id}/jobs").headers["ETag"]
+    tasks_etag = client.get("/api/tasks").headers["ETag"]
+
+    # Writes to another collection leave the list tag alone.
+    client.post("/api/monitors", json={"name": "site", "source_url": "https://example.com"})
+    assert client.get("/api/jobs", headers={"If-None-Match": jobs_etag}).status_code == 304
+
+    client.put(f"/api/jobs/{job_id}", json={"enabled": False})
+    changed = client.get("/api/jobs", headers={"If-None-Match": jobs_etag})
+    assert changed.status_code == 200
+    assert changed.json()[0]["enabled"] is False
+    assert client.get("/api/tasks", headers={"If-None-Match": tasks_etag}).status_code == 304
+
+    # Deleting the task cascades to its jobs, so the jobs tags move too.
+    client.delete(f"/api/tasks/{task_id}")
+    gone = client.get(f"/api/tasks/{task_id}/jobs", headers={"If-None-Match": task_jobs_etag})
+    assert gone.status_code == 404
+    assert client.get("/api/tasks", headers={"If-None-Match": tasks_etag}).status_code == 200
@@ -7,4 +7,60 @@ def test_dashboard_page_renders(client: TestClient) -> None:
     assert "text/html" in response.headers["content-type"]
     assert "WebIntel AI Dashboard" in response.text
     assert "Sample operational view" in response.text
-    assert "fetch('/api/tasks')" in response.text
+    assert "fetch('/api/dashboard/summary?recent=6')" in response.text
+
+
+def test_dashboard_summary_counts_and_recent_jobs(client: TestClient) -> None:
+    task_id = client.post("/api/tasks", json={"name": "scrape", "payload": {}}).json()["id"]
+    job_ids = [
+        client.post(
+            "/api/jobs", json={"task_id": task_id, "schedule_every_seconds": 60, "enabled": True}
+        ).json()["id"]
+        for _ in range(3)
+    ]
+    failing = client.post("/api/tasks", json={"name": "broken", "payload": {"fail": True}}).json()[
+        "id"
+    ]
+    client.post(
+        "/api/jobs", json={"task_id": failing, "schedule_every_seconds": 60, "enabled": True}
+    )
+    monitor_id = client.post(
+        "/api/monitors", json={"name": "site", "source_url": "https://example.com"}
+    ).json()["id"]
+    client.post(f"/api/monitors/{monitor_id}/snapshot", json={"snapshot": "A"})
+    client.post(f"/api/monitors/{monitor_id}/snapshot", json={"snapshot": "B"})
+    client.post("/api/jobs/run")
+
+    summary = client.get("/api/dashboard/summary", params={"recent": 2}).json()
+
+    assert {key: summary[key] for key in ("tasks", "jobs", "monitors")} == {
+        "tasks": 2,
+        "jobs": 4,
+        "monitors": 1,
+    }
+    assert summary["changed_monitors"] == 1
+    assert summary["failing_jobs"] == 1
+    assert len(summary["recent_jobs"]) == 2
+    assert summary["recent_jobs"][1]["id"] == job_ids[2]
+
+    client.delete(f"/api/tasks/{failing}")
+    after_delete = client.get("/api/dashboard/summary").json()
+    assert (after_delete["jobs"], after_delete["failing_jobs"]) == (3, 0)
+
+
+def test_dashboard_renders_event_data_as_text(client: TestClient) -> None:
+    source_url = "https://example.com/<img src=x onerror=alert(1)>"
+    monitor_id = client.post(
+        "/api/monitors", json={"name": "site", "source_url": source_url}
+    ).json()["id"]
+
+    with client.websocket_connect("/api/events/ws?types=monitor.changed") as websocket:
+        client.post(f"/api/monitors/{monitor_id}/snapshot", json={"snapshot": "A"})
+        client.post(f"/api/monitors/{monitor_id}/snapshot", json={"snapshot": "B"})
+        message = websocket.receive_json()
+
+    # Events carry the markup verbatim, so the page must never parse them as HTML.
+    assert "<img src=x onerror=alert(1)>" in str(message["data"])
+    page = client.get("/").text
+    assert "innerHTML" not in page
+    assert "cell.textContent = String(value);" in page
@@ -0,0 +1,105 @@
+import sqlite3
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from time import time
+from typing import Any
+
+import pytest
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy import event
+
+from app.core.config import Settings
+from app.db.base import Base
+from app.db.repository import SqlAlchemyRepository
+from app.db.session import create_engine, create_session_factory
+
+Capture = Callable[[Callable[[], Awaitable[Any]]], Awaitable[str]]
+
+
+@pytest.fixture
+async def query_plan(tmp_path: Path) -> AsyncIterator[tuple[SqlAlchemyRepository, Capture]]:
+    """Repository plus a helper returning the SQLite plan of the SELECT a call issues."""
+
+    db_path = tmp_path / "plans.db"
+    sync_engine = create_sync_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+    engine = create_engine(Settings(database_url=f"sqlite+aiosqlite:///{db_path}"))
+    statements: list[tuple[str, Any]] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    async def capture(call: Callable[[], Awaitable[Any]]) -> str:
+        statements.clear()
+        await call()
+        statement, parameters = statements[-1]
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        return "\n".join(row[-1] for row in rows)
+
+    yield SqlAlchemyRepository(create_session_factory(engine)), capture
+    await engine.dispose()
+
+
+async def test_keyset_pages_walk_the_created_at_index(query_plan) -> None:
+    repo, capture = query_plan
+    await repo.create_task("t", {})
+
+    plan = await capture(lambda: repo.page_tasks(after=(time(), "1"), limit=10))
+
+    assert "ix_tasks_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+async def test_updated_since_filter_uses_the_updated_at_index(query_plan) -> None:
+    repo, capture = query_plan
+
+    plan = await capture(lambda: repo.page_tasks(limit=10, updated_since=time()))
+
+    assert "ix_tasks_updated_at_id" in plan
+
+
+async def test_job_filters_use_composite_indexes(query_plan) -> None:
+    repo, capture = query_plan
+    task = await repo.create_task("t", {})
+
+    enabled_plan = await capture(lambda: repo.page_jobs(limit=10, enabled=False))
+    task_plan = await capture(lambda: repo.list_jobs_for_task(task.id))
+
+    assert "ix_jobs_enabled_created_at_id" in enabled_plan
+    assert "TEMP B-TREE" not in enabled_plan
+    assert "ix_jobs_task_id_id" in task_plan
+
+
+async def test_monitor_lookups_use_url_and_partial_changed_indexes(query_plan) -> None:
+    repo, capture = query_plan
+
+    url_plan = await capture(lambda: repo.find_monitor_by_url("https://example.com/"))
+    changed_plan = await capture(lambda: repo.page_monitors(limit=10, changed=True))
+
+    assert "ix_monitors_normalized_endpoint" in url_plan
+    assert "ix_monitors_changed_created_at_id" in changed_plan
+
+
+async def test_changed_filter_is_inlined_to_match_the_partial_index(query_plan) -> None:
+    repo, _ = query_plan
+    statements: list[tuple[str, Any]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append((statement, parameters))
+
+    sync_engine = repo._sessions.engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        await repo.page_monitors(limit=10, changed=True)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+    # Postgres may plan with generic parameters, which cannot prove ``WHERE changed``.
+    statement, parameters = statements[-1]
+    assert "monitors.changed = 1" in statement
+    assert True not in parameters
@@ -0,0 +1,85 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from structlog.testing import capture_logs
+
+from app.core.config import Settings
+from app.db.instrumentation import fingerprint, normalize_statement, statement_type
+from app.db.repository import SqlAlchemyRepository
+from app.db.session import create_engine, create_session_factory
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_statements_with_different_bound_values_share_a_fingerprint() -> None:
+    first = "SELECT * FROM jobs WHERE id IN (?, ?, ?) AND name = 'a' LIMIT 10"
+    second = "SELECT *\n  FROM jobs WHERE id IN (?) AND name = 'other' LIMIT 20"
+
+    assert normalize_statement(first) == "SELECT * FROM jobs WHERE id IN (?) AND name = ? LIMIT ?"
+    assert fingerprint(first) == fingerprint(second)
+    assert fingerprint("INSERT INTO t (a) VALUES ($1), ($2)") == fingerprint(
+        "INSERT INTO t (a) VALUES (%(a_m0)s)"
+    )
+    assert fingerprint(first) != fingerprint("SELECT * FROM tasks WHERE id IN (?)")
+
+
+@pytest.mark.parametrize(
+    ("statement", "expected"),
+    [
+        ("  select 1", "select"),
+        ("UPDATE jobs SET x = 1", "update"),
+        ("PRAGMA foreign_keys=ON", "other"),
+    ],
+)
+def test_statement_type(statement: str, expected: str) -> None:
+    assert statement_type(statement) == expected
+
+
+async def test_engine_records_statement_and_pool_metrics(session_factory) -> None:
+    engine = create_engine(
+        Settings(database_url=f"sqlite+aiosqlite:///{session_factory.kw['bind'].url.database}"),
+        name="instrumented",
+    )
+    repo = SqlAlchemyRepository(create_session_factory(engine))
+    selects = _sample(
+        "db_statement_duration_seconds_count", engine="instrumented", statement="select"
+    )
+    checkouts = _sample("db_pool_checkout_wait_seconds_count", engine="instrumented")
+
+    for index in range(3):
+        await repo.create_task(f"task-{index}", {})
+    await repo.list_tasks()
+
+    assert (
+        _sample("db_statement_duration_seconds_count", engine="instrumented", statement="select")
+        > selects
+    )
+    assert _sample("db_statement_rows_sum", engine="instrumented", statement="select") >= 3
+    assert _sample("db_pool_checkout_wait_seconds_count", engine="instrumented") > checkouts
+    assert _sample("db_pool_checked_out_connections", engine="instrumented") == 0
+    await engine.dispose()
+
+
+async def test_slow_queries_are_logged_with_a_fingerprint(session_factory) -> None:
+    engine = create_engine(
+        Settings(
+            database_url=f"sqlite+aiosqlite:///{session_factory.kw['bind'].url.database}",
+            db_slow_query_seconds=0,
+        ),
+        name="slow",
+    )
+
+    with capture_logs() as logs:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT id FROM tasks WHERE name = 'x' AND id IN (1, 2, 3)"))
+
+    slow = [entry for entry in logs if entry["event"] == "slow_query"]
+    assert slow[-1]["statement"] == "SELECT id FROM tasks WHERE name = ? AND id IN (?)"
+    assert slow[-1]["fingerprint"] == fingerprint(
+        "SELECT id FROM tasks WHERE name = ? AND id IN (?)"
+    )
+    assert slow[-1]["rows"] == 0
+    assert _sample("db_slow_queries_total", engine="slow", statement="select") >= 1
+    await engine.dispose()
@@ -0,0 +1,60 @@
+import asyncio
+
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import Settings
+from app.db.base import Base
+from app.db.repository import SqlAlchemyRepository
+from app.db.session import create_engine, create_session_router, pool_options, sqlite_pragmas
+
+
+def test_pool_settings_are_applied_to_the_engine() -> None:
+    settings = Settings(
+        database_url="postgresql+asyncpg://user:pass@db/webintel",
+        db_pool_size=7,
+        db_max_overflow=3,
+        db_pool_recycle_seconds=120,
+        db_pool_pre_ping=False,
+    )
+
+    engine = create_engine(settings)
+
+    assert engine.pool.size() == 7
+    assert engine.pool._max_overflow == 3
+    assert engine.pool._recycle == 120
+    assert engine.pool._pre_ping is False
+
+
+def test_in_memory_sqlite_uses_a_static_pool() -> None:
+    assert pool_options(Settings(database_url="sqlite+aiosqlite://")) == {"poolclass": StaticPool}
+
+
+async def test_sqlite_production_profile_uses_wal_and_a_single_writer(tmp_path) -> None:
+    db_path = tmp_path / "webintel.db"
+    sync_engine = create_sync_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    router = create_session_router(
+        Settings(database_url=f"sqlite+aiosqlite:///{db_path}", sqlite_profile="production")
+    )
+    repo = SqlAlchemyRepository(router)
+
+    async def write_and_read(index: int) -> None:
+        await repo.create_task(f"task-{index}", {})
+        await repo.list_tasks()
+
+    await asyncio.gather(*(write_and_read(index) for index in range(50)))
+
+    async with router.read_session() as session:
+        assert await session.scalar(text("PRAGMA journal_mode")) == "wal"
+        assert await session.scalar(text("PRAGMA synchronous")) == 1
+    assert router.primary.kw["bind"].pool.size() == 1
+    assert len(await repo.list_tasks()) == 50
+    await router.primary.kw["bind"].dispose()
+    await router.replica.kw["bind"].dispose()
+
+
+def test_default_profile_only_enables_foreign_keys() -> None:
+    assert sqlite_pragmas(Settings()) == ["PRAGMA foreign_keys=ON"]
@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.api.routers.events import sse_stream
+from app.services.events import JOB_FAILED, MONITOR_CHANGED, EventHub
+
+
+def _dropped(policy: str) -> float:
+    return REGISTRY.get_sample_value("change_events_dropped_total", {"policy": policy}) or 0.0
+
+
+async def test_hub_fans_out_to_matching_subscribers() -> None:
+    hub = EventHub()
+    everything = hub.subscribe()
+    failures = hub.subscribe([JOB_FAILED])
+
+    hub.publish(MONITOR_CHANGED, {"monitor_id": "m1"})
+    hub.publish(JOB_FAILED, {"job_id": "j1"})
+
+    assert [(await everything.get(0)).type for _ in range(2)] == [MONITOR_CHANGED, JOB_FAILED]
+    assert (await failures.get(0)).data == {"job_id": "j1"}
+    assert await failures.get(0.01) is None
+
+    everything.close()
+    failures.close()
+    assert hub.subscriber_count == 0
+
+
+async def test_slow_consumers_drop_oldest_or_disconnect() -> None:
+    hub = EventHub(buffer_size=2)
+    lossy = hub.subscribe()
+    strict = hub.subscribe(policy="disconnect")
+    dropped = _dropped("drop_oldest")
+
+    for index in range(3):
+        hub.publish(MONITOR_CHANGED, {"index": index})
+
+    assert lossy.take_dropped() == 1
+    assert _dropped("drop_oldest") == dropped + 1
+    assert [(await lossy.get(0)).data["index"] for _ in range(2)] == [1, 2]
+    assert strict.closed and hub.subscriber_count == 1
+    assert [(await strict.get(0)).data["index"] for _ in range(2)] == [0, 1]
+    assert await strict.get(0) is None
+
+
+async def test_resuming_replays_retained_events_after_the_last_id() -> None:
+    hub = EventHub(history_size=3)
+    published = [hub.publish(MONITOR_CHANGED, {"index": index}) for index in range(5)]
+
+    with hub.subscribe(after_id=published[2].id) as subscription:
+        assert [(await subscription.get(0)).id for _ in range(2)] == [
+            event.id for event in published[3:]
+        ]
+
+
+async def test_sse_stream_frames_events_and_reports_drops() -> None:
+    hub = EventHub(buffer_size=1)
+    stream = sse_stream(hub.subscribe(), heartbeat_seconds=0.01)
+
+    assert await anext(stream) == b"retry: 3000\n\n"
+    assert await anext(stream) == b": keep-alive\n\n"
+    hub.publish(MONITOR_CHANGED, {"monitor_id": "m1"})
+    event = hub.publish(MONITOR_CHANGED, {"monitor_id": "m2"})
+
+    notice, frame = await anext(stream), await anext(stream)
+    assert notice.startswith(b"event: stream.dropped\n")
+    assert frame.startswith(b"id: %d\nevent: monitor.changed\ndata: " % event.id)
+    assert b'"monitor_id":"m2"' in frame.replace(b" ", b"")
+
+    await stream.aclose()
+    assert hub.subscriber_count == 0
+
+
+def test_websocket_receives_monitor_changes(client: TestClient) -> None:
+    monitor_id = client.post(
+        "/api/monitors", json={"name": "site", "source_url": "https://example.com"}
+    ).json()["id"]
+
+    with client.websocket_connect(f"/api/events/ws?types={MONITOR_CHANGED}") as websocket:
+        client.post(f"/api/monitors/{monitor_id}/snapshot", json={"snapshot": "A"})
+        client.post(f"/api/monitors/{monitor_id}/snapshot", json={"snapshot": "B"})
+        message = websocket.receive_json()
+
+    assert message["type"] == MONITOR_CHANGED
+    assert message["data"]["monitor_id"] == monitor_id
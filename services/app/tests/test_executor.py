@@ -1,15 +1,15 @@
 import pytest
 
-from app.dependencies import executor, repository
+from app.dependencies import container
 
 
 @pytest.mark.asyncio
 async def test_job_execution_success_and_failure() -> None:
-    success_task = await repository.create_task("ok", {"value": 1})
-    fail_task = await repository.create_task("bad", {"fail": True})
+    success_task = await container.repository.create_task("ok", {"value": 1})
+    fail_task = await container.repository.create_task("bad", {"fail": True})
 
-    success_result = await executor.execute(success_task)
+    success_result = await container.executor.execute(success_task)
     assert success_result == "executed:ok"
 
     with pytest.raises(RuntimeError):
-        await executor.execute(fail_task)
+        await container.executor.execute(fail_task)
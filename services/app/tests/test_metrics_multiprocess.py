@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+from app.core.prometheus import MULTIPROC_DIR_ENV, MetricsExporter, mark_worker_exited
+
+# Stands in for one server worker: records metrics in multi-process mode and exits.
+WORKER = """
+import sys
+from app.core.metrics import EVENT_SUBSCRIBERS, FAILURE_COUNTER, TASK_COUNT
+
+TASK_COUNT.set(int(sys.argv[1]))
+EVENT_SUBSCRIBERS.inc(2)
+FAILURE_COUNTER.labels(operation="scheduler_execution").inc()
+print(__import__("os").getpid())
+"""
+
+
+def _run_worker(directory: Path, task_count: int) -> int:
+    env = {**os.environ, MULTIPROC_DIR_ENV: str(directory)}
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER, str(task_count)],
+        env=env,
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return int(result.stdout)
+
+
+def _samples(payload: bytes) -> dict[str, float]:
+    return {
+        sample.name: sample.value
+        for family in text_string_to_metric_families(payload.decode())
+        for sample in family.samples
+        if not sample.labels or sample.labels.get("operation") == "scheduler_execution"
+    }
+
+
+async def test_exporter_merges_worker_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = _run_worker(tmp_path, 5)
+    _run_worker(tmp_path, 7)
+
+    samples = _samples(await MetricsExporter(directory=str(tmp_path), cache_seconds=0).render())
+
+    assert samples["task_count"] == 7
+    assert samples["change_event_subscribers"] == 4
+    assert samples["failure_total"] == 2
+
+    monkeypatch.setenv(MULTIPROC_DIR_ENV, str(tmp_path))
+    mark_worker_exited(first)
+    samples = _samples(await MetricsExporter(directory=str(tmp_path), cache_seconds=0).render())
+    assert samples["change_event_subscribers"] == 2
+    assert samples["failure_total"] == 2
+
+
+async def test_exporter_reuses_the_merged_payload_within_the_cache_window(
+    tmp_path: Path,
+) -> None:
+    exporter = MetricsExporter(directory=str(tmp_path), cache_seconds=60)
+    _run_worker(tmp_path, 1)
+    first = await exporter.render()
+    _run_worker(tmp_path, 2)
+
+    assert await exporter.render() is first
+    exporter.cache_seconds = 0
+    assert _samples(await exporter.render())["failure_total"] == 2
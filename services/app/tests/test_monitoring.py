@@ -1,15 +1,15 @@
 import pytest
 
-from app.dependencies import monitor_service, repository
+from app.dependencies import container
 
 
 @pytest.mark.asyncio
 async def test_monitor_change_detection() -> None:
-    monitor = await repository.create_monitor("home", "https://example.com")
+    monitor = await container.repository.create_monitor("home", "https://example.com")
 
-    first_change = await monitor_service.ingest_snapshot(monitor.id, "<html>v1</html>")
-    second_change = await monitor_service.ingest_snapshot(monitor.id, "<html>v1</html>")
-    third_change = await monitor_service.ingest_snapshot(monitor.id, "<html>v2</html>")
+    first_change = await container.monitor_service.ingest_snapshot(monitor.id, "<html>v1</html>")
+    second_change = await container.monitor_service.ingest_snapshot(monitor.id, "<html>v1</html>")
+    third_change = await container.monitor_service.ingest_snapshot(monitor.id, "<html>v2</html>")
 
     assert first_change is False
     assert second_change is False
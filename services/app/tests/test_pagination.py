@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+
+
+def _walk(client: TestClient, url: str) -> list[list[str]]:
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        url = response.links["next"]["url"] if cursor else ""
+    return pages
+
+
+def test_monitor_pages_are_stable_and_complete(client: TestClient) -> None:
+    ids = [
+        client.post(
+            "/api/monitors", json={"name": f"m{i}", "source_url": f"https://example.com/{i}"}
+        ).json()["id"]
+        for i in range(5)
+    ]
+
+    pages = _walk(client, "/api/monitors?limit=2")
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [monitor_id for page in pages for monitor_id in page] == ids
+
+
+def test_list_filters(client: TestClient) -> None:
+    task_id = client.post("/api/tasks", json={"name": "crawl"}).json()["id"]
+    enabled = client.post("/api/jobs", json={"task_id": task_id}).json()["id"]
+    disabled = client.post("/api/jobs", json={"task_id": task_id, "enabled": False}).json()["id"]
+    assert [job["id"] for job in client.get("/api/jobs?enabled=false").json()] == [disabled]
+    assert [job["id"] for job in client.get("/api/jobs?enabled=true").json()] == [enabled]
+
+    quiet = client.post(
+        "/api/monitors", json={"name": "a", "source_url": "https://a.example"}
+    ).json()
+    noisy = client.post(
+        "/api/monitors", json={"name": "b", "source_url": "https://b.example"}
+    ).json()
+    client.post(f"/api/monitors/{noisy['id']}/snapshot", json={"snapshot": "v1"})
+    client.post(f"/api/monitors/{noisy['id']}/snapshot", json={"snapshot": "v2"})
+    assert [m["id"] for m in client.get("/api/monitors?changed=true").json()] == [noisy["id"]]
+    assert [m["id"] for m in client.get("/api/monitors?changed=false").json()] == [quiet["id"]]
+
+    since = client.get(f"/api/monitors/{noisy['id']}").json()["updated_at"]
+    recent = client.get("/api/monitors", params={"updated_since": since})
+    assert [m["id"] for m in recent.json()] == [noisy["id"]]
+
+
+def test_invalid_cursor_is_rejected(client: TestClient) -> None:
+    assert client.get("/api/tasks?cursor=not-a-cursor").status_code == 400
+    assert client.get("/api/tasks?limit=0").status_code == 422
@@ -0,0 +1,206 @@
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import Settings
+from app.db.base import Base
+from app.db.models import Job, Monitor, Task, User
+from app.db.queries import user_overview
+from app.db.repository import SqlAlchemyRepository
+from app.db.session import create_engine, create_session_factory
+from app.dependencies import container, get_repository
+from app.main import app
+
+Count = Callable[[Callable[[], Awaitable[Any]]], Awaitable[int]]
+
+ITEMS = 10
+ENGINE = "query-counts"
+STATEMENT_TYPES = ("select", "insert", "update", "delete", "other")
+
+
+def _statements_sent() -> float:
+    """Statements the instrumentation hooks have timed on the :data:`ENGINE` engine."""
+
+    return sum(
+        REGISTRY.get_sample_value(
+            "db_statement_duration_seconds_count", {"engine": ENGINE, "statement": kind}
+        )
+        or 0.0
+        for kind in STATEMENT_TYPES
+    )
+
+
+@pytest.fixture
+def api(tmp_path: Path) -> Iterator[tuple[TestClient, SqlAlchemyRepository]]:
+    """API client on an instrumented SQLite database, plus a repository to seed it."""
+
+    db_path = tmp_path / "counts.db"
+    sync_engine = create_sync_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    settings = Settings(database_url=f"sqlite+aiosqlite:///{db_path}")
+    engine = create_engine(settings, name=ENGINE)
+    seed_engine = create_engine(settings, name=f"{ENGINE}-seed")
+    # Caches start cold for every request that is counted; see _count.
+    app.dependency_overrides[get_repository] = lambda: SqlAlchemyRepository(
+        create_session_factory(engine)
+    )
+    try:
+        with TestClient(app) as client:
+            yield client, SqlAlchemyRepository(create_session_factory(seed_engine))
+            client.portal.call(engine.dispose)
+            client.portal.call(seed_engine.dispose)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _count(client: TestClient, path: str) -> int:
+    container.response_cache.clear()
+    before = _statements_sent()
+    response = client.get(path)
+    assert response.status_code == 200, response.text
+    return int(_statements_sent() - before)
+
+
+def _seed(client: TestClient, repo: SqlAlchemyRepository, count: int) -> dict[str, str]:
+    async def seed() -> dict[str, str]:
+        task = await repo.create_task("task", {})
+        jobs = [await repo.create_job(task.id, 60, True) for _ in range(count)]
+        monitors = [
+            await repo.create_monitor(f"monitor-{index}", f"https://example.com/{task.id}/{index}")
+            for index in range(count)
+        ]
+        for job in jobs:
+            for attempt in range(3):
+                await repo.record_result(job.id, succeeded=attempt % 2 == 0, content=str(attempt))
+        return {"task": task.id, "job": jobs[0].id, "monitor": monitors[0].id}
+
+    return client.portal.call(seed)
+
+
+# Path template -> most statements one uncached request may send.
+ENDPOINT_BUDGETS = {
+    "/api/tasks?limit=100": 2,
+    "/api/tasks/{task}": 1,
+    "/api/tasks/{task}/jobs": 3,
+    "/api/jobs?limit=100": 2,
+    "/api/jobs/{job}": 1,
+    "/api/jobs/{job}/results?limit=5": 2,
+    "/api/monitors?limit=100": 2,
+    "/api/monitors?limit=100&changed=false": 2,
+    "/api/monitors/{monitor}": 1,
+    "/api/dashboard/summary?recent=6": 2,
+}
+
+
+@pytest.mark.parametrize("template", list(ENDPOINT_BUDGETS))
+def test_endpoints_send_a_bounded_number_of_statements(api, template: str) -> None:
+    client, repo = api
+    small = _count(client, template.format(**_seed(client, repo, 1)))
+    large = _count(client, template.format(**_seed(client, repo, ITEMS)))
+
+    assert large == small
+    assert large <= ENDPOINT_BUDGETS[template]
+
+
+def test_job_results_come_newest_first(api) -> None:
+    client, repo = api
+
+    async def seed() -> str:
+        job = await repo.create_job((await repo.create_task("task", {})).id, 60, True)
+        for index in range(ITEMS):
+            await repo.record_result(job.id, succeeded=index % 2 == 0, content=str(index))
+        return job.id
+
+    results = client.get(f"/api/jobs/{client.portal.call(seed)}/results?limit=5").json()["results"]
+
+    assert [result["content"] for result in results] == ["9", "8", "7", "6", "5"]
+    assert [result["status"] for result in results][:2] == ["error", "processed"]
+
+
+@pytest.fixture
+async def count_statements(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[Count]:
+    """Helper returning how many statements a call sends to the database."""
+
+    statements: list[str] = []
+    sync_engine = session_factory.kw["bind"].sync_engine
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", _record)
+
+    async def count(call: Callable[[], Awaitable[Any]]) -> int:
+        statements.clear()
+        await call()
+        return len(statements)
+
+    yield count
+    event.remove(sync_engine, "before_cursor_execute", _record)
+
+
+async def test_user_overview_loads_the_graph_in_four_statements(
+    session_factory: async_sessionmaker[AsyncSession], count_statements: Count
+) -> None:
+    async with session_factory() as session, session.begin():
+        user_id = await session.scalar(
+            insert(User).values(email="owner@example.com").returning(User.id)
+        )
+        task_ids = (
+            await session.scalars(
+                insert(Task).returning(Task.id),
+                [{"user_id": user_id, "name": f"task-{index}"} for index in range(ITEMS)],
+            )
+        ).all()
+        job_ids = (
+            await session.scalars(
+                insert(Job).returning(Job.id), [{"task_id": task_id} for task_id in task_ids]
+            )
+        ).all()
+        await session.execute(
+            insert(Monitor),
+            [
+                {
+                    "user_id": user_id,
+                    "job_id": job_id,
+                    "endpoint": f"https://example.com/{job_id}",
+                    "normalized_endpoint": f"https://example.com/{job_id}",
+                }
+                for job_id in job_ids
+            ],
+        )
+
+    async def load() -> User:
+        async with session_factory() as session:
+            return (await session.scalars(user_overview(user_id))).one()
+
+    statements = await count_statements(load)
+    user = await load()
+
+    assert statements == 4
+    assert len(user.tasks) == ITEMS
+    assert all(len(task.jobs) == 1 for task in user.tasks)
+    assert {monitor.job.id for monitor in user.monitors} == set(job_ids)
+
+
+async def test_unloaded_relationships_raise_instead_of_querying(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session, session.begin():
+        task_id = await session.scalar(insert(Task).values(name="task").returning(Task.id))
+        await session.execute(insert(Job).values(task_id=task_id))
+
+    async with session_factory() as session:
+        job = (await session.scalars(select(Job))).one()
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            _ = job.task
@@ -0,0 +1,130 @@
+import asyncio
+import random
+from bisect import bisect_left, bisect_right
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.repository import SqlAlchemyRepository
+from app.dependencies import container
+from app.services.repositories import MonitorUrlConflict, OrderedIndex, normalize_source_url
+
+
+def test_normalize_source_url() -> None:
+    assert normalize_source_url("HTTPS://Example.COM:443") == "https://example.com/"
+    assert (
+        normalize_source_url("http://example.com:8080/a?b=1#frag")
+        == "http://example.com:8080/a?b=1"
+    )
+
+
+def test_ordered_index_matches_a_sorted_list_across_block_splits() -> None:
+    rng = random.Random(7)
+    index = OrderedIndex(block_size=4)
+    expected: set[tuple[float, str]] = set()
+    for _ in range(2000):
+        key = (float(rng.randrange(100)), str(rng.randrange(3)))
+        if rng.random() < 0.6:
+            index.add(key)
+            expected.add(key)
+        else:
+            index.discard(key)
+            expected.discard(key)
+        keys = sorted(expected)
+        start = (float(rng.randrange(100)), str(rng.randrange(3)))
+        assert len(index) == len(keys)
+        assert list(index.iter_from(None, inclusive=True)) == keys
+        assert list(index.iter_from(start, inclusive=True)) == keys[bisect_left(keys, start) :]
+        assert list(index.iter_from(start, inclusive=False)) == keys[bisect_right(keys, start) :]
+        assert index.latest(5) == keys[::-1][:5]
+
+
+@pytest.mark.asyncio
+async def test_job_index_and_cascading_task_delete() -> None:
+    task = await container.repository.create_task("crawl", {})
+    other = await container.repository.create_task("other", {})
+    first = await container.repository.create_job(task.id, schedule_every_seconds=1, enabled=True)
+    second = await container.repository.create_job(task.id, schedule_every_seconds=1, enabled=True)
+    kept = await container.repository.create_job(other.id, schedule_every_seconds=1, enabled=True)
+
+    assert [job.id for job in await container.repository.list_jobs_for_task(task.id)] == [first.id, second.id]
+
+    await container.repository.delete_job(second.id)
+    assert [job.id for job in await container.repository.list_jobs_for_task(task.id)] == [first.id]
+
+    assert await container.repository.delete_task(task.id) is True
+    assert await container.repository.list_jobs_for_task(task.id) == []
+    assert [job.id for job in await container.repository.list_jobs()] == [kept.id]
+
+    result = await container.scheduler.run_once()
+    assert result == {"success": 1, "failures": 0}
+
+
+@pytest.mark.asyncio
+async def test_monitor_url_index_tracks_updates() -> None:
+    monitor = await container.repository.create_monitor("home", "https://Example.com")
+
+    assert (await container.repository.find_monitor_by_url("https://example.com/")).id == monitor.id
+
+    await container.repository.update_monitor(monitor.id, source_url="https://example.com/pricing")
+    assert await container.repository.find_monitor_by_url("https://example.com") is None
+    assert await container.repository.list_monitors_for_url("https://example.com/pricing") == [monitor]
+
+    await container.repository.delete_monitor(monitor.id)
+    assert await container.repository.find_monitor_by_url("https://example.com/pricing") is None
+
+
+def test_monitor_url_dedup_and_task_jobs_endpoint(client: TestClient) -> None:
+    created = client.post("/api/monitors", json={"name": "a", "source_url": "https://example.com"})
+    assert created.status_code == 201
+    duplicate = client.post(
+        "/api/monitors", json={"name": "b", "source_url": "https://EXAMPLE.com/"}
+    )
+    assert duplicate.status_code == 409
+    other = client.post("/api/monitors", json={"name": "c", "source_url": "https://c.example"})
+    moved = client.put(
+        f"/api/monitors/{other.json()['id']}", json={"source_url": "https://example.com/"}
+    )
+    assert moved.status_code == 409
+
+    task_id = client.post("/api/tasks", json={"name": "crawl"}).json()["id"]
+    job_id = client.post("/api/jobs", json={"task_id": task_id}).json()["id"]
+    jobs = client.get(f"/api/tasks/{task_id}/jobs")
+    assert jobs.status_code == 200
+    assert [job["id"] for job in jobs.json()] == [job_id]
+    assert client.get("/api/tasks/missing/jobs").status_code == 404
+
+
+@pytest.fixture(params=["memory", "database"])
+def repository(request: pytest.FixtureRequest):
+    if request.param == "memory":
+        return container.repository
+    return SqlAlchemyRepository(request.getfixturevalue("session_factory"))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_of_one_url_keep_a_single_monitor(repository) -> None:
+    outcomes = await asyncio.gather(
+        *(repository.create_monitor(f"m{n}", "https://Example.com") for n in range(5)),
+        return_exceptions=True,
+    )
+
+    conflicts = [outcome for outcome in outcomes if isinstance(outcome, MonitorUrlConflict)]
+    assert len(conflicts) == 4
+    assert len(await repository.list_monitors_for_url("https://example.com/")) == 1
+
+    other = await repository.create_monitor("other", "https://example.com/other")
+    with pytest.raises(MonitorUrlConflict):
+        await repository.update_monitor(other.id, source_url="https://EXAMPLE.com/")
+    assert (await repository.get_monitor(other.id)).source_url == "https://example.com/other"
+
+
+@pytest.mark.asyncio
+async def test_monitor_record_is_compact() -> None:
+    monitor = await container.repository.create_monitor("home", "https://example.com")
+    await container.repository.set_monitor_snapshot(monitor.id, "<html></html>")
+
+    assert not hasattr(monitor, "__dict__")
+    assert isinstance(monitor.created_at, float)
+    assert len(monitor.last_snapshot_digest) == 32
+    assert monitor.last_snapshot_hash == monitor.last_snapshot_digest.hex()
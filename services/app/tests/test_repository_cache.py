@@ -0,0 +1,161 @@
+import asyncio
+
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.cache import RecordCache
+from app.db.repository import SqlAlchemyRepository
+
+
+def _events(cache: str, event_name: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "repository_cache_events_total", {"cache": cache, "event": event_name}
+        )
+        or 0.0
+    )
+
+
+async def test_record_cache_reads_through_and_expires(monkeypatch) -> None:
+    clock = [100.0]
+    monkeypatch.setattr("app.db.cache.monotonic", lambda: clock[0])
+    cache: RecordCache[str] = RecordCache("expiry", ttl_seconds=5, max_entries=2)
+    loads: list[str] = []
+
+    async def load(value: str) -> str:
+        loads.append(value)
+        return value
+
+    assert await cache.get("a", lambda: load("a1")) == "a1"
+    assert await cache.get("a", lambda: load("a2")) == "a1"
+    clock[0] += 6
+    assert await cache.get("a", lambda: load("a3")) == "a3"
+    await cache.get("b", lambda: load("b"))
+    await cache.get("c", lambda: load("c"))
+
+    assert loads == ["a1", "a3", "b", "c"]
+    assert len(cache) == 2
+    assert _events("expiry", "hit") == 1
+    assert _events("expiry", "expired") == 1
+
+
+async def test_invalidation_during_a_load_does_not_cache_the_stale_value() -> None:
+    cache: RecordCache[str] = RecordCache("in_flight", ttl_seconds=60)
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_load() -> str:
+        loading.set()
+        await release.wait()
+        return "stale"
+
+    pending = asyncio.create_task(cache.get("key", slow_load))
+    await loading.wait()
+    cache.invalidate("key")
+    release.set()
+
+    assert await pending == "stale"
+    assert len(cache) == 0
+
+
+async def test_disabled_cache_always_loads() -> None:
+    cache: RecordCache[int] = RecordCache("disabled", ttl_seconds=0)
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert [await cache.get("key", load) for _ in range(3)] == [1, 2, 3]
+
+
+async def test_repository_serves_hot_lookups_from_cache_until_written(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    repo = SqlAlchemyRepository(session_factory, cache_ttl_seconds=60)
+    task = await repo.create_task("task", {})
+    job = await repo.create_job(task.id, 60, True)
+    monitor = await repo.create_monitor("site", "https://example.com/page")
+    statements: list[str] = []
+    sync_engine = session_factory.kw["bind"].sync_engine
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        for _ in range(3):
+            await repo.get_job(job.id)
+            await repo.get_task(task.id)
+            await repo.find_monitor_by_url("https://EXAMPLE.com/page")
+        assert len(statements) == 3
+
+        await repo.mark_job_run(job.id)
+        await repo.set_monitor_snapshot(monitor.id, "<html>v1</html>")
+        statements.clear()
+
+        refreshed = await repo.get_job(job.id)
+        found = await repo.find_monitor_by_url("https://example.com/page")
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+    assert len(statements) == 2
+    assert refreshed is not None and refreshed.last_run_at is not None
+    assert found is not None and found.last_snapshot_hash is not None
+
+    await repo.delete_task(task.id)
+    assert await repo.get_job(job.id) is None
+
+
+async def test_snapshot_writes_keep_other_url_lookups_cached(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    repo = SqlAlchemyRepository(session_factory, cache_ttl_seconds=60)
+    first = await repo.create_monitor("first", "https://example.com/a")
+    await repo.create_monitor("second", "https://example.com/b")
+    await repo.find_monitor_by_url("https://example.com/a")
+    await repo.find_monitor_by_url("https://example.com/b")
+    hits = _events("monitor_urls", "hit")
+
+    await repo.set_monitor_snapshot(first.id, "v1")
+    await repo.find_monitor_by_url("https://example.com/b")
+    assert _events("monitor_urls", "hit") == hits + 1
+
+    await repo.delete_monitor(first.id)
+    assert await repo.find_monitor_by_url("https://example.com/a") is None
+
+
+async def test_writes_move_counters_without_recounting(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    repo = SqlAlchemyRepository(session_factory)
+    task = await repo.create_task("task", {})
+    statements: list[str] = []
+    sync_engine = session_factory.kw["bind"].sync_engine
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        job = await repo.create_job(task.id, 60, True)
+        first = await repo.create_monitor("first", "https://example.com/a")
+        await repo.create_monitor("second", "https://example.com/b")
+        await repo.set_monitor_snapshot(first.id, "v1")
+        await repo.set_monitor_snapshot(first.id, "v2")
+        await repo.mark_job_failed(job.id)
+        await repo.delete_monitor(first.id)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+    assert not [statement for statement in statements if "count(" in statement.lower()]
+    summary = await repo.summary(recent_jobs=0)
+    assert (summary.tasks, summary.jobs, summary.monitors) == (1, 1, 1)
+    assert (summary.changed_monitors, summary.failing_jobs) == (0, 1)
+    assert REGISTRY.get_sample_value("monitor_count") == 1
+
+    # Deleting the task cascades to its job, so the counters are recounted once.
+    await repo.delete_task(task.id)
+    assert REGISTRY.get_sample_value("job_count") == 0
@@ -0,0 +1,81 @@
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.api.middleware import RouteTemplates
+from app.core.config import Settings, get_settings
+from app.main import app, create_app
+
+
+def _duration_count(method: str, route: str, status: str) -> float:
+    labels = {"method": method, "route": route, "status": status}
+    return REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0.0
+
+
+def _in_flight(method: str, route: str) -> float:
+    labels = {"method": method, "route": route}
+    return REGISTRY.get_sample_value("http_requests_in_flight", labels) or 0.0
+
+
+def test_requests_are_timed_by_route_template(client: TestClient) -> None:
+    found_before = _duration_count("GET", "/api/tasks/{task_id}", "200")
+    missing_before = _duration_count("GET", "/api/tasks/{task_id}", "404")
+    unmatched_before = _duration_count("GET", "unmatched", "404")
+    task_id = client.post("/api/tasks", json={"name": "t"}).json()["id"]
+
+    client.get(f"/api/tasks/{task_id}")
+    client.get("/api/tasks/999999")
+    client.get("/no/such/path")
+
+    assert _duration_count("GET", "/api/tasks/{task_id}", "200") == found_before + 1
+    assert _duration_count("GET", "/api/tasks/{task_id}", "404") == missing_before + 1
+    assert _duration_count("GET", "unmatched", "404") == unmatched_before + 1
+    assert _in_flight("GET", "/api/tasks/{task_id}") == 0
+
+
+def test_route_templates_prefer_literal_and_method_matches() -> None:
+    routes = RouteTemplates(app.openapi)
+
+    assert routes.resolve("POST", "/api/monitors/snapshots") == "/api/monitors/snapshots"
+    assert routes.resolve("GET", "/api/monitors/snapshots") == "/api/monitors/{monitor_id}"
+    assert routes.resolve("HEAD", "/api/tasks/7/jobs") == "/api/tasks/{task_id}/jobs"
+    assert routes.resolve("DELETE", "/api/health") == "/api/health"
+    assert routes.resolve("GET", "/api/tasks/7/nope") == "unmatched"
+
+
+def _assert_folded(body: str) -> None:
+    lines = body.splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+
+
+def test_profile_header_returns_the_request_profile() -> None:
+    profiled_app = create_app(Settings(profiling_enabled=True, profiling_interval_seconds=0.001))
+    with TestClient(profiled_app) as client:
+        plain = client.get("/api/tasks")
+        profiled = client.get("/api/tasks", headers={"X-Profile": "1"})
+
+    assert plain.headers["content-type"].startswith("application/json")
+    assert profiled.status_code == 200
+    assert profiled.headers["x-profile-status"] == "200"
+    assert "request.folded" in profiled.headers["content-disposition"]
+    if int(profiled.headers["x-profile-samples"]):
+        _assert_folded(profiled.text)
+
+
+def test_profile_window_requires_profiling_to_be_enabled(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert client.post("/api/profile", params={"seconds": 0.01}).status_code == 404
+
+    monkeypatch.setattr(get_settings(), "profiling_enabled", True)
+    monkeypatch.setattr(get_settings(), "profiling_interval_seconds", 0.001)
+    response = client.post("/api/profile", params={"seconds": 0.05})
+
+    assert response.status_code == 200
+    assert "profile.folded" in response.headers["content-disposition"]
+    assert int(response.headers["x-profile-samples"]) > 0
+    _assert_folded(response.text)
+    assert client.post("/api/profile", params={"seconds": 3600}).status_code == 422
@@ -0,0 +1,87 @@
+from fastapi import Request
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.api.response_cache import ResponseCache
+from app.api.serialization import JSONBytesResponse
+from app.dependencies import container
+
+
+def _request(path: str, query: str = "") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": [],
+        }
+    )
+
+
+def _requests(result: str) -> float:
+    return REGISTRY.get_sample_value("response_cache_requests_total", {"result": result}) or 0.0
+
+
+def test_entries_are_evicted_by_bytes_in_lru_order() -> None:
+    cache = ResponseCache(max_bytes=200)
+    for name in ("a", "b", "c"):
+        cache.store(_request(f"/{name}"), "e", JSONBytesResponse(b"x" * 60), collection="tasks")
+    assert cache.serve(_request("/a"), "e") is None
+    assert cache.serve(_request("/b"), "e") is not None
+
+    cache.store(_request("/d"), "e", JSONBytesResponse(b"x" * 60), collection="tasks")
+
+    assert cache.serve(_request("/b"), "e") is not None
+    assert cache.serve(_request("/c"), "e") is None
+    assert cache.bytes_held <= 200
+    cache.store(_request("/big"), "e", JSONBytesResponse(b"x" * 500), collection="tasks")
+    assert cache.serve(_request("/big"), "e") is None
+
+
+def test_invalidation_drops_only_the_changed_records_and_lists() -> None:
+    cache = ResponseCache(max_bytes=10_000)
+    body = JSONBytesResponse(b"{}")
+    cache.store(_request("/jobs/1"), "e", body, collection="jobs", record_id="1")
+    cache.store(_request("/jobs/2"), "e", body, collection="jobs", record_id="2")
+    cache.store(_request("/jobs", "limit=5"), "e", body, collection="jobs")
+    cache.store(_request("/tasks"), "e", body, collection="tasks")
+
+    cache.invalidate("jobs", ("1",))
+    assert [cache.serve(_request(path), "e") is not None for path in ("/jobs/1", "/jobs/2")] == [
+        False,
+        True,
+    ]
+    assert cache.serve(_request("/jobs", "limit=5"), "e") is None
+    assert cache.serve(_request("/tasks"), "e") is not None
+
+    cache.invalidate("jobs")
+    assert len(cache) == 1
+
+
+def test_reads_are_served_from_cache_until_a_write_invalidates_them(client: TestClient) -> None:
+    first_id, second_id = (
+        client.post(
+            "/api/monitors", json={"name": name, "source_url": f"https://example.com/{name}"}
+        ).json()["id"]
+        for name in ("first", "second")
+    )
+    client.get(f"/api/monitors/{first_id}")
+    client.get(f"/api/monitors/{second_id}")
+    listing = client.get("/api/monitors", params={"limit": 1})
+    hits = _requests("hit")
+
+    again = client.get("/api/monitors", params={"limit": 1})
+    assert again.content == listing.content
+    assert again.headers["ETag"] == listing.headers["ETag"]
+    assert again.headers["X-Next-Cursor"] == listing.headers["X-Next-Cursor"]
+    assert _requests("hit") == hits + 1
+    assert len(container.response_cache) == 3
+
+    client.post(f"/api/monitors/{first_id}/snapshot", json={"snapshot": "A"})
+
+    assert len(container.response_cache) == 1
+    assert client.get(f"/api/monitors/{first_id}").json()["last_snapshot_hash"] is not None
+    assert client.get(f"/api/monitors/{second_id}").status_code == 200
+    assert _requests("hit") == hits + 2
+    assert "response_cache_bytes" in client.get("/metrics").text
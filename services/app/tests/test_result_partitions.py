@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from app.db.models import Result, ResultStatus, ResultSummary
+from app.db.partitions import ResultPartitions
+from app.db.repository import SqlAlchemyRepository
+from app.db.results import ResultWriter
+
+HOUR = 3_600
+NOW = 1_800_000_000.0  # 2027-01-15T08:00:00Z, on an hour boundary
+
+
+async def _writer(session_factory) -> tuple[ResultWriter, ResultPartitions, str]:
+    repo = SqlAlchemyRepository(session_factory)
+    task = await repo.create_task("scrape", {})
+    job = await repo.create_job(task.id, schedule_every_seconds=1, enabled=True)
+    partitions = ResultPartitions(
+        session_factory.kw["bind"], period_seconds=HOUR, retention_periods=2
+    )
+    return ResultWriter(session_factory, partitions=partitions), partitions, job.id
+
+
+async def _rows(session_factory, partitions: ResultPartitions, start: float) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(partitions.table(start)))
+
+
+async def test_results_are_routed_to_the_partition_of_their_timestamp(session_factory) -> None:
+    writer, partitions, job_id = await _writer(session_factory)
+
+    await writer.record_result(job_id, succeeded=True, content="a", at=NOW - 1)
+    await writer.record_result(job_id, succeeded=True, content="b", at=NOW)
+    await writer.record_result(job_id, succeeded=True, content="c", at=NOW + 10)
+    await writer.close()
+
+    assert await partitions.partitions() == [
+        (NOW - HOUR, "results_p20270115_0700"),
+        (NOW, "results_p20270115_0800"),
+    ]
+    assert await _rows(session_factory, partitions, NOW - HOUR) == 1
+    assert await _rows(session_factory, partitions, NOW) == 2
+
+
+async def test_result_ids_are_unique_across_partitions(session_factory) -> None:
+    writer, partitions, job_id = await _writer(session_factory)
+    async with session_factory() as session, session.begin():
+        session.add(
+            Result(
+                job_id=int(job_id),
+                status=ResultStatus.PROCESSED,
+                created_at=datetime.fromtimestamp(NOW - 3 * HOUR, timezone.utc),
+            )
+        )
+    for at in (NOW - HOUR, NOW, NOW + 1):
+        await writer.record_result(job_id, succeeded=True, content=None, at=at)
+    await writer.close()
+
+    repo = SqlAlchemyRepository(session_factory, partitions=partitions)
+    _, results = await repo.get_job_with_results(job_id, limit=10)
+
+    assert [result.created_at for result in results] == [NOW + 1, NOW, NOW - HOUR, NOW - 3 * HOUR]
+    assert len({result.id for result in results}) == 4
+
+
+async def test_partition_list_is_cached_and_kept_current(session_factory) -> None:
+    _, partitions, _ = await _writer(session_factory)
+    await partitions.ensure(NOW)
+    assert await partitions.partitions() == [(NOW, "results_p20270115_0800")]
+
+    # Tables made elsewhere show up on refresh (every compaction does one) ...
+    other = ResultPartitions(session_factory.kw["bind"], period_seconds=HOUR)
+    await other.ensure(NOW - HOUR)
+    assert len(await partitions.partitions()) == 1
+    assert len(await partitions.partitions(refresh=True)) == 2
+
+    # ... while this instance's own DDL updates the list directly.
+    await partitions.ensure(NOW + HOUR)
+    await partitions.compact(now=NOW + 3 * HOUR)
+    assert [name for _, name in await partitions.partitions()] == [
+        "results_p20270115_0900",
+        "results_p20270115_1200",
+    ]
+
+
+async def test_compaction_rolls_up_and_drops_only_expired_partitions(session_factory) -> None:
+    writer, partitions, job_id = await _writer(session_factory)
+    old = NOW - 5 * HOUR
+    await writer.record_result(job_id, succeeded=True, content="ok", at=old + 10)
+    await writer.record_result(job_id, succeeded=False, content="boom", at=old + 20)
+    await writer.record_result(job_id, succeeded=True, content="recent", at=NOW - 2 * HOUR)
+    await writer.close()
+
+    report = await partitions.compact(now=NOW + 5)
+
+    assert report.dropped == ["results_p20270115_0300"]
+    assert report.summarized_rows == 2
+    assert [name for _, name in await partitions.partitions()] == [
+        "results_p20270115_0600",
+        "results_p20270115_0900",
+    ]
+    async with session_factory() as session:
+        summary = await session.scalar(select(ResultSummary))
+    assert (summary.job_id, summary.result_count, summary.error_count) == (int(job_id), 2, 1)
+    assert summary.last_result_at.timestamp() == old + 20
+
+
+async def test_compaction_rolls_up_expired_rows_from_before_partitioning(session_factory) -> None:
+    writer, partitions, job_id = await _writer(session_factory)
+    old = NOW - 5 * HOUR
+    async with session_factory() as session, session.begin():
+        for at, status in ((old + 1, ResultStatus.ERROR), (old + 2, ResultStatus.PROCESSED)):
+            session.add(
+                Result(
+                    job_id=int(job_id),
+                    status=status,
+                    created_at=datetime.fromtimestamp(at, timezone.utc),
+                )
+            )
+        session.add(
+            Result(
+                job_id=int(job_id),
+                status=ResultStatus.PROCESSED,
+                created_at=datetime.fromtimestamp(NOW - HOUR, timezone.utc),
+            )
+        )
+    # The same expired period also has a partition; both roll up into one summary.
+    await writer.record_result(job_id, succeeded=True, content="ok", at=old + 30)
+    await writer.close()
+
+    report = await partitions.compact(now=NOW + 5)
+
+    assert report.summarized_rows == 3
+    async with session_factory() as session:
+        legacy = (await session.scalars(select(Result.created_at))).all()
+        summaries = (await session.scalars(select(ResultSummary))).all()
+    assert [at.replace(tzinfo=timezone.utc).timestamp() for at in legacy] == [NOW - HOUR]
+    assert [(s.result_count, s.error_count) for s in summaries] == [(3, 1)]
+    assert summaries[0].first_result_at.timestamp() == old + 1
+    assert summaries[0].last_result_at.timestamp() == old + 30
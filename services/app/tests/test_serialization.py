@@ -0,0 +1,18 @@
+from fastapi.testclient import TestClient
+
+
+def test_list_rows_match_detail_responses(client: TestClient) -> None:
+    task_id = client.post("/api/tasks", json={"name": "crawl", "payload": {"depth": 2}}).json()[
+        "id"
+    ]
+    job_id = client.post("/api/jobs", json={"task_id": task_id}).json()["id"]
+    client.post("/api/jobs/run")
+    monitor_id = client.post(
+        "/api/monitors", json={"name": "home", "source_url": "https://example.com"}
+    ).json()["id"]
+    client.post(f"/api/monitors/{monitor_id}/snapshot", json={"snapshot": "v1"})
+
+    for collection, record_id in (("tasks", task_id), ("jobs", job_id), ("monitors", monitor_id)):
+        listed = client.get(f"/api/{collection}")
+        assert listed.headers["content-type"] == "application/json"
+        assert listed.json() == [client.get(f"/api/{collection}/{record_id}").json()]
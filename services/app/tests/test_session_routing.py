@@ -0,0 +1,78 @@
+import asyncio
+import contextvars
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine as create_sync_engine
+
+from app.core.config import Settings
+from app.db.base import Base
+from app.db.repository import SqlAlchemyRepository
+from app.db.session import SessionRouter, create_session_router
+
+
+def _database(path: Path) -> str:
+    sync_engine = create_sync_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    return f"sqlite+aiosqlite:///{path}"
+
+
+async def _dispose(router: SessionRouter) -> None:
+    await router.primary.kw["bind"].dispose()
+    if router.replica is not None:
+        await router.replica.kw["bind"].dispose()
+
+
+@pytest.fixture
+async def router(tmp_path: Path, request: pytest.FixtureRequest) -> AsyncIterator[SessionRouter]:
+    """Router over two independent SQLite files, so replica reads never see primary writes."""
+
+    settings = Settings(
+        database_url=_database(tmp_path / "primary.db"),
+        database_replica_url=_database(tmp_path / "replica.db"),
+        db_read_your_writes_seconds=getattr(request, "param", 60),
+    )
+    router = create_session_router(settings)
+    yield router
+    await _dispose(router)
+
+
+def _fresh_context(coro):
+    """Run ``coro`` as if it were another request, with no pin inherited."""
+
+    # The task copies the context it is created in; ``create_task(context=)`` needs 3.11.
+    return contextvars.Context().run(asyncio.create_task, coro)
+
+
+async def test_reads_after_a_write_stay_on_the_primary(router) -> None:
+    repo = SqlAlchemyRepository(router)
+
+    task = await repo.create_task("scrape", {})
+
+    assert await repo.get_task(task.id) is not None
+    assert await _fresh_context(repo.get_task(task.id)) is None
+
+
+@pytest.mark.parametrize("router", [0], indirect=True)
+async def test_pinning_expires_after_the_window(router) -> None:
+    repo = SqlAlchemyRepository(router)
+
+    task = await repo.create_task("scrape", {})
+
+    assert await repo.get_task(task.id) is None
+
+
+async def test_unreachable_replica_falls_back_to_the_primary(tmp_path: Path) -> None:
+    settings = Settings(
+        database_url=_database(tmp_path / "primary.db"),
+        database_replica_url=f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}",
+    )
+    router = create_session_router(settings)
+    repo = SqlAlchemyRepository(router)
+    task = await repo.create_task("scrape", {})
+
+    assert [t.id for t in await _fresh_context(repo.list_tasks())] == [task.id]
+    assert router._replica_down_until > 0
+    await _dispose(router)
@@ -0,0 +1,109 @@
+import json
+from hashlib import sha256
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.snapshot_batch import split_lines
+from app.core.config import get_settings
+
+
+def _ndjson(*lines: object) -> bytes:
+    return b"\n".join(
+        line if isinstance(line, bytes) else json.dumps(line).encode() for line in lines
+    )
+
+
+def _post_lines(client: TestClient, body: bytes) -> list[dict]:
+    response = client.post(
+        "/api/monitors/snapshots", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_split_lines_discards_oversized_lines_across_chunks() -> None:
+    lines = [
+        line
+        async for line in split_lines(_chunks(b"ab\ncdef", b"ghij", b"kl\n\nmn", b"o"), max_bytes=4)
+    ]
+
+    assert lines == [b"ab", None, b"", b"mno"]
+
+
+def test_batch_ingest_reports_each_line_in_order(client: TestClient) -> None:
+    monitor_id = client.post(
+        "/api/monitors", json={"name": "site", "source_url": "https://example.com"}
+    ).json()["id"]
+
+    rows = _post_lines(
+        client,
+        _ndjson(
+            {"monitor_id": monitor_id, "snapshot": "v1"},
+            {"monitor_id": "missing", "snapshot": "v1"},
+            b"{not json",
+            b"",
+            {"monitor_id": monitor_id},
+            {"monitor_id": monitor_id, "snapshot": "v1"},
+            {"monitor_id": monitor_id, "snapshot": "v2"},
+        ),
+    )
+
+    assert [(row["line"], row["status"], row["changed"]) for row in rows] == [
+        (1, 200, False),
+        (2, 404, None),
+        (3, 422, None),
+        (5, 422, None),
+        (6, 200, False),
+        (7, 200, True),
+    ]
+    assert rows[0]["snapshot_hash"] == sha256(b"v1").hexdigest()
+    assert rows[4]["error"] is None and "snapshot" in rows[3]["error"]
+    single = client.post(f"/api/monitors/{monitor_id}/snapshot", json={"snapshot": "v2"}).json()
+    assert single["last_snapshot_hash"] == rows[-1]["snapshot_hash"]
+    assert single["changed"] is False
+
+
+def test_batch_ingest_spans_several_groups(client: TestClient) -> None:
+    ids = [
+        client.post(
+            "/api/monitors", json={"name": f"site {n}", "source_url": f"https://example.com/{n}"}
+        ).json()["id"]
+        for n in range(3)
+    ]
+    body = _ndjson(*({"monitor_id": ids[n % 3], "snapshot": f"v{n // 3}"} for n in range(1_200)))
+
+    rows = _post_lines(client, body)
+
+    assert [row["line"] for row in rows] == list(range(1, 1_201))
+    assert [row["changed"] for row in rows[:3]] == [False] * 3
+    assert all(row["status"] == 200 and row["changed"] for row in rows[3:])
+    assert (
+        client.get(f"/api/monitors/{ids[0]}").json()["last_snapshot_hash"]
+        == rows[-3]["snapshot_hash"]
+    )
+
+
+def test_batch_ingest_rejects_oversized_lines(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "snapshot_max_bytes", 128)
+    monitor_id = client.post(
+        "/api/monitors", json={"name": "site", "source_url": "https://example.com"}
+    ).json()["id"]
+
+    rows = _post_lines(
+        client,
+        _ndjson(
+            {"monitor_id": monitor_id, "snapshot": "x" * 200},
+            {"monitor_id": monitor_id, "snapshot": "ok"},
+        ),
+    )
+
+    assert [(row["line"], row["status"]) for row in rows] == [(1, 413), (2, 200)]
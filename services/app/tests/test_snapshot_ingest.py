@@ -0,0 +1,78 @@
+import gzip
+from hashlib import sha256
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.snapshots import SnapshotDecodeError, SnapshotHasher, SnapshotTooLarge
+
+SNAPSHOT = "<html>" + "row " * 50_000 + "</html>"
+
+
+def _hash_in_chunks(body: bytes, *, content_encoding: str, max_bytes: int = 10**7) -> bytes:
+    hasher = SnapshotHasher(content_encoding=content_encoding, max_bytes=max_bytes)
+    for start in range(0, len(body), 4096):
+        hasher.update(body[start : start + 4096])
+    return hasher.digest()
+
+
+def test_hasher_matches_the_digest_of_the_decoded_body() -> None:
+    raw = SNAPSHOT.encode()
+    multi_member = gzip.compress(raw[:1000]) + gzip.compress(raw[1000:])
+
+    assert _hash_in_chunks(raw, content_encoding="identity") == sha256(raw).digest()
+    assert _hash_in_chunks(multi_member, content_encoding="gzip") == sha256(raw).digest()
+
+
+def test_hasher_rejects_oversized_and_broken_bodies() -> None:
+    with pytest.raises(SnapshotTooLarge):
+        _hash_in_chunks(gzip.compress(b"a" * 100_000), content_encoding="gzip", max_bytes=50_000)
+    with pytest.raises(SnapshotDecodeError):
+        _hash_in_chunks(gzip.compress(b"abc")[:-4], content_encoding="gzip")
+    with pytest.raises(SnapshotDecodeError):
+        _hash_in_chunks(b"not gzip", content_encoding="gzip")
+
+
+def test_raw_and_gzip_ingest_store_the_same_hash_as_json(client: TestClient) -> None:
+    monitor_id = client.post(
+        "/api/monitors", json={"name": "site", "source_url": "https://example.com"}
+    ).json()["id"]
+    url = f"/api/monitors/{monitor_id}/snapshot"
+    from_json = client.post(url, json={"snapshot": SNAPSHOT}).json()
+
+    raw = client.post(
+        f"{url}/raw", content=SNAPSHOT.encode(), headers={"Content-Type": "text/html"}
+    )
+    compressed = client.post(
+        f"{url}/raw",
+        content=gzip.compress(SNAPSHOT.encode()),
+        headers={"Content-Type": "text/html", "Content-Encoding": "gzip"},
+    )
+    changed = client.post(f"{url}/raw", content=b"<html>v2</html>")
+
+    assert raw.status_code == compressed.status_code == 200
+    assert raw.json()["last_snapshot_hash"] == from_json["last_snapshot_hash"]
+    assert compressed.json()["last_snapshot_hash"] == from_json["last_snapshot_hash"]
+    assert (raw.json()["changed"], compressed.json()["changed"]) == (False, False)
+    assert changed.json()["changed"] is True
+
+
+def test_raw_ingest_rejects_unknown_monitors_and_encodings(client: TestClient) -> None:
+    monitor_id = client.post(
+        "/api/monitors", json={"name": "site", "source_url": "https://example.com"}
+    ).json()["id"]
+
+    assert client.post("/api/monitors/missing/snapshot/raw", content=b"x").status_code == 404
+    unsupported = client.post(
+        f"/api/monitors/{monitor_id}/snapshot/raw",
+        content=b"x",
+        headers={"Content-Encoding": "br"},
+    )
+    broken = client.post(
+        f"/api/monitors/{monitor_id}/snapshot/raw",
+        content=b"not gzip",
+        headers={"Content-Encoding": "gzip"},
+    )
+    assert unsupported.status_code == 415
+    assert broken.status_code == 400
+    assert client.get(f"/api/monitors/{monitor_id}").json()["last_snapshot_hash"] is None
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app import dependencies
+from app.core.config import Settings
+from app.db.session import get_db_session, get_session_router
+from app.dependencies import Container
+from app.main import create_app
+from app.services.repositories import InMemoryRepository
+
+# Fails (non-zero exit) if importing the app builds the app, an engine or any service.
+IMPORT_CHECK = """
+import sys
+import app.main
+from app.dependencies import container
+
+assert "app" not in vars(app.main), "app built at import"
+assert set(vars(container)) == {"_settings"}, sorted(vars(container))
+assert "app.db.repository" not in sys.modules
+"""
+
+
+def test_importing_the_app_builds_nothing(tmp_path: Path) -> None:
+    env = {
+        **os.environ,
+        "REPOSITORY_BACKEND": "database",
+        "DATABASE_URL": f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_CHECK],
+        env=env,
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+async def test_container_builds_lazily_and_forgets_on_close() -> None:
+    container = Container(Settings(repository_backend="memory"))
+    assert set(vars(container)) == {"_settings"}
+
+    repository = container.scheduler.repository
+    assert isinstance(repository, InMemoryRepository)
+    assert container.monitor_service.repository is repository
+    assert container.session_router is None and container.result_writer is None
+    container.start()
+    await container.aclose()
+
+    assert set(vars(container)) == {"_settings"}
+    assert container.repository is not repository
+
+
+async def test_session_dependencies_share_the_container_engines(monkeypatch, tmp_path) -> None:
+    settings = Settings(
+        repository_backend="database", database_url=f"sqlite+aiosqlite:///{tmp_path / 'db.db'}"
+    )
+    container = Container(settings)
+    monkeypatch.setattr(dependencies, "container", container)
+
+    router = get_session_router()
+    assert router is container.session_router
+    assert container.repository._sessions is router
+    async for session in get_db_session(Request({"type": "http", "app": FastAPI()})):
+        assert session.bind is router.engine
+    await container.aclose()
+
+    assert get_session_router() is not router
+    await container.aclose()
+
+
+def test_apps_built_with_settings_use_a_container_of_their_own() -> None:
+    settings = Settings(repository_backend="memory")
+    application = create_app(settings)
+    app_container = application.state.container
+    assert app_container is not dependencies.container
+    assert create_app().state.container is dependencies.container
+
+    with TestClient(application) as client:
+        task_id = client.post("/api/tasks", json={"name": "scrape", "payload": {}}).json()["id"]
+        repository = app_container.repository
+        assert app_container.settings is settings
+        assert [task.id for task in asyncio.run(repository.list_tasks())] == [task_id]
+        assert asyncio.run(dependencies.container.repository.list_tasks()) == []
+
+    assert set(vars(app_container)) == {"_settings"}
@@ -0,0 +1,75 @@
+import asyncio
+
+from app.db.work_queue import WorkQueue
+
+
+async def test_concurrent_claims_never_hand_out_the_same_item(session_factory) -> None:
+    queue = WorkQueue(session_factory, "analysis")
+    await queue.enqueue_many([{"n": n} for n in range(20)])
+
+    batches = await asyncio.gather(*(queue.claim(3) for _ in range(10)))
+
+    claimed = [item.payload["n"] for batch in batches for item in batch]
+    assert sorted(claimed) == list(range(20))
+    assert await queue.claim(5) == []
+
+
+async def test_unacked_items_reappear_after_the_visibility_timeout(session_factory) -> None:
+    queue = WorkQueue(session_factory, "analysis", visibility_timeout_seconds=0.5)
+    await queue.enqueue({"n": 1})
+
+    first = await queue.claim(10)
+    # Long enough that a garbage collection pass cannot expire the lease early.
+    assert await queue.claim(10) == []
+    await asyncio.sleep(0.6)
+    second = await queue.claim(10)
+
+    assert [item.attempts for item in first + second] == [1, 2]
+    # The expired lease can no longer be acknowledged by its original worker.
+    assert await queue.ack(first) == 0
+    assert await queue.ack(second) == 1
+    assert await queue.depth() == 0
+
+
+async def test_release_and_max_attempts(session_factory) -> None:
+    queue = WorkQueue(session_factory, "analysis", max_attempts=2)
+    other = WorkQueue(session_factory, "other")
+    await queue.enqueue({"n": 1})
+    await other.enqueue({"n": 2})
+
+    assert await queue.release(await queue.claim(10)) == 1
+    assert await queue.release(await queue.claim(10)) == 1
+
+    assert await queue.claim(10) == []
+    assert await queue.depth() == 1
+    assert [item.payload for item in await other.claim(10)] == [{"n": 2}]
+
+
+async def test_keyed_items_are_queued_once_until_acknowledged(session_factory) -> None:
+    queue = WorkQueue(session_factory, "analysis")
+    other = WorkQueue(session_factory, "other")
+
+    assert await queue.enqueue({"n": 1}, key="m:abc") is True
+    assert await queue.enqueue({"n": 2}, key="m:abc") is False
+    assert await other.enqueue({"n": 3}, key="m:abc") is True
+    assert await queue.enqueue_many([{"n": 4}, {"n": 5}], keys=["m:abc", None]) == 1
+
+    claimed = await queue.claim(10)
+    assert [item.payload for item in claimed] == [{"n": 1}, {"n": 5}]
+    await queue.ack(claimed)
+    assert await queue.enqueue({"n": 6}, key="m:abc") is True
+
+
+async def test_exhausted_items_free_their_key(session_factory) -> None:
+    queue = WorkQueue(session_factory, "analysis", max_attempts=2)
+    await queue.enqueue({"n": 1}, key="m:abc")
+    await queue.release(await queue.claim(10))
+    last_attempt = await queue.claim(10)
+
+    # Still leased on its last attempt: the key stays taken.
+    assert await queue.enqueue({"n": 2}, key="m:abc") is False
+    await queue.release(last_attempt)
+
+    assert await queue.enqueue({"n": 3}, key="m:abc") is True
+    assert [item.payload for item in await queue.claim(10)] == [{"n": 3}]
+    assert await queue.depth() == 2
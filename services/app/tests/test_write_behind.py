@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.db.models import Result, ResultStatus
+from app.db.repository import SqlAlchemyRepository
+from app.db.results import ResultWriter
+from app.db.write_behind import WriteBehindBuffer
+from app.services.executor import JobExecutor
+from app.services.scheduler import Scheduler
+
+
+async def _job_id(session_factory) -> int:
+    repo = SqlAlchemyRepository(session_factory)
+    task = await repo.create_task("scrape", {})
+    job = await repo.create_job(task.id, schedule_every_seconds=1, enabled=True)
+    return int(job.id)
+
+
+async def _result_count(session_factory) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(Result))
+
+
+def _count_inserts(session_factory) -> list[int]:
+    inserts: list[int] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.startswith("INSERT INTO results"):
+            inserts.append(len(parameters) if executemany else 1)
+
+    return inserts
+
+
+async def test_rows_are_grouped_into_batches_and_flushed_on_close(session_factory) -> None:
+    job_id = await _job_id(session_factory)
+    inserts = _count_inserts(session_factory)
+    buffer = WriteBehindBuffer(
+        session_factory, Result.__table__, max_batch=3, max_delay_seconds=60, max_pending=10
+    )
+    buffer.start()
+
+    for _ in range(4):
+        await buffer.put({"job_id": job_id, "status": ResultStatus.NEW})
+    for _ in range(100):
+        if inserts:
+            break
+        await asyncio.sleep(0.01)
+    await buffer.close()
+
+    assert inserts == [3, 1]
+    assert await _result_count(session_factory) == 4
+
+
+async def test_partial_batch_is_flushed_after_the_delay(session_factory) -> None:
+    job_id = await _job_id(session_factory)
+    buffer = WriteBehindBuffer(session_factory, Result.__table__, max_delay_seconds=0.01)
+    buffer.start()
+
+    await buffer.put({"job_id": job_id, "status": ResultStatus.NEW})
+    await asyncio.sleep(0.2)
+
+    assert buffer.pending == 0
+    assert await _result_count(session_factory) == 1
+    await buffer.close()
+
+
+async def test_put_blocks_while_the_buffer_is_full(session_factory) -> None:
+    job_id = await _job_id(session_factory)
+    buffer = WriteBehindBuffer(session_factory, Result.__table__, max_batch=2, max_pending=2)
+    row = {"job_id": job_id, "status": ResultStatus.NEW}
+    await buffer.put(row)
+    await buffer.put(row)
+
+    blocked = asyncio.create_task(buffer.put(row))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    buffer.start()
+    await asyncio.wait_for(blocked, timeout=1)
+    await buffer.close()
+    assert await _result_count(session_factory) == 3
+
+
+async def test_flusher_survives_its_delay_timing_out(session_factory) -> None:
+    job_id = await _job_id(session_factory)
+    buffer = WriteBehindBuffer(
+        session_factory, Result.__table__, max_batch=3, max_delay_seconds=0.01, max_pending=3
+    )
+    buffer.start()
+    row = {"job_id": job_id, "status": ResultStatus.NEW}
+
+    # A lone row waits out the delay; the timeout must not end the flusher.
+    await buffer.put(row)
+    await asyncio.sleep(0.1)
+    assert buffer.pending == 0
+    assert not buffer._task.done()
+
+    # Later puts past max_pending still make progress.
+    await asyncio.wait_for(asyncio.gather(*(buffer.put(row) for _ in range(7))), timeout=1)
+    await buffer.close()
+    assert await _result_count(session_factory) == 8
+
+
+async def test_rows_rejected_by_constraints_do_not_drop_the_batch(session_factory) -> None:
+    job_id = await _job_id(session_factory)
+    buffer = WriteBehindBuffer(session_factory, Result.__table__)
+    await buffer.put({"job_id": job_id, "status": ResultStatus.NEW})
+    await buffer.put({"job_id": job_id + 1000, "status": ResultStatus.NEW})
+
+    assert await buffer.flush() == 1
+    assert buffer.pending == 0
+    assert await _result_count(session_factory) == 1
+
+
+@pytest.mark.parametrize("payload", [{}, {"fail": True}])
+async def test_scheduler_records_results_through_the_writer(session_factory, payload) -> None:
+    repo = SqlAlchemyRepository(session_factory)
+    task = await repo.create_task("scrape", payload)
+    await repo.create_job(task.id, schedule_every_seconds=1, enabled=True)
+    writer = ResultWriter(session_factory)
+
+    await Scheduler(repo, JobExecutor(), writer).run_once()
+    await writer.close()
+
+    async with session_factory() as session:
+        result = await session.scalar(select(Result))
+    assert result.status is (ResultStatus.ERROR if payload else ResultStatus.PROCESSED)